@@ -1,9 +1,18 @@
 from .tasks import (  # noqa: F403,F401
+    apply,
+    daemon,
+    daemon_stop,
     dbfs_wheel_path,
     dbfs_wheel_path_root,
     define_job,
+    define_jobs,
+    plan,
     poetry_wheel_name,
+    prune,
+    repair_run,
     run_job,
+    run_jobs,
+    submit_run,
     upload,
 )
 
@@ -1,31 +1,69 @@
 # Standard Library
 import json
-from pprint import pprint as pp
+import time
+from pathlib import Path
 
 # Third Party
 from invoke import task
 
+from .utils.api import api_client
+from .utils.cache import JOB_ID_CACHE_TTL
+from .utils.daemon import (
+    DAEMON_IDLE_TIMEOUT,
+    daemon_call,
+    daemon_running,
+    daemon_socket_path,
+    serve_daemon,
+    start_daemon,
+    stop_daemon,
+)
 from .utils.databricks import (
-    create_or_reset_job,
+    RUN_CONCURRENCY,
     default_dbfs_artifact_path,
-    default_dbfs_wheel_path,
-    list_jobs,
-    wait_for_run_status,
+    job_id_cache,
+    latest_run_id,
+    run_jobs_concurrently,
+    run_now,
+    submit_one_time_run,
+)
+from .utils.dbfs import UPLOAD_CONCURRENCY, dbfs_upload
+from .utils.deploy import DEPLOY_CONCURRENCY, JobSpec, job_specs, render_job
+from .utils.git import git_branches, git_current_branch
+from .utils.jobs import cluster_options, run_submit_payload
+from .utils.misc import dict_from_keyvalue_list, load_config, tidy
+from .utils.plan import (
+    APPLY_RETRIES,
+    PLAN_CONCURRENCY,
+    apply_plan,
+    apply_report,
+    format_plan,
+    plan_from_json,
+    plan_jobs,
+    plan_to_json,
 )
-from .utils.misc import dict_from_keyvalue_list, load_config, merge_template, tidy
-from .utils.poetry import poetry_wheelname
+from .utils.poetry import poetry_project_name
+from .utils.polling import POLL_MAX_DELAY, POLL_MIN_DELAY, AdaptivePoll
+from .utils.progress import OUTPUT_TAIL_LINES, RunProgress
+from .utils.repair import start_repair
+from .utils.retention import (
+    DEFAULT_KEEP_VERSIONS,
+    PRUNE_CONCURRENCY,
+    apply_prune,
+    prune_plan,
+)
+from .utils.supervisor import failure_policy, supervised_wait
 
 # NOTE: Invoke tasks files don't support mypy typechecking for the forseeable future
 # They were looking at addressing it after Python2 EOL 01-01-2020 but there was a global pandemic.
 # https://github.com/pyinvoke/invoke/issues/357
 
-POLL_DELAY = 5
+MB = 1024 * 1024
 
 
 @task
 def poetry_wheel_name(c):
     """Display the name of the wheel file poetry would build."""
-    print(poetry_wheelname())
+    print(daemon_call("wheel_paths")["wheel_name"])
 
 
 @task
@@ -34,7 +72,7 @@ def dbfs_wheel_path(c, branch=None):
 
     Omitting branch will try to detect it, but in some CI systems you may need to inject this from an environment variable.
     """
-    print(default_dbfs_wheel_path(branch))
+    print(daemon_call("wheel_paths", branch)["wheel_path"])
 
 
 @task
@@ -43,21 +81,118 @@ def dbfs_wheel_path_root(c, branch=None):
 
     Omitting branch will try to detect it, but in some CI systems you may need to inject this from an environment variable.
     """
-    print(default_dbfs_artifact_path(branch))
+    print(daemon_call("wheel_paths", branch)["artifact_path"])
 
 
-@task
-def upload(c, profile=None, artifact_path=None, branch_name=None, source_path="dist/"):
+@task(
+    help={
+        "profile": "Optional databricks-cli profile name",
+        "force": "Upload every artifact even if DBFS already has a copy with the same content hash",
+        "concurrency": "Maximum number of files to upload at once",
+        "wheel_only": "Only upload the wheel poetry would build for the current version instead of all of source_path",
+        "keep": "After uploading, delete all but this many of the most recent versions in artifact_path. 0 keeps all",
+    }
+)
+def upload(
+    c,
+    profile=None,
+    artifact_path=None,
+    branch_name=None,
+    source_path="dist/",
+    force=False,
+    concurrency=UPLOAD_CONCURRENCY,
+    wheel_only=False,
+    keep=0,
+):
     """Upload wheel artifact from dist to DBFS."""
-    profile_flag = f"--profile {profile}" if profile else ""
+    paths = daemon_call("wheel_paths", branch_name)
+    if artifact_path is None:
+        artifact_path = paths["artifact_path"]
+    if wheel_only:
+        source_path = str(Path(source_path) / paths["wheel_name"])
+
+    print(f"Copying from {source_path} --> '{artifact_path}'{'' if wheel_only else ' recursively'}...")
+    client = api_client(profile)
+    if client is None:
+        if keep:
+            raise ValueError("Pruning old versions needs Databricks API credentials, see the README")
+        profile_flag = f"--profile {profile}" if profile else ""
+        if wheel_only:
+            c.run(f"dbfs {profile_flag} cp {source_path} {artifact_path}{paths['wheel_name']} --overwrite")
+        else:
+            c.run(f"dbfs {profile_flag} cp -r {source_path} {artifact_path} --overwrite")
+        c.run(f"dbfs {profile_flag} ls {artifact_path}")
+        return
+
+    started = time.perf_counter()
+    uploaded = dbfs_upload(client, str(source_path), artifact_path, skip_unchanged=not force, max_workers=concurrency)
+    for f in uploaded:
+        if f.skipped:
+            print(f"unchanged {f.target}")
+        else:
+            print(f"uploaded {f.target} ({f.size / MB:.1f} MB in {f.seconds:.1f}s, {f.throughput / MB:.1f} MB/s)")
+    total = sum(f.size for f in uploaded if not f.skipped)
+    seconds = time.perf_counter() - started
+    print(f"Uploaded {total / MB:.1f} MB in {seconds:.1f}s ({total / MB / max(seconds, 1e-6):.1f} MB/s)")
+
+    if keep:
+        plan = prune_plan(client, artifact_path, poetry_project_name(), keep)
+        apply_prune(client, plan)
+        for path in plan.files:
+            print(f"deleted {path}")
 
+
+@task(
+    iterable=["keep_branch"],
+    help={
+        "profile": "Optional databricks-cli profile name",
+        "keep": "Number of most recent versions to keep in the branch's artifact path. 0 keeps all",
+        "stale_branches": "Also delete this project's artifacts for branches that no longer exist on the git remote",
+        "remote": "git remote whose branches are live, listed with `git ls-remote` so shallow clones see them all",
+        "keep_branch": (
+            "Glob pattern of artifact directories --stale-branches never deletes, eg CI names that aren't branches. "
+            "Can be used repeatedly. Eg `--keep-branch '*/merge'`."
+        ),
+        "dry_run": "Only print what would be deleted",
+        "concurrency": "Maximum number of deletes to run at once",
+    },
+)
+def prune(
+    c,
+    profile=None,
+    artifact_path=None,
+    branch_name=None,
+    keep=DEFAULT_KEEP_VERSIONS,
+    stale_branches=False,
+    remote="origin",
+    keep_branch=None,
+    dry_run=False,
+    concurrency=PRUNE_CONCURRENCY,
+):
+    """Delete old versions and branches of this project's wheels from DBFS."""
+    client = api_client(profile)
+    if client is None:
+        raise ValueError("Pruning needs Databricks API credentials, see the README")
     if artifact_path is None:
         artifact_path = default_dbfs_artifact_path(branch_name)
 
-    print(f"Copying from {source_path} --> '{artifact_path}' recursively...")
-    c.run(f"dbfs {profile_flag} cp -r {source_path} {artifact_path} --overwrite")
+    branches = None
+    if stale_branches:
+        branches = set(git_branches(remote)) | {branch_name or git_current_branch()}
+    plan = prune_plan(
+        client, artifact_path, poetry_project_name(), int(keep), branches, keep_patterns=keep_branch or []
+    )
+    if not dry_run:
+        apply_prune(client, plan, int(concurrency))
+    for path in plan.files + plan.directories:
+        print(f"{'would delete' if dry_run else 'deleted'} {path}")
 
-    c.run(f"dbfs {profile_flag} ls {artifact_path}")
+
+CLUSTER_HELP = {
+    "share_clusters": "Give tasks with identical `new_cluster` specs one shared job cluster instead of one each",
+    "instance_pool_id": "Start every cluster that doesn't already use a pool from this instance pool",
+    "driver_instance_pool_id": "Start those clusters' drivers from this instance pool. Needs --instance-pool-id.",
+}
 
 
 @task(
@@ -76,9 +211,29 @@ def upload(c, profile=None, artifact_path=None, branch_name=None, source_path="d
         """
         ),
         "profile": "Optional databricks-cli profile name",
+        "job_cache_ttl": "Seconds a cached job name to job_id lookup stays valid. Use 0 to always look the job up.",
+        "force": "Reset the job even if its deployed settings are already identical",
+        "incremental": "Skip the job when its template, config, environment variables and wheel are unchanged",
+        "deploy_manifest": "Local or `dbfs:` path of the manifest used by --incremental. Defaults to the cache dir.",
+        "wheel_file": "Wheel whose hash is part of the --incremental fingerprint. Defaults to the project's in dist/.",
+        **CLUSTER_HELP,
     },
 )
-def define_job(c, jinja_template, config_file, environment_variable=None, profile=None):
+def define_job(
+    c,
+    jinja_template,
+    config_file,
+    environment_variable=None,
+    profile=None,
+    job_cache_ttl=JOB_ID_CACHE_TTL,
+    force=False,
+    incremental=False,
+    deploy_manifest=None,
+    wheel_file=None,
+    share_clusters=False,
+    instance_pool_id=None,
+    driver_instance_pool_id=None,
+):
     """Generate templated Job definition and upsert by Job Name in template.
 
     It is left to the user to define their own datastructures for config_file,
@@ -97,33 +252,441 @@ def define_job(c, jinja_template, config_file, environment_variable=None, profil
     we need to inject at runtime.
     """
     env = dict_from_keyvalue_list(environment_variable)
-    conf = load_config(config_file, env)
+    report = daemon_call(
+        "deploy",
+        [[jinja_template, config_file]],
+        env,
+        profile,
+        float(job_cache_ttl),
+        force,
+        incremental=incremental,
+        manifest_path=deploy_manifest,
+        wheel_file=wheel_file,
+        share_clusters=share_clusters,
+        instance_pool_id=instance_pool_id,
+        driver_instance_pool_id=driver_instance_pool_id,
+    )
+    [job] = report["jobs"]
+    if "error" in job:
+        raise ValueError(f"Failed to deploy job '{job['name']}': {job['error']}")
+
+    print(f"{job['action']} job '{job['name']}' ({job['job_id']})")
+    if "cluster_savings" in job:
+        savings = job["cluster_savings"]
+        print(
+            f"cluster starts per run: {savings['cluster_starts_before']} -> {savings['cluster_starts_after']}, "
+            f"estimated {savings['estimated_seconds_saved']:.0f}s of cluster start time saved"
+        )
+    print(", ".join(f"{action}: {count}" for action, count in report["summary"].items() if action != "failed"))
+
+
+@task(
+    iterable=["environment_variable"],
+    help={
+        "manifest": (
+            "JSON or YAML file listing jobs to deploy, each entry having a `jinja_template` and `config_file`. "
+            "Paths are relative to the manifest."
+        ),
+        "jinja_template": "Path to a valid Jinja2 template file shared by every config matched by `config_glob`",
+        "config_glob": "Glob pattern of config files to render with `jinja_template`, eg 'jobs/*.yml'",
+        "environment_variable": "Runtime environment variables to inject into every config file, see define-job",
+        "profile": "Optional databricks-cli profile name",
+        "job_cache_ttl": "Seconds a cached job name to job_id lookup stays valid. Use 0 to always look jobs up.",
+        "force": "Reset jobs even if their deployed settings are already identical",
+        "concurrency": "Maximum number of jobs to upsert at once",
+        "incremental": "Skip jobs whose template, config, environment variables and wheel are unchanged",
+        "deploy_manifest": "Local or `dbfs:` path of the manifest used by --incremental. Defaults to the cache dir.",
+        "wheel_file": "Wheel whose hash is part of the --incremental fingerprint. Defaults to the project's in dist/.",
+        **CLUSTER_HELP,
+    },
+)
+def define_jobs(
+    c,
+    manifest=None,
+    jinja_template=None,
+    config_glob=None,
+    environment_variable=None,
+    profile=None,
+    job_cache_ttl=JOB_ID_CACHE_TTL,
+    force=False,
+    concurrency=DEPLOY_CONCURRENCY,
+    incremental=False,
+    deploy_manifest=None,
+    wheel_file=None,
+    share_clusters=False,
+    instance_pool_id=None,
+    driver_instance_pool_id=None,
+):
+    """Generate and upsert many templated Job definitions in one go, printing a JSON summary.
 
-    job_id = None  # Default to None and assume a new job needs to be created
-    if "job_id" in conf:
-        # Update a specific job_id that already exists specified in the config
-        job_id = conf["job_id"]
+    Jobs come from either a manifest of template/config pairs or a template shared by every config matching a glob.
+
+    Example usage:
+        $ invoke define-jobs --manifest jobs/manifest.yml -e branch=$BRANCH
+        $ invoke define-jobs --jinja-template jobs/template.json.j2 --config-glob 'jobs/*.yml'
+    """
+    env = dict_from_keyvalue_list(environment_variable)
+    specs = [[spec.jinja_template, spec.config_file] for spec in job_specs(manifest, jinja_template, config_glob, env)]
+    report = daemon_call(
+        "deploy",
+        specs,
+        env,
+        profile,
+        float(job_cache_ttl),
+        force,
+        int(concurrency),
+        incremental=incremental,
+        manifest_path=deploy_manifest,
+        wheel_file=wheel_file,
+        share_clusters=share_clusters,
+        instance_pool_id=instance_pool_id,
+        driver_instance_pool_id=driver_instance_pool_id,
+    )
+    print(json.dumps(report, indent=2))
+
+    failed = report["summary"]["failed"]
+    if failed:
+        raise ValueError(f"{failed} of {len(report['jobs'])} jobs failed to deploy.")
+
+
+CATALOGUE_HELP = {
+    "manifest": "JSON or YAML file listing the catalogue's jobs, see define-jobs",
+    "jinja_template": "Path to a valid Jinja2 template file shared by every config matched by `config_glob`",
+    "config_glob": "Glob pattern of config files to render with `jinja_template`, eg 'jobs/*.yml'",
+    "environment_variable": "Runtime environment variables to inject into every config file, see define-job",
+    "profile": "Optional databricks-cli profile name",
+    "orphan_prefix": (
+        "Workspace jobs whose name starts with this prefix but are not in the catalogue are orphaned. "
+        "Without it no job is ever orphaned."
+    ),
+    "concurrency": "Maximum number of jobs to fetch or change at once",
+    **CLUSTER_HELP,
+}
+
+
+@task(
+    iterable=["environment_variable"],
+    help={**CATALOGUE_HELP, "out": "Also save the plan as JSON to this file so `apply --plan-file` can run it later"},
+)
+def plan(
+    c,
+    manifest=None,
+    jinja_template=None,
+    config_glob=None,
+    environment_variable=None,
+    profile=None,
+    orphan_prefix=None,
+    out=None,
+    concurrency=PLAN_CONCURRENCY,
+    share_clusters=False,
+    instance_pool_id=None,
+    driver_instance_pool_id=None,
+):
+    """Preview what deploying a whole job catalogue would create, update and orphan without changing anything.
+
+    Example usage:
+        $ invoke plan --manifest jobs/manifest.yml -e branch=$BRANCH --orphan-prefix etl- --out plan.json
+    """
+    env = dict_from_keyvalue_list(environment_variable)
+    specs = job_specs(manifest, jinja_template, config_glob, env)
+    clusters = cluster_options(share_clusters, instance_pool_id, driver_instance_pool_id)
+    planned = plan_jobs(specs, env, profile, orphan_prefix, int(concurrency), clusters)
+    print(format_plan(planned))
+    if out:
+        Path(out).write_text(json.dumps(plan_to_json(planned), indent=2))
+
+
+@task(
+    iterable=["environment_variable"],
+    help={
+        **CATALOGUE_HELP,
+        "plan_file": "Apply a plan saved by `plan --out` instead of planning again",
+        "delete_orphans": "Delete orphaned jobs once every create and update has succeeded",
+        "retries": "Times to retry a rate limited or transiently failing API call",
+        "job_cache_ttl": "Seconds a cached job name to job_id lookup stays valid. Use 0 to disable the cache.",
+    },
+)
+def apply(
+    c,
+    manifest=None,
+    jinja_template=None,
+    config_glob=None,
+    environment_variable=None,
+    profile=None,
+    orphan_prefix=None,
+    plan_file=None,
+    delete_orphans=False,
+    concurrency=PLAN_CONCURRENCY,
+    retries=APPLY_RETRIES,
+    job_cache_ttl=JOB_ID_CACHE_TTL,
+    share_clusters=False,
+    instance_pool_id=None,
+    driver_instance_pool_id=None,
+):
+    """Converge the workspace on a whole job catalogue in one parallel pass, printing a JSON summary.
+
+    Plans first unless given a saved plan, see `plan`.
+
+    Example usage:
+        $ invoke plan --manifest jobs/manifest.yml --orphan-prefix etl- --out plan.json
+        $ invoke apply --plan-file plan.json --delete-orphans
+    """
+    if plan_file:
+        planned = plan_from_json(json.loads(Path(plan_file).read_text()))
     else:
-        # Determine the job_id by looking up a job by name
-        jobs = list_jobs(profile)
-        job_id = jobs[conf["name"]] if conf["name"] in jobs else None
-        if job_id:
-            conf["job_id"] = job_id
+        env = dict_from_keyvalue_list(environment_variable)
+        specs = job_specs(manifest, jinja_template, config_glob, env)
+        clusters = cluster_options(share_clusters, instance_pool_id, driver_instance_pool_id)
+        planned = plan_jobs(specs, env, profile, orphan_prefix, int(concurrency), clusters)
+        print(format_plan(planned))
 
-    merged_template = merge_template(jinja_template, conf)
-    parsed_content = json.loads(merged_template)
-    result = create_or_reset_job(parsed_content, profile=profile, job_id=job_id)
-    pp(result)
+    cache = job_id_cache(profile, float(job_cache_ttl))
+    results = apply_plan(planned, profile, cache, delete_orphans, int(concurrency), int(retries))
+    report = apply_report(results)
+    print(json.dumps(report, indent=2))
 
+    failed = report["summary"]["failed"]
+    if failed:
+        raise ValueError(f"{failed} of {len(report['jobs'])} jobs failed to apply.")
 
-@task
-def run_job(c, job_id, profile=None):
+
+@task(
+    iterable=["critical_task"],
+    help={
+        "job_id": "ID of the job to trigger",
+        "profile": "Optional databricks-cli profile name",
+        "poll_min": "Seconds between status polls while the run is starting up or changing state",
+        "poll_max": "Upper bound in seconds that polling backs off to for long running states",
+        "stream": "Print run and task state changes while waiting, and each task's error and log tail once it ends",
+        "output_lines": "Lines of each finished task's logs and error trace to print",
+        "supervise": (
+            "Cancel the run as soon as its failure policy trips, or when interrupted by SIGINT or SIGTERM. "
+            "The policy is --fail-fast unless --max-failed-tasks or --critical-task is given."
+        ),
+        "fail_fast": "Cancel the run as soon as any task fails. Implies --supervise.",
+        "max_failed_tasks": "Cancel the run once more than this many tasks have failed. Implies --supervise.",
+        "critical_task": "task_key whose failure cancels the run. Can be used repeatedly. Implies --supervise.",
+    },
+)
+def run_job(
+    c,
+    job_id,
+    profile=None,
+    poll_min=POLL_MIN_DELAY,
+    poll_max=POLL_MAX_DELAY,
+    stream=True,
+    output_lines=OUTPUT_TAIL_LINES,
+    supervise=False,
+    fail_fast=False,
+    max_failed_tasks=None,
+    critical_task=None,
+):
     """Trigger job based on job-id and wait.
 
     If you do not want to wait for the job to finish then just use the run-now CLI command.
     """
-    profile_flag = f"--profile {profile}" if profile else ""
+    run_id = run_now(job_id, profile, c)
+    on_update = RunProgress(profile, int(output_lines), c=c).update if stream else None
+    poll = AdaptivePoll(min_delay=float(poll_min), max_delay=float(poll_max))
+    policy = failure_policy(supervise, fail_fast, max_failed_tasks, critical_task)
+    supervised_wait(c, profile, run_id, poll, policy, on_update)
+
+
+@task(
+    iterable=["environment_variable", "critical_task"],
+    help={
+        "jinja_template": "Path to a valid Jinja2 template file, see define-job",
+        "config_file": "Either a JSON or YAML file that parametrises the template, see define-job",
+        "environment_variable": "Runtime environment variables to inject into `config_file`. Eg `-e foo=bar`.",
+        "profile": "Optional databricks-cli profile name",
+        "run_name": "Name of the one-time run. Defaults to the job's name.",
+        "idempotency_token": tidy(
+            """Token that makes resubmitting safe, a second submit with the same token returns the existing run
+            instead of starting another. Submits carrying one are also retried after server errors."""
+        ),
+        "poll_min": "Seconds between status polls while the run is starting up or changing state",
+        "poll_max": "Upper bound in seconds that polling backs off to for long running states",
+        "stream": "Print run and task state changes while waiting, and each task's error and log tail once it ends",
+        "output_lines": "Lines of each finished task's logs and error trace to print",
+        "supervise": "Cancel the run as soon as its failure policy trips, see run-job",
+        "fail_fast": "Cancel the run as soon as any task fails. Implies --supervise.",
+        "max_failed_tasks": "Cancel the run once more than this many tasks have failed. Implies --supervise.",
+        "critical_task": "task_key of a task whose failure cancels the run. Can be used repeatedly.",
+    },
+)
+def submit_run(
+    c,
+    jinja_template,
+    config_file,
+    environment_variable=None,
+    profile=None,
+    run_name=None,
+    idempotency_token=None,
+    poll_min=POLL_MIN_DELAY,
+    poll_max=POLL_MAX_DELAY,
+    stream=True,
+    output_lines=OUTPUT_TAIL_LINES,
+    supervise=False,
+    fail_fast=False,
+    max_failed_tasks=None,
+    critical_task=None,
+):
+    """Render a job template and run it once without creating a job, then wait.
+
+    Handy for ad-hoc and CI runs that would otherwise leave throwaway jobs behind. Settings that only make sense
+    for a job, like schedules, are dropped and shared job clusters are given to each task that uses them.
+
+    Example usage:
+        $ invoke submit-run \
+            --jinja-template jobs/jaffleshop.json.j2 \
+            --config jobs/jaffleshop.yml \
+            -e my_wheel=$(invoke dbfs-wheel-path --branch $BRANCH) \
+            --idempotency-token $CI_PIPELINE_ID
+    """
+    env = dict_from_keyvalue_list(environment_variable)
+    settings = render_job(JobSpec(jinja_template, config_file), load_config(config_file, env))
+    payload = run_submit_payload(settings, run_name, idempotency_token)
+    run_id = submit_one_time_run(payload, profile, c)
+    print(f"Submitted run {run_id}: {payload.get('run_name')}")
+
+    on_update = RunProgress(profile, int(output_lines), c=c).update if stream else None
+    poll = AdaptivePoll(min_delay=float(poll_min), max_delay=float(poll_max))
+    policy = failure_policy(supervise, fail_fast, max_failed_tasks, critical_task)
+    supervised_wait(c, profile, run_id, poll, policy, on_update)
+
+
+@task(
+    iterable=["critical_task"],
+    help={
+        "run_id": "ID of the finished run to repair",
+        "job_id": "Repair the latest run of this job instead of a given `run_id`",
+        "profile": "Optional databricks-cli profile name",
+        "poll_min": "Seconds between status polls while the run is starting up or changing state",
+        "poll_max": "Upper bound in seconds that polling backs off to for long running states",
+        "stream": "Print run and task state changes while waiting, and each task's error and log tail once it ends",
+        "output_lines": "Lines of each finished task's logs and error trace to print",
+        "supervise": "Cancel the repair as soon as its failure policy trips, see run-job",
+        "fail_fast": "Cancel the repair as soon as any task fails. Implies --supervise.",
+        "max_failed_tasks": "Cancel the repair once more than this many tasks have failed. Implies --supervise.",
+        "critical_task": "task_key of a task whose failure cancels the repair. Can be used repeatedly.",
+    },
+)
+def repair_run(
+    c,
+    run_id=None,
+    job_id=None,
+    profile=None,
+    poll_min=POLL_MIN_DELAY,
+    poll_max=POLL_MAX_DELAY,
+    stream=True,
+    output_lines=OUTPUT_TAIL_LINES,
+    supervise=False,
+    fail_fast=False,
+    max_failed_tasks=None,
+    critical_task=None,
+):
+    """Re-run only the failed and skipped tasks of a finished run and wait.
 
-    result = c.run(f"databricks {profile_flag} jobs run-now --job-id {job_id}", hide=True)
-    run_id = json.loads(result.stdout)["run_id"]
-    wait_for_run_status(c, profile, run_id)
+    Tasks that succeeded keep their results, so recovering from a partial failure doesn't repeat them.
+
+    Example usage:
+        $ invoke repair-run --run-id 456
+        $ invoke repair-run --job-id 123
+    """
+    if run_id is None:
+        if job_id is None:
+            raise ValueError("Provide either --run-id or --job-id.")
+        run_id = latest_run_id(job_id, profile, c)
+        if run_id is None:
+            raise ValueError(f"Job {job_id} has never run.")
+
+    poll = AdaptivePoll(min_delay=float(poll_min), max_delay=float(poll_max))
+    repair_id, tasks = start_repair(run_id, profile, c, poll)
+    if repair_id is None:
+        print(f"Every task of run {run_id} succeeded, nothing to repair.")
+        return
+
+    print(f"Repairing run {run_id} (repair {repair_id}): {', '.join(tasks)}")
+    on_update = RunProgress(profile, int(output_lines), c=c).update if stream else None
+    policy = failure_policy(supervise, fail_fast, max_failed_tasks, critical_task)
+    supervised_wait(c, profile, run_id, poll, policy, on_update)
+
+
+@task(
+    iterable=["job_id"],
+    help={
+        "job_id": "ID of a job to trigger. Can be used repeatedly to specify many jobs. Eg `-j 123 -j 456`.",
+        "profile": "Optional databricks-cli profile name",
+        "concurrency": "Maximum number of runs to trigger and wait on at once",
+        "fail_fast": "Stop triggering jobs and stop waiting on runs as soon as one run does not succeed",
+        "poll_min": "Seconds between status polls while a run is starting up or changing state",
+        "poll_max": "Upper bound in seconds that polling backs off to for long running states",
+        "batch_poll": "Poll all in flight runs with a few `runs list` calls instead of one `runs get` per run",
+    },
+)
+def run_jobs(
+    c,
+    job_id=None,
+    profile=None,
+    concurrency=RUN_CONCURRENCY,
+    fail_fast=False,
+    poll_min=POLL_MIN_DELAY,
+    poll_max=POLL_MAX_DELAY,
+    batch_poll=False,
+):
+    """Trigger many jobs at once and wait on all of their runs concurrently.
+
+    Example usage:
+        $ invoke run-jobs -j 123 -j 456 -j 789 --concurrency 2 --fail-fast
+    """
+
+    def report(result):
+        outcome = result.error or result.state.get("result_state", result.state.get("life_cycle_state"))
+        print(f"job {result.job_id} run {result.run_id}: {outcome}")
+
+    results = run_jobs_concurrently(
+        job_id or [],
+        profile=profile,
+        max_workers=int(concurrency),
+        fail_fast=fail_fast,
+        poll_factory=lambda: AdaptivePoll(min_delay=float(poll_min), max_delay=float(poll_max)),
+        on_result=report,
+        batch_poll=batch_poll,
+    )
+    failed = [r for r in results if not r.succeeded]
+    if failed:
+        raise ValueError(f"{len(failed)} of {len(results)} runs did not succeed.")
+
+
+@task(
+    help={
+        "background": "Start the daemon in the background and return once it is accepting requests",
+        "idle_timeout": "Seconds without requests after which the daemon exits",
+    }
+)
+def daemon(c, background=False, idle_timeout=DAEMON_IDLE_TIMEOUT):
+    """Run a warm daemon for this project that other tasks hand their work to.
+
+    Keeps the poetry project, git state, job_id lookups and API connections alive between invoke calls.
+    It is only used by tasks run from the same directory with the same Databricks and CI environment variables.
+
+    Example usage in CI:
+        $ invoke daemon --background
+        $ invoke upload && invoke define-jobs --manifest jobs/manifest.yml
+        $ invoke daemon-stop
+    """
+    if daemon_running():
+        print(f"Daemon already running on {daemon_socket_path()}")
+    elif not background:
+        print(f"Daemon listening on {daemon_socket_path()}")
+        serve_daemon(float(idle_timeout))
+    elif start_daemon(float(idle_timeout)):
+        print(f"Daemon listening on {daemon_socket_path()}")
+    else:
+        raise ValueError("Daemon did not start, run `invoke daemon` in the foreground to see why.")
+
+
+@task
+def daemon_stop(c):
+    """Stop this project's warm daemon if it is running."""
+    print("Daemon stopped" if stop_daemon() else "Daemon was not running")
@@ -0,0 +1,198 @@
+# Standard Library
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from .ratelimit import RequestScheduler, parse_retry_after, request_scheduler
+
+# requests and databricks-cli are imported on first use to keep `invoke --list` fast.
+if TYPE_CHECKING:  # pragma: no cover
+    # Third Party
+    import requests
+    from databricks_cli.configure.provider import DatabricksConfig
+
+DEFAULT_API_VERSION = "2.0"
+POOL_SIZE = 16
+REQUEST_TIMEOUT = 60
+
+
+class DatabricksApiError(Exception):
+    """Raised when the Databricks REST API responds with an error status."""
+
+    def __init__(
+        self, message: str, status_code: int, error_code: Optional[str] = None, retry_after: Optional[float] = None
+    ) -> None:
+        """Capture the HTTP status, Databricks error code and any requested retry delay alongside the message."""
+        super().__init__(message)
+        self.status_code = status_code
+        self.error_code = error_code
+        self.retry_after = retry_after
+
+    @property
+    def is_not_found(self) -> bool:
+        """Whether the error means the requested resource does not exist.
+
+        Older endpoints report a missing job or run as an invalid parameter rather than a 404.
+        """
+        if self.status_code == 404 or self.error_code == "RESOURCE_DOES_NOT_EXIST":
+            return True
+        return self.error_code == "INVALID_PARAMETER_VALUE" and "does not exist" in str(self)
+
+    @property
+    def is_transient(self) -> bool:
+        """Whether the request may succeed if retried, ie the workspace was throttling or briefly unavailable."""
+        return self.status_code == 429 or self.status_code >= 500
+
+    @classmethod
+    def from_response(cls, response: "requests.Response") -> "DatabricksApiError":
+        """Build an error from a failed HTTP response."""
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        error_code = body.get("error_code") if isinstance(body, dict) else None
+        message = body.get("message", response.text) if isinstance(body, dict) else response.text
+        return cls(
+            f"{response.status_code} {error_code or response.reason}: {message}",
+            response.status_code,
+            error_code,
+            parse_retry_after(response.headers.get("Retry-After")),
+        )
+
+
+class DatabricksApiClient:
+    """In-process Databricks REST API client backed by a pooled keep-alive session.
+
+    One instance per profile is shared for the whole invoke session so connection setup and the TLS handshake
+    are paid once, rather than once per `databricks` CLI subprocess. Every request goes through the workspace's
+    `RequestScheduler`, which paces, caps and retries them.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        token: Optional[str] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        jobs_api_version: Optional[str] = None,
+        verify: bool = True,
+        pool_size: int = POOL_SIZE,
+        scheduler: Optional[RequestScheduler] = None,
+    ) -> None:
+        """Create a pooled session for the workspace at host."""
+        # Third Party
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.host = host.rstrip("/")
+        self.jobs_api_version = jobs_api_version or DEFAULT_API_VERSION
+        self.scheduler = scheduler or request_scheduler(self.host)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.verify = verify
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        elif username and password:
+            self.session.auth = (username, password)
+
+    @classmethod
+    def from_config(cls, config: "DatabricksConfig") -> "DatabricksApiClient":
+        """Create a client from a databricks-cli configuration."""
+        return cls(
+            host=config.host,
+            token=config.token,
+            username=config.username,
+            password=config.password,
+            jobs_api_version=config.jobs_api_version,
+            verify=config.insecure is None,
+        )
+
+    def url(self, path: str, version: Optional[str] = None) -> str:
+        """Build the full endpoint URL, using the Jobs API version for `/jobs` endpoints like the CLI does."""
+        if version is None:
+            version = self.jobs_api_version if path.startswith("/jobs") else DEFAULT_API_VERSION
+        return f"{self.host}/api/{version}{path}"
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Dict[str, Any]] = None,
+        version: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """Perform a request once the scheduler allows it and return the decoded JSON response.
+
+        Only GETs are retried after server errors unless the request is flagged `idempotent`, see
+        `RequestScheduler`.
+        """
+        return self.scheduler.run(method, path, lambda: self._send(method, path, data, version), idempotent)
+
+    def _send(
+        self, method: str, path: str, data: Optional[Dict[str, Any]] = None, version: Optional[str] = None
+    ) -> Dict[str, Any]:
+        url = self.url(path, version)
+        if method == "GET":
+            response = self.session.get(url, params=_query_params(data or {}), timeout=REQUEST_TIMEOUT)
+        else:
+            response = self.session.request(method, url, json=data or {}, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code >= 400:
+            raise DatabricksApiError.from_response(response)
+
+        decoded: Dict[str, Any] = response.json() if response.content else {}
+        return decoded
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None, version: Optional[str] = None) -> Dict[str, Any]:
+        """Perform a GET request."""
+        return self.request("GET", path, params, version)
+
+    def post(
+        self,
+        path: str,
+        data: Optional[Dict[str, Any]] = None,
+        version: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """Perform a POST request."""
+        return self.request("POST", path, data, version, idempotent)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+def _query_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Encode booleans the way the REST API expects them in a query string."""
+    return {k: (str(v).lower() if isinstance(v, bool) else v) for k, v in params.items() if v is not None}
+
+
+def resolve_config(profile: Optional[str] = None) -> Optional["DatabricksConfig"]:
+    """Resolve host and credentials the same way the databricks CLI does.
+
+    A named profile is read from `~/.databrickscfg`, otherwise `DATABRICKS_*` environment variables
+    take precedence over the DEFAULT profile. Returns None when nothing valid is configured.
+    """
+    # Third Party
+    from databricks_cli.configure.provider import (
+        DefaultConfigProvider,
+        ProfileConfigProvider,
+    )
+
+    if profile:
+        return ProfileConfigProvider(profile).get_config()
+    return DefaultConfigProvider().get_config()
+
+
+@lru_cache(maxsize=None)
+def api_client(profile: Optional[str] = None) -> Optional[DatabricksApiClient]:
+    """Get the shared API client for a profile.
+
+    Returns None when no credentials can be resolved so callers can fall back to the databricks CLI.
+    """
+    config = resolve_config(profile)
+    if config is None:
+        return None
+    return DatabricksApiClient.from_config(config)
@@ -0,0 +1,68 @@
+# Standard Library
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+JOB_ID_CACHE_TTL = 24 * 60 * 60
+
+
+def cache_dir() -> Path:
+    """Directory for caches that persist between invoke sessions, honouring XDG_CACHE_HOME."""
+    root = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(root) / "invoke-databricks-wheel-tasks"
+
+
+def workspace_key(workspace: str) -> str:
+    """Turn a workspace host into a safe file name."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", workspace)
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON via a temporary file and rename so concurrent readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    temp.write_text(json.dumps(data, indent=2, sort_keys=True))
+    os.replace(temp, path)
+
+
+class JobIdCache:
+    """Persistent job name to job_id lookup for one workspace.
+
+    Entries older than `ttl` seconds are ignored. Callers should `invalidate` an entry whose job_id turns out to
+    no longer exist.
+    """
+
+    def __init__(self, workspace: str, ttl: float = JOB_ID_CACHE_TTL, clock: Callable[[], float] = time.time) -> None:
+        """Load the cache file for `workspace`, usually the workspace host."""
+        self.path = cache_dir() / "job-ids" / f"{workspace_key(workspace)}.json"
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        try:
+            self._entries: Dict[str, Dict[str, Any]] = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, name: str) -> Optional[int]:
+        """Get the cached job_id for a job name if there is a fresh entry."""
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is None or self.clock() - entry["cached_at"] > self.ttl:
+            return None
+        return int(entry["job_id"])
+
+    def set(self, name: str, job_id: Any) -> None:
+        """Record the job_id for a job name."""
+        with self._lock:
+            self._entries[name] = {"job_id": int(job_id), "cached_at": self.clock()}
+            write_json_atomic(self.path, self._entries)
+
+    def invalidate(self, name: str) -> None:
+        """Forget the job_id for a job name."""
+        with self._lock:
+            if self._entries.pop(name, None) is not None:
+                write_json_atomic(self.path, self._entries)
@@ -0,0 +1,377 @@
+# Standard Library
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NoReturn, Optional, Type
+
+from .api import DatabricksApiError, api_client
+from .cache import cache_dir
+from .databricks import (
+    default_dbfs_artifact_path,
+    default_dbfs_wheel_path,
+    job_id_cache,
+)
+from .dbfs import file_sha256
+from .deploy import (
+    DEPLOY_CONCURRENCY,
+    DeployManifest,
+    JobSpec,
+    default_deploy_manifest_path,
+    deploy_jobs,
+    deploy_report,
+)
+from .git import CI_BRANCH_VARIABLES, git_current_branch, git_dir
+from .jobs import cluster_options
+from .poetry import (
+    poetry_project,
+    poetry_wheel_builder,
+    poetry_wheelname,
+    pyproject_path,
+)
+
+DAEMON_IDLE_TIMEOUT = 30 * 60
+DAEMON_CONNECT_TIMEOUT = 1.0
+# Seconds to wait for a daemon's response before giving up on it with a DaemonError.
+DAEMON_RESPONSE_TIMEOUT = 10 * 60.0
+DAEMON_START_TIMEOUT = 10.0
+DAEMON_SOCKET_ENV = "INVOKE_DATABRICKS_DAEMON_SOCKET"
+# Environment variables that change what tasks compute, the daemon only serves clients whose values match its own.
+DAEMON_ENV_PREFIXES = ["DATABRICKS_", "INVOKE_DATABRICKS_", "GIT_", "XDG_CACHE_HOME", "HOME", *CI_BRANCH_VARIABLES]
+
+
+class DaemonError(Exception):
+    """Raised for an error inside the daemon that has no better matching local exception type."""
+
+
+# Exceptions raised inside the daemon that are re-raised as the same type by the client.
+DAEMON_ERROR_TYPES: Dict[str, Type[Exception]] = {
+    e.__name__: e for e in [ValueError, KeyError, FileNotFoundError, DaemonError]
+}
+
+
+def wheel_paths(branch_name: Optional[str] = None) -> Dict[str, str]:
+    """Wheel name and DBFS paths for the current project and branch."""
+    return {
+        "wheel_name": poetry_wheelname(),
+        "artifact_path": default_dbfs_artifact_path(branch_name),
+        "wheel_path": default_dbfs_wheel_path(branch_name),
+    }
+
+
+def deploy(
+    specs: List[List[str]],
+    environment_variables: Optional[Dict[str, str]] = None,
+    profile: Optional[str] = None,
+    job_cache_ttl: float = 0,
+    force: bool = False,
+    max_workers: int = DEPLOY_CONCURRENCY,
+    incremental: bool = False,
+    manifest_path: Optional[str] = None,
+    wheel_file: Optional[str] = None,
+    share_clusters: bool = False,
+    instance_pool_id: Optional[str] = None,
+    driver_instance_pool_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Deploy jobs from `[jinja_template, config_file]` pairs and return the `deploy_report`.
+
+    When `incremental`, jobs are fingerprinted against a `DeployManifest` at `manifest_path`, defaulting to one per
+    workspace in the cache directory. The wheel hash comes from `wheel_file`, defaulting to the project's wheel in
+    `dist/` if it has been built.
+
+    `share_clusters`, `instance_pool_id` and `driver_instance_pool_id` optimise the rendered jobs' clusters, see
+    `ClusterOptions`.
+    """
+    clusters = cluster_options(share_clusters, instance_pool_id, driver_instance_pool_id)
+    cache = job_id_cache(profile, float(job_cache_ttl))
+    manifest = None
+    wheel_sha256 = None
+    if incremental:
+        manifest = DeployManifest(manifest_path or default_deploy_manifest_path(profile), profile)
+        if wheel_file is None and pyproject_path().exists():
+            wheel_file = str(Path("dist") / poetry_wheelname())
+        if wheel_file is not None and Path(wheel_file).is_file():
+            wheel_sha256 = file_sha256(Path(wheel_file))
+    results = deploy_jobs(
+        [JobSpec(*s) for s in specs],
+        environment_variables,
+        profile,
+        cache,
+        max_workers,
+        force,
+        manifest,
+        wheel_sha256,
+        clusters,
+    )
+    return deploy_report(results)
+
+
+# Work tasks can hand to the daemon. Arguments and results must survive a JSON round trip.
+DAEMON_OPERATIONS: Dict[str, Callable[..., Any]] = {"wheel_paths": wheel_paths, "deploy": deploy}
+
+
+def daemon_socket_path(project_dir: Optional[Path] = None) -> Path:
+    """Socket of the daemon for a project directory, overridable with INVOKE_DATABRICKS_DAEMON_SOCKET."""
+    if os.environ.get(DAEMON_SOCKET_ENV):
+        return Path(os.environ[DAEMON_SOCKET_ENV])
+    project = str((project_dir or Path.cwd()).resolve())
+    # Unix socket paths are limited to ~100 characters so use a short digest rather than the project path.
+    return cache_dir() / "daemon" / f"{hashlib.sha256(project.encode()).hexdigest()[:16]}.sock"
+
+
+def daemon_environment() -> Dict[str, str]:
+    """The subset of the environment that affects what tasks compute."""
+    return {k: v for k, v in sorted(os.environ.items()) if any(k.startswith(p) for p in DAEMON_ENV_PREFIXES)}
+
+
+def watched_files(project_dir: Path) -> List[Path]:
+    """Files whose changes invalidate the daemon's caches."""
+    files = [project_dir / "pyproject.toml", Path.home() / ".databrickscfg"]
+    gitdir = git_dir(project_dir)
+    if gitdir is not None:
+        files.append(gitdir / "HEAD")
+    return files
+
+
+def clear_caches() -> None:
+    """Forget everything derived from the project, git state and Databricks configuration."""
+    for cached in [default_dbfs_artifact_path, default_dbfs_wheel_path, git_current_branch]:
+        cached.cache_clear()
+    poetry_project.cache_clear()
+    poetry_wheel_builder.cache_clear()
+    api_client.cache_clear()
+
+
+def error_response(e: Exception) -> Dict[str, Any]:
+    """Describe an exception so the client can raise an equivalent one."""
+    error: Dict[str, Any] = {"type": type(e).__name__, "message": str(e)}
+    if isinstance(e, DatabricksApiError):
+        error.update(status_code=e.status_code, error_code=e.error_code)
+    return {"error": error}
+
+
+def raise_error(error: Dict[str, Any]) -> NoReturn:
+    """Raise the local equivalent of an exception described by `error_response`."""
+    if error["type"] == "DatabricksApiError":
+        raise DatabricksApiError(error["message"], error["status_code"], error["error_code"])
+    if error["type"] in DAEMON_ERROR_TYPES:
+        raise DAEMON_ERROR_TYPES[error["type"]](error["message"])
+    raise DaemonError(f"{error['type']}: {error['message']}")
+
+
+class WarmDaemon:
+    """Serves DAEMON_OPERATIONS for one project directory from a long-lived process.
+
+    Keeps the poetry project, git state, parsed configs, job_id lookups and API connections warm between the
+    short-lived `invoke` processes that send it work over a unix socket. Caches are cleared whenever a watched file
+    changes, and the daemon exits after `idle_timeout` seconds without requests.
+    """
+
+    def __init__(
+        self,
+        socket_path: Path,
+        project_dir: Optional[Path] = None,
+        idle_timeout: float = DAEMON_IDLE_TIMEOUT,
+        operations: Optional[Dict[str, Callable[..., Any]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Prepare, but don't start, a daemon listening on socket_path."""
+        self.socket_path = socket_path
+        self.project_dir = (project_dir or Path.cwd()).resolve()
+        self.idle_timeout = idle_timeout
+        self.operations = DAEMON_OPERATIONS if operations is None else operations
+        self.clock = clock
+        self.environment = daemon_environment()
+        self.last_request = clock()
+        self._lock = threading.Lock()
+        self._fingerprint = self.fingerprint()
+        self._stopped = threading.Event()
+        self.server: Optional[socketserver.ThreadingUnixStreamServer] = None
+
+    def fingerprint(self) -> Dict[str, Optional[int]]:
+        """Modification times of the watched files, None for missing ones."""
+        return {str(f): f.stat().st_mtime_ns if f.exists() else None for f in watched_files(self.project_dir)}
+
+    def invalidate_if_changed(self) -> bool:
+        """Clear caches if any watched file changed since the last request."""
+        with self._lock:
+            fingerprint = self.fingerprint()
+            if fingerprint == self._fingerprint:
+                return False
+            self._fingerprint = fingerprint
+            clear_caches()
+            return True
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request, or decline it if the client's project or environment differs from the daemon's."""
+        self.last_request = self.clock()
+        if request.get("operation") == "shutdown":
+            threading.Thread(target=self.stop, daemon=True).start()
+            return {"result": None}
+        if Path(request.get("cwd", "")).resolve() != self.project_dir:
+            return {"unavailable": "daemon serves a different project"}
+        if request.get("env") != self.environment:
+            return {"unavailable": "environment differs from the daemon's"}
+        operation = self.operations.get(request.get("operation", ""))
+        if operation is None:
+            return {"unavailable": f"unknown operation {request.get('operation')}"}
+
+        self.invalidate_if_changed()
+        try:
+            return {"result": operation(*request.get("args", []), **request.get("kwargs", {}))}
+        except Exception as e:
+            return error_response(e)
+
+    def serve(self) -> None:
+        """Listen on the socket until stopped or idle for too long."""
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                line = self.rfile.readline()
+                if not line:  # A liveness check that connected and hung up
+                    return
+                response = daemon.handle(json.loads(line))
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        self.server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        self.server.daemon_threads = True
+        os.chmod(self.socket_path, 0o600)
+        threading.Thread(target=self._watch_idle, daemon=True).start()
+        try:
+            self.server.serve_forever(poll_interval=0.1)
+        finally:
+            self.server.server_close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._stopped.set()
+        if self.server is not None:
+            self.server.shutdown()
+
+    def _watch_idle(self) -> None:
+        while not self._stopped.wait(min(1.0, self.idle_timeout)):
+            if self.clock() - self.last_request > self.idle_timeout:
+                self.stop()
+
+
+def daemon_request(socket_path: Path, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one request to a daemon and wait up to DAEMON_RESPONSE_TIMEOUT for its response.
+
+    Raises:
+        OSError: When the daemon couldn't be reached, before it got the request.
+        DaemonError: When the daemon got the request but didn't respond, it may still be running it.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(DAEMON_CONNECT_TIMEOUT)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        # Operations like deploys can take a while, only connecting is expected to be quick.
+        sock.settimeout(DAEMON_RESPONSE_TIMEOUT)
+        try:
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        except OSError as e:
+            raise DaemonError(
+                f"Daemon didn't respond to {request['operation']} within {DAEMON_RESPONSE_TIMEOUT}s ({e}), "
+                "it may still be running it"
+            ) from e
+    if not line:
+        raise DaemonError(f"Daemon closed the connection without responding to {request['operation']}")
+    return dict(json.loads(line))
+
+
+def daemon_call(operation: str, *args: Any, **kwargs: Any) -> Any:
+    """Run an operation on the project's daemon if one is running, or inline otherwise.
+
+    Also runs inline when the daemon declines the request, eg it serves another project, or can't be reached. Once
+    the daemon has the request it is never run inline as well, since operations like deploys aren't idempotent, a
+    daemon that doesn't respond in time raises a DaemonError instead.
+    """
+    socket_path = daemon_socket_path()
+    if socket_path.exists():
+        request = {
+            "operation": operation,
+            "args": args,
+            "kwargs": kwargs,
+            "cwd": str(Path.cwd()),
+            "env": daemon_environment(),
+        }
+        try:
+            response = daemon_request(socket_path, request)
+        except OSError:
+            response = {"unavailable": "daemon is not running"}
+        if "error" in response:
+            raise_error(response["error"])
+        if "unavailable" not in response:
+            return response["result"]
+    return DAEMON_OPERATIONS[operation](*args, **kwargs)
+
+
+def warm_up() -> None:
+    """Fill the caches a daemon would otherwise fill on its first request."""
+    try:
+        wheel_paths()
+        api_client()
+    except Exception:  # pragma: no cover - anything broken here is reported by the request that needs it
+        pass
+
+
+def serve_daemon(idle_timeout: float = DAEMON_IDLE_TIMEOUT) -> None:
+    """Run a daemon for the current directory in the foreground."""
+    warm_up()
+    WarmDaemon(daemon_socket_path(), idle_timeout=idle_timeout).serve()
+
+
+def start_daemon(idle_timeout: float = DAEMON_IDLE_TIMEOUT) -> bool:
+    """Start a daemon for the current directory in the background, returning False if it didn't come up."""
+    socket_path = daemon_socket_path()
+    subprocess.Popen(
+        [sys.executable, "-m", __name__, str(idle_timeout)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if daemon_running(socket_path):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def daemon_running(socket_path: Optional[Path] = None) -> bool:
+    """Whether a daemon is accepting connections on the socket."""
+    socket_path = socket_path or daemon_socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(DAEMON_CONNECT_TIMEOUT)
+            sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+
+
+def stop_daemon() -> bool:
+    """Ask the project's daemon to exit, returning False if none was running."""
+    try:
+        daemon_request(daemon_socket_path(), {"operation": "shutdown"})
+        return True
+    except OSError:
+        return False
+
+
+if __name__ == "__main__":  # pragma: no cover
+    serve_daemon(float(sys.argv[1]) if len(sys.argv) > 1 else DAEMON_IDLE_TIMEOUT)
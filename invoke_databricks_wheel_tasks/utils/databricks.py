@@ -1,18 +1,36 @@
 # Standard Library
 import json
-import os
-import time
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import lru_cache
+from pathlib import Path
 from pprint import pprint as pp
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
 # Third Party
 import invoke
 
+from .api import DatabricksApiError, api_client
+from .cache import JOB_ID_CACHE_TTL, JobIdCache
 from .git import git_current_branch
+from .jobs import job_settings_changed
 from .poetry import poetry_project_name, poetry_wheelname
+from .polling import FAST_POLL_STATES, AdaptivePoll
+from .ratelimit import request_scheduler
 
-POLL_DELAY = 5
+LIST_JOBS_PAGE_SIZE = 25
+LIST_RUNS_PAGE_SIZE = 25
+RUN_CONCURRENCY = 8
+# Above this many distinct jobs a single workspace wide listing of active runs is cheaper than one listing per job.
+BATCH_POLL_JOB_LIMIT = 5
+TERMINAL_STATES = ["TERMINATED", "SKIPPED", "INTERNAL_ERROR"]
+# CLI verbs that only read, the rest change something so are not retried after a server error.
+CLI_READ_VERBS = ["list", "get", "get-output", "ls", "cat"]
+# HTTP errors as the CLI reports them, eg `HTTPError: 503 Server Error: Service Unavailable for url: ...`
+CLI_THROTTLED_PATTERN = re.compile(r"\b429 Client Error\b|\bToo Many Requests\b")
+CLI_SERVER_ERROR_PATTERN = re.compile(r"\b(5\d\d) (Server Error|Service Unavailable)\b")
 
 
 @lru_cache(maxsize=None)
@@ -29,73 +47,583 @@ def default_dbfs_wheel_path(branch_name: Optional[str] = None) -> str:
     return f"{default_dbfs_artifact_path(branch_name)}{poetry_wheelname()}"
 
 
+def databricks_cli(command: str, profile: Optional[str] = None, c: Optional[invoke.Context] = None) -> Any:
+    """Fallback to running a databricks CLI command and parsing its JSON output.
+
+    Used when no API credentials can be resolved in-process, eg the CLI is configured in a way we don't support.
+    Commands of a profile share a `RequestScheduler` of their own, so they are paced and throttled commands are
+    retried like API requests.
+    """
+    profile_flag = f"--profile {profile}" if profile else ""
+    runner = c.run if c is not None else invoke.run
+    method, path = cli_endpoint(command)
+
+    def run() -> Any:
+        result = runner(f"databricks {profile_flag} {command}", hide=True, warn=True)
+        status = cli_error_status(f"{result.stdout}\n{result.stderr}") if result.failed else None
+        if status is not None:
+            raise DatabricksApiError(result.stderr.strip() or result.stdout.strip(), status)
+        if result.failed:
+            raise invoke.UnexpectedExit(result)
+        try:
+            return json.loads(result.stdout) if result.stdout.strip() else {}
+        except ValueError:
+            status = cli_error_status(result.stdout)
+            if status is None:
+                raise
+            raise DatabricksApiError(result.stdout.strip(), status) from None
+
+    return request_scheduler(f"cli:{profile or 'DEFAULT'}").run(method, path, run)
+
+
+def cli_endpoint(command: str) -> Tuple[str, str]:
+    """REST method and endpoint a CLI command calls, eg `runs get ...` is `GET /jobs/runs/get`."""
+    group, verb = (command.split() + ["", ""])[:2]
+    path = {"jobs": f"/jobs/{verb}", "runs": f"/jobs/runs/{verb}"}.get(group, f"/{group}/{verb}")
+    return ("GET" if verb in CLI_READ_VERBS else "POST"), path
+
+
+def cli_error_status(output: str) -> Optional[int]:
+    """HTTP status of a throttled or failed request reported in CLI output, if any.
+
+    Only matches the shape of an HTTP error, eg `429 Client Error: Too Many Requests`, never a bare number that
+    could be an id or a size.
+    """
+    if CLI_THROTTLED_PATTERN.search(output):
+        return 429
+    match = CLI_SERVER_ERROR_PATTERN.search(output)
+    return int(match.group(1)) if match else None
+
+
 def list_jobs(profile: Optional[str] = None) -> Dict[str, str]:
     """List Jobs from databricks workspace.
 
     Returns a dictionary with job names as keys and job IDs as values.
     """
-    profile_flag = f"--profile {profile}" if profile else ""
-    result = invoke.run(f"databricks {profile_flag} jobs list --output JSON", hide=True)
-    run_status = json.loads(result.stdout)
-    jobs = {e["settings"]["name"]: e["job_id"] for e in run_status["jobs"]}
-    return jobs
+    client = api_client(profile)
+    if client is None:
+        run_status = databricks_cli("jobs list --output JSON", profile)
+        return {e["settings"]["name"]: e["job_id"] for e in run_status["jobs"]}
+
+    # Jobs API 2.1 pages its listing whereas 2.0 returns everything and ignores the paging parameters.
+    jobs = {}
+    offset = 0
+    while True:
+        page = client.get("/jobs/list", {"limit": LIST_JOBS_PAGE_SIZE, "offset": offset})
+        page_jobs = page.get("jobs", [])
+        jobs.update({e["settings"]["name"]: e["job_id"] for e in page_jobs})
+        if not page.get("has_more") or not page_jobs:
+            return jobs
+        offset += len(page_jobs)
+
+
+def get_job(job_id: Union[int, str], profile: Optional[str] = None) -> Any:
+    """Get a job's metadata, including its current settings."""
+    client = api_client(profile)
+    if client is None:
+        return databricks_cli(f"jobs get --job-id {job_id}", profile)
+    return client.get("/jobs/get", {"job_id": job_id})
+
+
+def find_job_id(name: str, profile: Optional[str] = None, cache: Optional[JobIdCache] = None) -> Optional[int]:
+    """Resolve a job name to its job_id, or None if no job has that name.
+
+    A fresh cache entry avoids any API call. Otherwise Jobs API 2.1 filters the listing by name server side,
+    and the listing is paged only until the name is found.
+    """
+    if cache is not None:
+        cached = cache.get(name)
+        if cached is not None:
+            return cached
+
+    client = api_client(profile)
+    if client is None:
+        job_id = list_jobs(profile).get(name)
+    else:
+        job_id = None
+        params: Dict[str, Any] = {"limit": LIST_JOBS_PAGE_SIZE, "offset": 0}
+        if client.jobs_api_version == "2.1":
+            params["name"] = name
+        while job_id is None:
+            page = client.get("/jobs/list", params)
+            page_jobs = page.get("jobs", [])
+            job_id = next((e["job_id"] for e in page_jobs if e["settings"]["name"] == name), None)
+            if not page.get("has_more") or not page_jobs:
+                break
+            params["offset"] += len(page_jobs)
+
+    if cache is not None and job_id is not None:
+        cache.set(name, job_id)
+    return int(job_id) if job_id is not None else None
+
+
+def job_id_cache(profile: Optional[str] = None, ttl: float = JOB_ID_CACHE_TTL) -> Optional[JobIdCache]:
+    """Get the persistent job_id cache for the workspace a profile points at.
+
+    Only available with the in-process API client since recovering from stale entries relies on its errors.
+    """
+    client = api_client(profile)
+    if client is None or ttl <= 0:
+        return None
+    return JobIdCache(client.host, ttl)
 
 
 def create_or_reset_job(
-    json_payload: Dict[str, Any], profile: Optional[str] = None, job_id: Optional[str] = None
+    json_payload: Dict[str, Any], profile: Optional[str] = None, job_id: Optional[Union[int, str]] = None
 ) -> Any:
     """Create or Reset a Databricks Job definition.
 
     - Takes a parsed JSON payload dictionary,
-    - Encodes it into a temporary JSON file
-    - Runs the `create` or `reset` command depending on the presence of `job_id`
-    - cleans up temporary file
-    - returns response
+    - Sends it in memory, or through a private temporary file for the CLI fallback
+    - Runs the `create` or `reset` operation depending on the presence of `job_id`
+    - returns the parsed response
+
+    Safe to call concurrently from many threads or processes.
 
     Payload must comply with:
     https://docs.databricks.com/dev-tools/api/latest/jobs.html#
     """
-    profile_flag = f"--profile {profile}" if profile else ""
-    json_filename = "temp_job_file.json"
-    if os.path.exists(json_filename):
-        os.remove(json_filename)
+    client = api_client(profile)
+    if client is None:
+        return _cli_create_or_reset_job(json_payload, profile, job_id)
+
+    if job_id:
+        return client.post("/jobs/reset", {"job_id": job_id, "new_settings": json_payload})
+    return client.post("/jobs/create", json_payload)
 
-    with open(json_filename, "w") as f:
-        json.dump(json_payload, f)
 
+def delete_job(job_id: Union[int, str], profile: Optional[str] = None) -> None:
+    """Delete a Databricks Job, ignoring jobs that are already gone."""
+    client = api_client(profile)
+    if client is None:
+        databricks_cli(f"jobs delete --job-id {job_id}", profile)
+        return
+
+    try:
+        client.post("/jobs/delete", {"job_id": job_id})
+    except DatabricksApiError as e:
+        if not e.is_not_found:
+            raise
+
+
+class UpsertResult(NamedTuple):
+    """Outcome of deploying a job definition."""
+
+    action: str  # One of "created", "updated" or "unchanged"
+    job_id: int
+    response: Any
+
+
+def upsert_job(
+    json_payload: Dict[str, Any],
+    profile: Optional[str] = None,
+    job_id: Optional[int] = None,
+    cache: Optional[JobIdCache] = None,
+    force: bool = False,
+) -> UpsertResult:
+    """Create or Reset a job, skipping the reset when the deployed settings are already identical.
+
+    Unless `force` is set, the existing job's settings are fetched and compared with `json_payload` after
+    canonicalising both, see `job_settings_changed`.
+
+    If `job_id` came from the cache but the job has since been deleted, the stale entry is dropped and the job is
+    looked up by name again, creating it if it really is gone.
+    """
+    try:
+        return _upsert_job(json_payload, profile, job_id, cache, force)
+    except DatabricksApiError as e:
+        if cache is None or job_id is None or not e.is_not_found:
+            raise
+        cache.invalidate(json_payload["name"])
+        return _upsert_job(json_payload, profile, find_job_id(json_payload["name"], profile), cache, force)
+
+
+def _upsert_job(
+    json_payload: Dict[str, Any],
+    profile: Optional[str],
+    job_id: Optional[int],
+    cache: Optional[JobIdCache],
+    force: bool,
+) -> UpsertResult:
+    if job_id is None:
+        response = create_or_reset_job(json_payload, profile)
+        job_id, action = response["job_id"], "created"
+    elif not force and not job_settings_changed(json_payload, get_job(job_id, profile)["settings"]):
+        response, action = {}, "unchanged"
+    else:
+        response, action = create_or_reset_job(json_payload, profile, job_id), "updated"
+
+    if cache is not None:
+        cache.set(json_payload["name"], job_id)
+    return UpsertResult(action, int(job_id), response)
+
+
+def _cli_create_or_reset_job(
+    json_payload: Dict[str, Any], profile: Optional[str], job_id: Optional[Union[int, str]]
+) -> Any:
+    """Create or Reset a job with the databricks CLI via a temporary JSON file, see `cli_with_json_file`."""
     if job_id:
-        result = invoke.run(f"databricks {profile_flag} jobs reset --job-id {job_id} --json-file {json_filename}")
+        return cli_with_json_file(f"jobs reset --job-id {job_id}", json_payload, profile)
+    return cli_with_json_file("jobs create", json_payload, profile)
+
+
+def cli_with_json_file(
+    command: str, json_payload: Dict[str, Any], profile: Optional[str] = None, c: Optional[invoke.Context] = None
+) -> Any:
+    """Run a databricks CLI command that takes its payload from a `--json-file`.
+
+    Each call writes to its own private temporary directory, which is always cleaned up, so concurrent calls
+    from many threads or processes never see each other's payloads.
+    """
+    with tempfile.TemporaryDirectory(prefix="invoke-databricks-job-") as temp_dir:
+        json_filename = Path(temp_dir) / "job.json"
+        json_filename.write_text(json.dumps(json_payload))
+        return databricks_cli(f"{command} --json-file {json_filename}", profile, c)
+
+
+def submit_one_time_run(
+    json_payload: Dict[str, Any], profile: Optional[str] = None, c: Optional[invoke.Context] = None
+) -> int:
+    """Submit a one-time run without creating a job and return its run_id.
+
+    Submitting a run creates it, so failures are only retried when the payload carries an `idempotency_token`.
+    """
+    client = api_client(profile)
+    if client is None:
+        return int(cli_with_json_file("runs submit", json_payload, profile, c)["run_id"])
+    idempotent = "idempotency_token" in json_payload
+    return int(client.post("/jobs/runs/submit", json_payload, idempotent=idempotent)["run_id"])
+
+
+def run_now(job_id: str, profile: Optional[str] = None, c: Optional[invoke.Context] = None) -> Any:
+    """Trigger a job run and return the new run_id."""
+    client = api_client(profile)
+    if client is None:
+        return databricks_cli(f"jobs run-now --job-id {job_id}", profile, c)["run_id"]
+    return client.post("/jobs/run-now", {"job_id": int(job_id)})["run_id"]
+
+
+def get_run(
+    run_id: Optional[str],
+    profile: Optional[str] = None,
+    c: Optional[invoke.Context] = None,
+    include_history: bool = False,
+) -> Any:
+    """Get the metadata and state of a job run, optionally with its `repair_history`.
+
+    Repair history is a Jobs API 2.1 feature, so asking for it always uses 2.1 whatever the client defaults to.
+    """
+    client = api_client(profile)
+    if client is None:
+        return databricks_cli(f"runs get --run-id {run_id}", profile, c)
+    if include_history:
+        return client.get("/jobs/runs/get", {"run_id": run_id, "include_history": True}, "2.1")
+    return client.get("/jobs/runs/get", {"run_id": run_id})
+
+
+def latest_run_id(job_id: Any, profile: Optional[str] = None, c: Optional[invoke.Context] = None) -> Optional[int]:
+    """run_id of a job's most recent run, or None if it has never run."""
+    client = api_client(profile)
+    if client is None:
+        page = databricks_cli(f"runs list --job-id {job_id} --limit 1 --output JSON", profile, c)
     else:
-        result = invoke.run(f"databricks {profile_flag} jobs create --json-file {json_filename}")
+        page = client.get("/jobs/runs/list", {"job_id": job_id, "limit": 1})
+    runs = page.get("runs", [])
+    return int(runs[0]["run_id"]) if runs else None
 
-    os.remove(json_filename)
-    return result.stdout
 
+def repair_run(
+    run_id: Any, rerun_tasks: List[str], profile: Optional[str] = None, latest_repair_id: Optional[int] = None
+) -> int:
+    """Re-run some tasks of a finished run in place and return the repair_id.
 
-def wait_for_run_status(
-    c: invoke.Context,
+    Runs that have been repaired before must name their `latest_repair_id`. Repairs are a Jobs API 2.1 feature the
+    legacy databricks CLI doesn't have, so they need in-process API credentials.
+    """
+    client = api_client(profile)
+    if client is None:
+        raise ValueError("Repairing runs needs Databricks API credentials, see the README")
+    body = {"run_id": run_id, "rerun_tasks": rerun_tasks, "latest_repair_id": latest_repair_id}
+    return int(client.post("/jobs/runs/repair", {k: v for k, v in body.items() if v is not None}, "2.1")["repair_id"])
+
+
+def cancel_run(run_id: Any, profile: Optional[str] = None, c: Optional[invoke.Context] = None) -> None:
+    """Ask Databricks to cancel a run, which it does asynchronously."""
+    client = api_client(profile)
+    if client is None:
+        databricks_cli(f"runs cancel --run-id {run_id}", profile, c)
+        return
+    client.post("/jobs/runs/cancel", {"run_id": run_id})
+
+
+def get_run_output(run_id: Any, profile: Optional[str] = None, c: Optional[invoke.Context] = None) -> Any:
+    """Get the output of a finished single task run, or of one task of a multi-task run."""
+    client = api_client(profile)
+    if client is None:
+        return databricks_cli(f"runs get-output --run-id {run_id}", profile, c)
+    return client.get("/jobs/runs/get-output", {"run_id": run_id})
+
+
+def list_active_runs(profile: Optional[str] = None, job_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """List every active run in the workspace, or of a single job, following pagination."""
+    client = api_client(profile)
+    runs: List[Dict[str, Any]] = []
+    offset = 0
+    while True:
+        if client is None:
+            job_flag = f"--job-id {job_id} " if job_id else ""
+            page = databricks_cli(
+                f"runs list --active-only {job_flag}--offset {offset} --limit {LIST_RUNS_PAGE_SIZE} --output JSON",
+                profile,
+            )
+        else:
+            params = {"active_only": True, "job_id": job_id, "offset": offset, "limit": LIST_RUNS_PAGE_SIZE}
+            page = client.get("/jobs/runs/list", params)
+        page_runs = page.get("runs", [])
+        runs.extend(page_runs)
+        if not page.get("has_more") or not page_runs:
+            return runs
+        offset += len(page_runs)
+
+
+class RunStatusBatcher:
+    """Track many runs and poll all of them with a few paginated `runs list --active-only` calls.
+
+    A tracked run missing from the active listing has just finished, so only then is `runs get` used to fetch its
+    final state. Listing is per job while runs belong to at most `BATCH_POLL_JOB_LIMIT` jobs, and workspace wide
+    otherwise.
+    """
+
+    def __init__(self, profile: Optional[str] = None) -> None:
+        """Start with no tracked runs."""
+        self.profile = profile
+        self.tracked: Dict[int, Optional[str]] = {}
+        self.last_seen: Dict[int, Dict[str, Any]] = {}
+
+    def track(self, run_id: Any, job_id: Optional[str] = None) -> None:
+        """Start tracking a run, optionally noting the job it belongs to so listing can be scoped to it."""
+        self.tracked[int(run_id)] = job_id
+
+    def _listing_scopes(self) -> List[Optional[str]]:
+        job_ids = set(self.tracked.values())
+        if None in job_ids or len(job_ids) > BATCH_POLL_JOB_LIMIT:
+            return [None]
+        return [str(j) for j in sorted(job_ids, key=str)]
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Refresh the state of every tracked run and return the runs that have finished since the last poll.
+
+        Finished runs are no longer tracked afterwards.
+        """
+        if not self.tracked:
+            return []
+
+        active: Dict[int, Dict[str, Any]] = {}
+        for job_id in self._listing_scopes():
+            for run in list_active_runs(self.profile, job_id):
+                if int(run["run_id"]) in self.tracked:
+                    active[int(run["run_id"])] = run
+
+        finished = []
+        for run_id in list(self.tracked):
+            if run_id in active:
+                run = active[run_id]
+            else:
+                run = get_run(str(run_id), self.profile)
+                if run["state"]["life_cycle_state"] in TERMINAL_STATES:
+                    finished.append(run)
+                    del self.tracked[run_id]
+            self.last_seen[run_id] = run
+        return finished
+
+    def poll_state(self) -> str:
+        """Summarise tracked runs as a single state for `AdaptivePoll`.
+
+        Any pending run keeps polling fast, otherwise the summary changes whenever any tracked run changes state.
+        """
+        states = {run_id: self.last_seen[run_id]["state"]["life_cycle_state"] for run_id in self.tracked}
+        for state in FAST_POLL_STATES:
+            if state in states.values():
+                return state
+        return ",".join(f"{run_id}:{state}" for run_id, state in sorted(states.items()))
+
+
+def poll_run_status(
     profile: Optional[str],
     run_id: Optional[str],
     target_status: List[str] = ["TERMINATED"],
     failure_status: List[str] = ["INTERNAL_ERROR", "SKIPPED"],
-) -> None:
-    """Poll run status until in desired state."""
-    profile_flag = f"--profile {profile}" if profile else ""
-    current_status = None
-    url = None
-    run_status = {}
+    poll: Optional[AdaptivePoll] = None,
+    c: Optional[invoke.Context] = None,
+    stop: Optional[threading.Event] = None,
+    on_update: Optional[Callable[[Dict[str, Any]], Any]] = None,
+) -> Any:
+    """Poll run status until in desired state and return the last run status.
 
-    while current_status not in target_status:
-        result = c.run(f"databricks {profile_flag} runs get --run-id {run_id}", hide=True)
-        run_status = json.loads(result.stdout)
-        if url is None:
-            url = run_status["run_page_url"]
-            # print(url)
+    Returns as soon as the run reaches a target state. Between polls the delay adapts to the run's lifecycle state,
+    see `AdaptivePoll`. Setting `stop` abandons the wait early and returns the last status seen. Every polled status
+    is passed to `on_update`, including one about to fail the wait, eg to report progress with `RunProgress`.
+    """
+    if poll is None:
+        poll = AdaptivePoll(sleep=stop.wait) if stop is not None else AdaptivePoll()
 
+    while True:
+        run_status = get_run(run_id, profile, c)
+        if on_update is not None:
+            on_update(run_status)
         current_status = run_status["state"]["life_cycle_state"]
         if current_status in failure_status:
             raise ValueError(f"Run entered failed state {current_status}... aborting.")
+        if current_status in target_status or (stop is not None and stop.is_set()):
+            return run_status
 
-        time.sleep(POLL_DELAY)
+        poll.wait(current_status)
+        if stop is not None and stop.is_set():
+            return run_status
 
+
+def wait_for_run_status(
+    c: Optional[invoke.Context],
+    profile: Optional[str],
+    run_id: Optional[str],
+    target_status: List[str] = ["TERMINATED"],
+    failure_status: List[str] = ["INTERNAL_ERROR", "SKIPPED"],
+    poll: Optional[AdaptivePoll] = None,
+    on_update: Optional[Callable[[Dict[str, Any]], Any]] = None,
+) -> Any:
+    """Poll run status until in desired state and print the final state, see `poll_run_status`."""
+    run_status = poll_run_status(profile, run_id, target_status, failure_status, poll, c, on_update=on_update)
     pp(run_status["state"])
+    return run_status
+
+
+class RunResult(NamedTuple):
+    """Outcome of waiting on one triggered job run."""
+
+    job_id: str
+    run_id: Optional[int]
+    state: Dict[str, Any]
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the run terminated successfully."""
+        return self.error is None and self.state.get("result_state") == "SUCCESS"
+
+
+def run_jobs_concurrently(
+    job_ids: List[str],
+    profile: Optional[str] = None,
+    max_workers: int = RUN_CONCURRENCY,
+    fail_fast: bool = False,
+    poll_factory: Callable[[], AdaptivePoll] = AdaptivePoll,
+    on_result: Optional[Callable[[RunResult], None]] = None,
+    batch_poll: bool = False,
+) -> List[RunResult]:
+    """Trigger many jobs and wait on their runs concurrently.
+
+    At most `max_workers` runs are triggered and waited on at once. Results are passed to `on_result` as each run
+    finishes and returned in completion order. With `fail_fast` the first unsuccessful run stops any further jobs
+    being triggered and abandons waiting on the runs still in flight, which are reported with their last seen state.
+
+    By default each run is polled with its own `runs get` from a thread pool. Each run's poll schedule sleeps on
+    a shared stop event so abandoned waits wake up immediately. With `batch_poll` all in flight runs are polled
+    together through a `RunStatusBatcher` instead.
+    """
+    if batch_poll:
+        return _run_jobs_batched(job_ids, profile, max_workers, fail_fast, poll_factory, on_result)
+
+    stop = threading.Event()
+
+    def trigger_and_wait(job_id: str) -> RunResult:
+        if stop.is_set():
+            return RunResult(job_id, None, {}, "Not triggered after an earlier run failed")
+        run_id = None
+        try:
+            run_id = run_now(job_id, profile)
+            poll = poll_factory()
+            poll.sleep = stop.wait
+            result = RunResult(job_id, run_id, poll_run_status(profile, run_id, poll=poll, stop=stop)["state"])
+        except Exception as e:
+            result = RunResult(job_id, run_id, {}, str(e))
+
+        if fail_fast and not result.succeeded:
+            stop.set()
+        return result
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(trigger_and_wait, job_id) for job_id in job_ids]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    return results
+
+
+def _run_jobs_batched(
+    job_ids: List[str],
+    profile: Optional[str],
+    max_workers: int,
+    fail_fast: bool,
+    poll_factory: Callable[[], AdaptivePoll],
+    on_result: Optional[Callable[[RunResult], None]],
+) -> List[RunResult]:
+    """Trigger jobs as slots free up and poll all in flight runs with one `RunStatusBatcher`."""
+    pending = list(job_ids)
+    in_flight: Dict[int, str] = {}
+    batcher = RunStatusBatcher(profile)
+    poll = poll_factory()
+    results: List[RunResult] = []
+
+    def finish(result: RunResult) -> bool:
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+        return fail_fast and not result.succeeded
+
+    stopped = False
+    while (pending and not stopped) or in_flight:
+        while pending and not stopped and len(in_flight) < max_workers:
+            stopped = _start_run(pending.pop(0), profile, in_flight, batcher, finish)
+
+        for run in batcher.poll():
+            run_id = int(run["run_id"])
+            stopped = finish(_finished_run_result(in_flight.pop(run_id), run)) or stopped
+
+        if stopped:
+            for run_id, job_id in in_flight.items():
+                finish(RunResult(job_id, run_id, batcher.last_seen[run_id]["state"]))
+            in_flight.clear()
+        elif in_flight:
+            poll.wait(batcher.poll_state())
+
+    for job_id in pending:
+        finish(RunResult(job_id, None, {}, "Not triggered after an earlier run failed"))
+    return results
+
+
+def _start_run(
+    job_id: str,
+    profile: Optional[str],
+    in_flight: Dict[int, str],
+    batcher: RunStatusBatcher,
+    finish: Callable[[RunResult], bool],
+) -> bool:
+    """Trigger a job and track its run, returning whether a failure to trigger should stop the batch."""
+    try:
+        run_id = int(run_now(job_id, profile))
+    except Exception as e:
+        return finish(RunResult(job_id, None, {}, str(e)))
+    in_flight[run_id] = job_id
+    batcher.track(run_id, job_id)
+    return False
+
+
+def _finished_run_result(job_id: str, run: Dict[str, Any]) -> RunResult:
+    """Build the result of a run that reached a terminal state, flagging the failed lifecycle states."""
+    life_cycle_state = run["state"]["life_cycle_state"]
+    error = None if life_cycle_state == "TERMINATED" else f"Run entered failed state {life_cycle_state}... aborting."
+    return RunResult(job_id, int(run["run_id"]), run["state"], error)
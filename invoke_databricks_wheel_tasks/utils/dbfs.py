@@ -0,0 +1,208 @@
+# Standard Library
+import base64
+import hashlib
+import posixpath
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, TypeVar
+
+from .api import DatabricksApiClient, DatabricksApiError
+
+# DBFS add-block accepts at most 1MB of (pre base64 encoding) data per call.
+BLOCK_SIZE = 1024 * 1024
+HASH_SUFFIX = ".sha256"
+UPLOAD_CONCURRENCY = 4
+UPLOAD_RETRIES = 3
+UPLOAD_RETRY_DELAY = 1.0
+
+T = TypeVar("T")
+
+
+class UploadedFile(NamedTuple):
+    """Outcome of uploading one local file to DBFS."""
+
+    source: Path
+    target: str
+    size: int
+    skipped: bool  # True when the remote copy already had the same content hash
+    seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Upload speed in bytes per second, 0 for skipped files."""
+        return self.size / self.seconds if self.seconds > 0 and not self.skipped else 0.0
+
+
+def dbfs_api_path(path: str) -> str:
+    """Strip the `dbfs:` scheme the CLI accepts since the REST API only takes absolute paths."""
+    return path[len("dbfs:") :] if path.startswith("dbfs:") else path
+
+
+def dbfs_ls(client: DatabricksApiClient, path: str, missing_ok: bool = False) -> List[Dict[str, Any]]:
+    """List the files in a DBFS directory, optionally treating a missing directory as empty."""
+    try:
+        return list(client.get("/dbfs/list", {"path": dbfs_api_path(path)}).get("files", []))
+    except DatabricksApiError as e:
+        if missing_ok and e.is_not_found:
+            return []
+        raise
+
+
+def dbfs_ls_sizes(client: DatabricksApiClient, path: str) -> Dict[str, int]:
+    """Map each file in a DBFS directory to its size, treating a missing directory as empty."""
+    return {f["path"]: f["file_size"] for f in dbfs_ls(client, path, missing_ok=True) if not f["is_dir"]}
+
+
+def dbfs_delete(client: DatabricksApiClient, path: str, recursive: bool = False, missing_ok: bool = True) -> None:
+    """Delete a DBFS file or directory, ignoring paths that are already gone unless `missing_ok` is False.
+
+    DBFS gives up on large recursive deletes with PARTIAL_DELETE after removing a batch of files, so keep
+    re-issuing the delete until it completes.
+    """
+    while True:
+        try:
+            client.post("/dbfs/delete", {"path": dbfs_api_path(path), "recursive": recursive})
+            return
+        except DatabricksApiError as e:
+            if e.is_not_found and missing_ok:
+                return
+            if e.error_code != "PARTIAL_DELETE":
+                raise
+
+
+def dbfs_read_text(client: DatabricksApiClient, path: str, length: Optional[int] = BLOCK_SIZE) -> str:
+    """Read the start of a DBFS file as text, or all of it when length is None."""
+    data = bytearray()
+    while length is None or len(data) < length:
+        chunk = BLOCK_SIZE if length is None else min(BLOCK_SIZE, length - len(data))
+        response = client.get("/dbfs/read", {"path": dbfs_api_path(path), "offset": len(data), "length": chunk})
+        if not response.get("bytes_read"):
+            break
+        data.extend(base64.b64decode(response["data"]))
+    return data.decode()
+
+
+def retrying(call: Callable[[], T], retries: int = UPLOAD_RETRIES, sleep: Callable[[float], Any] = time.sleep) -> T:
+    """Call `call`, retrying server and connection errors with exponential backoff or after `Retry-After`.
+
+    For calls that are only safe to repeat in context, eg appending a block to a file that is verified afterwards,
+    since the `RequestScheduler` doesn't retry these errors for requests that aren't idempotent. Throttling is
+    left to the scheduler alone, which already retries it against the workspace's shared `RetryBudget`.
+    """
+    # Third Party
+    import requests
+
+    attempt = 0
+    while True:
+        try:
+            return call()
+        except (DatabricksApiError, requests.ConnectionError, requests.Timeout) as e:
+            if attempt >= retries or (isinstance(e, DatabricksApiError) and e.status_code < 500):
+                raise
+            retry_after = e.retry_after if isinstance(e, DatabricksApiError) else None
+            sleep(UPLOAD_RETRY_DELAY * 2**attempt if retry_after is None else retry_after)
+            attempt += 1
+
+
+def dbfs_put_text(client: DatabricksApiClient, text: str, target: str) -> None:
+    """Write a text file to DBFS, overwriting any existing file."""
+    data = text.encode()
+    handle = client.post("/dbfs/create", {"path": dbfs_api_path(target), "overwrite": True})["handle"]
+    for offset in range(0, len(data), BLOCK_SIZE):
+        block = base64.b64encode(data[offset : offset + BLOCK_SIZE]).decode()
+        client.post("/dbfs/add-block", {"handle": handle, "data": block})
+    client.post("/dbfs/close", {"handle": handle})
+
+
+def file_sha256(path: Path) -> str:
+    """Hex SHA-256 digest of a local file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dbfs_put_file(
+    client: DatabricksApiClient,
+    source: Path,
+    target: str,
+    retries: int = UPLOAD_RETRIES,
+    sleep: Callable[[float], Any] = time.sleep,
+) -> None:
+    """Stream a local file to DBFS in blocks, overwriting any existing file.
+
+    Blocks are read into one reused buffer and each API call is retried on its own, so a transient failure costs
+    one block rather than the whole file. A block whose response was lost may still have been appended, so the
+    uploaded size is checked afterwards and the file restarted from scratch on a mismatch.
+    """
+    path = dbfs_api_path(target)
+    size = source.stat().st_size
+    buffer = bytearray(BLOCK_SIZE)
+    view = memoryview(buffer)
+
+    for attempt in range(retries + 1):
+        created = retrying(lambda: client.post("/dbfs/create", {"path": path, "overwrite": True}), retries, sleep)
+        handle = created["handle"]
+        with open(source, "rb") as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                block = {"handle": handle, "data": base64.b64encode(view[:n]).decode()}
+                retrying(lambda: client.post("/dbfs/add-block", block), retries, sleep)
+        retrying(lambda: client.post("/dbfs/close", {"handle": handle}), retries, sleep)
+
+        uploaded = client.get("/dbfs/get-status", {"path": path})["file_size"]
+        if uploaded == size:
+            return
+    raise OSError(f"Uploaded {uploaded} bytes to {target} but {source} is {size} bytes")
+
+
+def dbfs_upload(
+    client: DatabricksApiClient,
+    source_path: str,
+    target_path: str,
+    skip_unchanged: bool = True,
+    max_workers: int = UPLOAD_CONCURRENCY,
+    retries: int = UPLOAD_RETRIES,
+    sleep: Callable[[float], Any] = time.sleep,
+) -> List[UploadedFile]:
+    """Recursively copy the contents of a local directory into a DBFS directory.
+
+    Mirrors `dbfs cp -r <source_path> <target_path> --overwrite`, except that uploads are content addressed:
+    each artifact gets a `<name>.sha256` sidecar in DBFS, and with `skip_unchanged` a file whose remote copy has
+    the same size and hash is not uploaded again. That costs one listing per directory plus one small read per
+    candidate file instead of transferring the file.
+
+    Up to `max_workers` files are uploaded at once, see `dbfs_put_file` for how each one is streamed.
+    """
+    source = Path(source_path)
+    files = sorted(p for p in source.rglob("*") if p.is_file()) if source.is_dir() else [source]
+    files = [f for f in files if not f.name.endswith(HASH_SUFFIX)]
+    target_root = target_path.rstrip("/")
+    targets = [f"{target_root}/{f.relative_to(source).as_posix() if source.is_dir() else f.name}" for f in files]
+
+    remote_sizes: Dict[str, int] = {}
+    if skip_unchanged:
+        for directory in sorted({posixpath.dirname(dbfs_api_path(t)) for t in targets}):
+            remote_sizes.update(dbfs_ls_sizes(client, directory))
+
+    def upload(file: Path, target: str) -> UploadedFile:
+        started = time.perf_counter()
+        size = file.stat().st_size
+        sha256 = file_sha256(file)
+        api_target = dbfs_api_path(target)
+        if remote_sizes.get(api_target) == size and api_target + HASH_SUFFIX in remote_sizes:
+            if dbfs_read_text(client, target + HASH_SUFFIX).split(" ")[0].strip() == sha256:
+                return UploadedFile(file, target, size, True)
+
+        # Remove the old hash first so an interrupted upload is never mistaken for an unchanged one.
+        retrying(lambda: dbfs_delete(client, target + HASH_SUFFIX, missing_ok=True), retries, sleep)
+        dbfs_put_file(client, file, target, retries, sleep)
+        retrying(lambda: dbfs_put_text(client, f"{sha256}  {file.name}\n", target + HASH_SUFFIX), retries, sleep)
+        return UploadedFile(file, target, size, False, time.perf_counter() - started)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(upload, files, targets))
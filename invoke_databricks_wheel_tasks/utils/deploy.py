@@ -0,0 +1,314 @@
+# Standard Library
+import glob
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .api import DatabricksApiError, api_client
+from .cache import JobIdCache, cache_dir, workspace_key, write_json_atomic
+from .databricks import find_job_id, list_jobs, upsert_job
+from .dbfs import dbfs_put_text, dbfs_read_text
+from .jobs import ClusterOptions, ClusterSavings, optimise_clusters
+from .misc import load_config, merge_template
+
+DEPLOY_CONCURRENCY = 8
+# skipped means the job's inputs matched the deploy manifest so nothing was rendered or sent.
+DEPLOY_ACTIONS = ["created", "updated", "unchanged", "skipped", "failed"]
+
+
+class JobSpec(NamedTuple):
+    """A Jinja2 job template paired with the config file that parametrises it."""
+
+    jinja_template: str
+    config_file: str
+
+
+class DeployResult(NamedTuple):
+    """Outcome of deploying one job spec."""
+
+    spec: JobSpec
+    name: Optional[str]
+    action: str  # One of DEPLOY_ACTIONS
+    job_id: Optional[int] = None
+    error: Optional[Exception] = None
+    cluster_savings: Optional[ClusterSavings] = None  # Only when deployed with `ClusterOptions`
+
+
+class DeployManifest:
+    """Fingerprints of the inputs each job was last deployed from, stored in a local file or in DBFS.
+
+    Paths starting with `dbfs:` are kept in the workspace so they survive ephemeral CI runners. Changes are
+    only written by `save`.
+    """
+
+    def __init__(self, path: str, profile: Optional[str] = None) -> None:
+        """Load the manifest at path, starting empty if it doesn't exist yet."""
+        self.path = path
+        self.profile = profile
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            if self.in_dbfs:
+                text = dbfs_read_text(self._client(), path, length=None)
+            else:
+                text = Path(path).read_text()
+            self._entries = json.loads(text)
+        except DatabricksApiError as e:
+            if not e.is_not_found:
+                raise
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def in_dbfs(self) -> bool:
+        """Whether the manifest is stored in DBFS rather than locally."""
+        return self.path.startswith("dbfs:")
+
+    def _client(self) -> Any:
+        client = api_client(self.profile)
+        if client is None:
+            raise ValueError("A deploy manifest in DBFS needs Databricks API credentials, see the README")
+        return client
+
+    def fingerprint(self, name: str) -> Optional[str]:
+        """Fingerprint a job was last deployed from."""
+        with self._lock:
+            entry = self._entries.get(name)
+        return entry["fingerprint"] if entry else None
+
+    def job_id(self, name: str) -> Optional[int]:
+        """job_id a job was last deployed as."""
+        with self._lock:
+            entry = self._entries.get(name)
+        return entry["job_id"] if entry else None
+
+    def record(self, name: str, fingerprint: str, job_id: Optional[int]) -> None:
+        """Remember that a job was deployed from inputs with the given fingerprint."""
+        with self._lock:
+            self._entries[name] = {"fingerprint": fingerprint, "job_id": job_id, "deployed_at": time.time()}
+
+    def save(self) -> None:
+        """Write the manifest back to where it was loaded from."""
+        with self._lock:
+            if self.in_dbfs:
+                dbfs_put_text(self._client(), json.dumps(self._entries, indent=2, sort_keys=True), self.path)
+            else:
+                write_json_atomic(Path(self.path), self._entries)
+
+
+def default_deploy_manifest_path(profile: Optional[str] = None) -> str:
+    """Local deploy manifest for the workspace a profile points at."""
+    client = api_client(profile)
+    workspace = client.host if client is not None else profile or "DEFAULT"
+    return str(cache_dir() / "deploy-manifests" / f"{workspace_key(workspace)}.json")
+
+
+def job_fingerprint(
+    spec: JobSpec,
+    conf: Dict[str, Any],
+    environment_variables: Optional[Dict[str, str]] = None,
+    wheel_sha256: Optional[str] = None,
+    cluster_options: Optional[ClusterOptions] = None,
+) -> str:
+    """Hash everything a job definition is rendered from.
+
+    Covers the template file, the rendered config, the injected environment variables, the wheel's content
+    hash and any cluster options. Templates pulled in by `{% include %}` are not covered, use `force` after
+    changing only those.
+    """
+    inputs: Dict[str, Any] = {
+        "template": hashlib.sha256(Path(spec.jinja_template).read_bytes()).hexdigest(),
+        "config": conf,
+        "environment_variables": environment_variables or {},
+        "wheel": wheel_sha256,
+    }
+    if cluster_options is not None:
+        # Only hashed when set so fingerprints recorded before cluster options existed stay valid
+        inputs["clusters"] = cluster_options._asdict()
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def job_specs_from_manifest(
+    manifest_file: str, environment_variables: Optional[Dict[str, str]] = None
+) -> List[JobSpec]:
+    """Load job specs from a JSON or YAML manifest.
+
+    The manifest is either a list or has a `jobs` key holding a list of entries with `jinja_template` and
+    `config_file` keys. Relative paths are relative to the manifest. Like config files, the manifest is treated
+    as a Jinja2 template when environment_variables are provided.
+    """
+    manifest = load_config(manifest_file, environment_variables)
+    entries = manifest["jobs"] if isinstance(manifest, dict) else manifest
+    root = Path(manifest_file).parent
+    return [JobSpec(str(root / e["jinja_template"]), str(root / e["config_file"])) for e in entries]
+
+
+def job_specs_from_glob(jinja_template: str, config_glob: str) -> List[JobSpec]:
+    """Pair one template with every config file matching a glob pattern."""
+    return [JobSpec(jinja_template, config_file) for config_file in sorted(glob.glob(config_glob, recursive=True))]
+
+
+def job_specs(
+    manifest_file: Optional[str] = None,
+    jinja_template: Optional[str] = None,
+    config_glob: Optional[str] = None,
+    environment_variables: Optional[Dict[str, str]] = None,
+) -> List[JobSpec]:
+    """Load job specs from either a manifest or a template shared by every config matching a glob."""
+    if manifest_file:
+        return job_specs_from_manifest(manifest_file, environment_variables)
+    if jinja_template and config_glob:
+        return job_specs_from_glob(jinja_template, config_glob)
+    raise ValueError("Provide either --manifest or both --jinja-template and --config-glob.")
+
+
+def resolve_job_ids(
+    names: List[str], profile: Optional[str] = None, cache: Optional[JobIdCache] = None
+) -> Dict[str, Any]:
+    """Resolve many job names to job_ids, with None for jobs that don't exist yet.
+
+    Cached names cost nothing. A single miss is looked up by name, more than one is resolved from one listing.
+    """
+    job_ids: Dict[str, Any] = {}
+    misses = []
+    for name in names:
+        cached = cache.get(name) if cache is not None else None
+        if cached is None:
+            misses.append(name)
+        else:
+            job_ids[name] = cached
+
+    if len(misses) == 1:
+        job_ids[misses[0]] = find_job_id(misses[0], profile, cache)
+    elif misses:
+        listing = list_jobs(profile)
+        for name in misses:
+            job_ids[name] = int(listing[name]) if name in listing else None
+            if cache is not None and job_ids[name] is not None:
+                cache.set(name, job_ids[name])
+    return job_ids
+
+
+def render_job(spec: JobSpec, conf: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge the config into the job template and parse the resulting job payload."""
+    return dict(json.loads(merge_template(spec.jinja_template, conf)))
+
+
+def render_optimised_job(
+    spec: JobSpec, conf: Dict[str, Any], cluster_options: Optional[ClusterOptions] = None
+) -> Tuple[Dict[str, Any], Optional[ClusterSavings]]:
+    """Render a job like `render_job`, then optimise its clusters when given `cluster_options`."""
+    settings = render_job(spec, conf)
+    if cluster_options is None:
+        return settings, None
+    return optimise_clusters(settings, cluster_options)
+
+
+def check_unique_names(confs: List[Dict[str, Any]]) -> None:
+    """Raise a ValueError if two configs name the same job, which would otherwise be created twice."""
+    names = [conf["name"] for conf in confs if "name" in conf]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Job names must be unique within a catalogue, found duplicates: {', '.join(duplicates)}")
+
+
+def deploy_jobs(
+    specs: List[JobSpec],
+    environment_variables: Optional[Dict[str, str]] = None,
+    profile: Optional[str] = None,
+    cache: Optional[JobIdCache] = None,
+    max_workers: int = DEPLOY_CONCURRENCY,
+    force: bool = False,
+    manifest: Optional[DeployManifest] = None,
+    wheel_sha256: Optional[str] = None,
+    cluster_options: Optional[ClusterOptions] = None,
+) -> List[DeployResult]:
+    """Render and upsert many jobs in one go.
+
+    All configs are loaded first so job_ids can be resolved together, see `resolve_job_ids`, then templates are
+    rendered and upserted by a pool of at most `max_workers` threads. A config can pin its own `job_id`.
+
+    With a deploy `manifest`, jobs whose `job_fingerprint` matches the last successful deploy are skipped
+    without rendering, looking up or calling the API, unless `force` is set. The manifest is saved afterwards.
+
+    With `cluster_options` each rendered job's clusters are optimised before upserting, see `optimise_clusters`,
+    and the estimated savings are part of its result.
+
+    A config that fails to load, or two configs naming the same job, abort before anything is deployed, whereas
+    rendering and API failures are captured per job rather than aborting the whole deploy. Results keep the order
+    of `specs`.
+    """
+    confs = [load_config(spec.config_file, environment_variables) for spec in specs]
+    check_unique_names(confs)
+    fingerprints: List[Optional[str]] = [None] * len(specs)
+    if manifest is not None:
+        fingerprints = [
+            job_fingerprint(s, c, environment_variables, wheel_sha256, cluster_options) for s, c in zip(specs, confs)
+        ]
+    skip = [
+        manifest is not None and not force and fingerprint == manifest.fingerprint(conf.get("name", ""))
+        for conf, fingerprint in zip(confs, fingerprints)
+    ]
+    job_ids = resolve_job_ids(
+        [c["name"] for c, skipped in zip(confs, skip) if not skipped and "job_id" not in c], profile, cache
+    )
+
+    def deploy(spec: JobSpec, conf: Dict[str, Any], fingerprint: Optional[str], skipped: bool) -> DeployResult:
+        name = conf.get("name")
+        if skipped and manifest is not None:
+            return DeployResult(spec, name, "skipped", manifest.job_id(conf["name"]))
+        pinned = "job_id" in conf
+        try:
+            job_id = conf["job_id"] if pinned else job_ids[conf["name"]]
+            if job_id:
+                conf["job_id"] = job_id
+            settings, savings = render_optimised_job(spec, conf, cluster_options)
+            result = upsert_job(settings, profile, job_id, None if pinned else cache, force)
+        except Exception as e:
+            return DeployResult(spec, name, "failed", None, e)
+        if manifest is not None and fingerprint is not None:
+            manifest.record(conf["name"], fingerprint, result.job_id)
+        return DeployResult(spec, name, result.action, result.job_id, cluster_savings=savings)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(deploy, specs, confs, fingerprints, skip))
+    if manifest is not None and not all(skip):
+        manifest.save()
+    return results
+
+
+def summarise_deploys(results: List[DeployResult]) -> Dict[str, int]:
+    """Count deployed jobs by action."""
+    return {action: sum(1 for r in results if r.action == action) for action in DEPLOY_ACTIONS}
+
+
+def deploy_report(results: List[DeployResult]) -> Dict[str, Any]:
+    """Structured summary of a deploy suitable for printing as JSON.
+
+    Jobs deployed with cluster options also report their cluster starts and estimated savings, along with a total.
+    """
+    savings = [r.cluster_savings for r in results if r.cluster_savings is not None]
+    return {
+        "summary": summarise_deploys(results),
+        **(
+            {"estimated_cluster_start_seconds_saved": sum(s.estimated_seconds_saved for s in savings)}
+            if savings
+            else {}
+        ),
+        "jobs": [
+            {
+                "name": r.name,
+                "job_id": r.job_id,
+                "action": r.action,
+                "jinja_template": r.spec.jinja_template,
+                "config_file": r.spec.config_file,
+                **({"error": str(r.error)} if r.error is not None else {}),
+                **({"cluster_savings": r.cluster_savings._asdict()} if r.cluster_savings is not None else {}),
+            }
+            for r in results
+        ],
+    }
@@ -1,13 +1,33 @@
 # Standard Library
+import os
 from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
 
 # Third Party
 from invoke import run
 
+# Branch name variables set by CI systems that check out a detached commit, in order of precedence.
+# GITHUB_HEAD_REF is only set for pull requests, where GITHUB_REF_NAME is the `<pr>/merge` ref instead.
+CI_BRANCH_VARIABLES = ["BRANCH_NAME", "GITHUB_HEAD_REF", "GITHUB_REF_NAME", "CI_COMMIT_REF_NAME"]
+
 
 @lru_cache(maxsize=None)
 def git_current_branch() -> str:
-    """Get the current git branch."""
+    """Get the current git branch.
+
+    Checked in order: CI branch environment variables, the repository's HEAD read straight from disk and, for
+    a detached HEAD or layouts that can't be read directly, the git CLI. A detached HEAD resolves to the short
+    commit hash.
+    """
+    for variable in CI_BRANCH_VARIABLES:
+        if os.environ.get(variable):
+            return os.environ[variable]
+
+    branch_name = git_head_name()
+    if branch_name is not None:
+        return branch_name
+
     #  return run("git branch --show-current", hide=True).stdout.strip()
     # git 2.22+ supports the above command but to get backwards compatability need to use the below command.
     # https://stackoverflow.com/a/6245587/622276
@@ -21,3 +41,51 @@ def git_current_branch() -> str:
         branch_name = run("git rev-parse --short HEAD", hide=True).stdout.strip()
 
     return branch_name
+
+
+def git_dir(start: Optional[Path] = None) -> Optional[Path]:
+    """Find the git directory for `start` or the current directory, following `gitdir:` files of worktrees."""
+    if os.environ.get("GIT_DIR"):
+        return None
+    start = (start or Path.cwd()).resolve()
+    for directory in [start, *start.parents]:
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text().strip()
+            if not content.startswith("gitdir:"):
+                return None
+            return (directory / content[len("gitdir:") :].strip()).resolve()
+    return None
+
+
+def git_head_name(start: Optional[Path] = None) -> Optional[str]:
+    """Read the branch name of HEAD without running git.
+
+    Returns None when HEAD isn't a branch under refs/heads, eg a detached HEAD, whose short hash only git itself
+    can abbreviate the same way `git rev-parse --short` does.
+    """
+    gitdir = git_dir(start)
+    if gitdir is None or not (gitdir / "HEAD").is_file():
+        return None
+
+    head = (gitdir / "HEAD").read_text().strip()
+    if head.startswith("ref: refs/heads/"):
+        return head[len("ref: refs/heads/") :]
+    return None
+
+
+def git_branches(remote: str = "origin") -> List[str]:
+    """Get the names of every branch on `remote` along with the local branches.
+
+    Remote branches are listed with `git ls-remote` rather than read from remote tracking refs, which shallow and
+    single branch CI clones only have for the branch they checked out. Raises a ValueError when the remote can't
+    be listed, since an incomplete list would make every missing branch look deleted.
+    """
+    listing = run(f"git ls-remote --heads {remote}", hide=True, warn=True)
+    if not listing.ok:
+        raise ValueError(f"Could not list the branches of git remote '{remote}': {listing.stderr.strip()}")
+    refs = [line.split("\t", 1)[-1] for line in listing.stdout.splitlines()]
+    refs += run("git for-each-ref --format='%(refname)' refs/heads", hide=True).stdout.split()
+    return sorted({ref[len("refs/heads/") :] for ref in refs if ref.startswith("refs/heads/")})
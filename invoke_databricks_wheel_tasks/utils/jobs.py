@@ -0,0 +1,224 @@
+# Standard Library
+import copy
+import itertools
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Values the Jobs API fills in when a field is omitted, so leaving them out or spelling them out is the same job.
+JOB_SETTINGS_DEFAULTS: Dict[str, Any] = {
+    "timeout_seconds": 0,
+    "max_concurrent_runs": 1,
+    "max_retries": 0,
+    "min_retry_interval_millis": 0,
+    "retry_on_timeout": False,
+    "no_alert_for_skipped_runs": False,
+    "run_if": "ALL_SUCCESS",
+}
+
+# Fields the Jobs API derives itself and that can't be meaningfully compared.
+JOB_SETTINGS_IGNORED = ["format"]
+
+# Lists whose order is not significant, keyed by the field that identifies each element.
+JOB_SETTINGS_KEYED_LISTS = {"tasks": "task_key", "job_clusters": "job_cluster_key", "depends_on": "task_key"}
+
+
+# Settings `runs submit` accepts, job only settings like schedules and concurrency limits are dropped.
+RUN_SUBMIT_FIELDS = [
+    "tasks",
+    "timeout_seconds",
+    "git_source",
+    "access_control_list",
+    "email_notifications",
+    "webhook_notifications",
+    "notification_settings",
+    "health",
+    # Jobs API 2.0 single task format
+    "libraries",
+    "new_cluster",
+    "existing_cluster_id",
+    "notebook_task",
+    "spark_jar_task",
+    "spark_python_task",
+    "spark_submit_task",
+    "python_wheel_task",
+]
+
+# Rough seconds a new cluster takes to start, and one started from a pool of idle instances, see `ClusterSavings`.
+CLUSTER_START_SECONDS = 300.0
+POOLED_CLUSTER_START_SECONDS = 60.0
+SHARED_CLUSTER_KEY_PREFIX = "shared_cluster"
+
+
+class ClusterOptions(NamedTuple):
+    """How `optimise_clusters` rewrites the clusters of rendered job settings."""
+
+    share_clusters: bool = False  # Hoist identical task clusters into shared job clusters
+    instance_pool_id: Optional[str] = None  # Pool for clusters that don't already use one
+    driver_instance_pool_id: Optional[str] = None  # Pool for their drivers, needs `instance_pool_id`
+
+
+class ClusterSavings(NamedTuple):
+    """Cluster starts a run of a job needs before and after `optimise_clusters`, and the start time saved."""
+
+    cluster_starts_before: int
+    cluster_starts_after: int
+    estimated_seconds_saved: float
+
+
+def canonical_job_settings(settings: Any, key: str = "") -> Any:
+    """Normalise job settings so equivalent definitions compare equal.
+
+    Drops defaulted, derived and empty fields and sorts lists whose order the Jobs API does not preserve.
+    """
+    if isinstance(settings, dict):
+        canonical = {}
+        for k, v in settings.items():
+            if k in JOB_SETTINGS_IGNORED or (k in JOB_SETTINGS_DEFAULTS and v == JOB_SETTINGS_DEFAULTS[k]):
+                continue
+            value = canonical_job_settings(v, k)
+            if value not in (None, {}, []):
+                canonical[k] = value
+        return canonical
+
+    if isinstance(settings, list):
+        items = [canonical_job_settings(v) for v in settings]
+        sort_key = JOB_SETTINGS_KEYED_LISTS.get(key)
+        if sort_key and all(isinstance(i, dict) and sort_key in i for i in items):
+            items.sort(key=lambda i: str(i[sort_key]))
+        return items
+
+    return settings
+
+
+def job_settings_changed(local: Dict[str, Any], remote: Dict[str, Any]) -> bool:
+    """Whether deploying `local` settings over the `remote` job would change anything."""
+    return bool(canonical_job_settings(local) != canonical_job_settings(remote))
+
+
+def run_submit_payload(
+    settings: Dict[str, Any], run_name: Optional[str] = None, idempotency_token: Optional[str] = None
+) -> Dict[str, Any]:
+    """Turn job settings into a one-time `runs submit` payload.
+
+    Keeps only RUN_SUBMIT_FIELDS, names the run after the job unless given a `run_name`, and inlines shared
+    `job_clusters` into the tasks that reference them since one-time runs can't share clusters.
+    """
+    payload = {k: copy.deepcopy(v) for k, v in settings.items() if k in RUN_SUBMIT_FIELDS}
+    payload["run_name"] = run_name or settings.get("name")
+    if idempotency_token:
+        payload["idempotency_token"] = idempotency_token
+
+    clusters = {c["job_cluster_key"]: c["new_cluster"] for c in settings.get("job_clusters", [])}
+    for task in payload.get("tasks", []):
+        key = task.pop("job_cluster_key", None)
+        if key is not None:
+            if key not in clusters:
+                raise ValueError(f"Task '{task.get('task_key')}' uses job cluster '{key}' which isn't defined")
+            task["new_cluster"] = copy.deepcopy(clusters[key])
+    return {k: v for k, v in payload.items() if v is not None}
+
+
+def cluster_options(
+    share_clusters: bool = False, instance_pool_id: Optional[str] = None, driver_instance_pool_id: Optional[str] = None
+) -> Optional[ClusterOptions]:
+    """Build cluster options from task options, or None when they ask for nothing."""
+    if driver_instance_pool_id and not instance_pool_id:
+        raise ValueError("A driver instance pool can only be used together with an instance pool.")
+    options = ClusterOptions(bool(share_clusters), instance_pool_id or None, driver_instance_pool_id or None)
+    return None if options == ClusterOptions() else options
+
+
+def cluster_starts(settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Specs of the clusters one run of a job starts.
+
+    Each task with its own `new_cluster` starts one, whereas a job cluster is started once however many tasks share it.
+    """
+    tasks = settings.get("tasks", [])
+    used = {task["job_cluster_key"] for task in tasks if "job_cluster_key" in task}
+    shared = [c["new_cluster"] for c in settings.get("job_clusters", []) if c.get("job_cluster_key") in used]
+    single = [settings["new_cluster"]] if "new_cluster" in settings else []  # Jobs API 2.0 single task format
+    return shared + [task["new_cluster"] for task in tasks if "new_cluster" in task] + single
+
+
+def estimated_start_seconds(settings: Dict[str, Any]) -> float:
+    """Cluster start time summed over every cluster one run starts."""
+    return sum(
+        POOLED_CLUSTER_START_SECONDS if "instance_pool_id" in cluster else CLUSTER_START_SECONDS
+        for cluster in cluster_starts(settings)
+    )
+
+
+def share_job_clusters(settings: Dict[str, Any]) -> None:
+    """Hoist `new_cluster` specs repeated across tasks into shared `job_clusters`, in place.
+
+    Tasks whose cluster is identical to an existing job cluster reuse it, other identical clusters get a new
+    `shared_cluster_<n>` job cluster. Clusters only one task uses are left alone.
+    """
+    tasks = settings.get("tasks", [])
+    job_clusters = settings.get("job_clusters", [])
+    keys = {_cluster_identity(c["new_cluster"]): c["job_cluster_key"] for c in job_clusters}
+    taken = {c["job_cluster_key"] for c in job_clusters}
+
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for task in tasks:
+        if "new_cluster" in task:
+            groups.setdefault(_cluster_identity(task["new_cluster"]), []).append(task)
+
+    for identity, group in groups.items():
+        if identity not in keys:
+            if len(group) < 2:
+                continue
+            key = next(k for k in (f"{SHARED_CLUSTER_KEY_PREFIX}_{i}" for i in itertools.count(1)) if k not in taken)
+            taken.add(key)
+            keys[identity] = key
+            job_clusters.append({"job_cluster_key": key, "new_cluster": group[0]["new_cluster"]})
+        for task in group:
+            del task["new_cluster"]
+            task["job_cluster_key"] = keys[identity]
+
+    if job_clusters:
+        settings["job_clusters"] = job_clusters
+
+
+def _cluster_identity(cluster: Dict[str, Any]) -> str:
+    return json.dumps(canonical_job_settings(cluster), sort_keys=True)
+
+
+def attach_instance_pool(
+    cluster: Dict[str, Any], instance_pool_id: str, driver_instance_pool_id: Optional[str] = None
+) -> None:
+    """Start a cluster from an instance pool, in place, unless it already uses one.
+
+    The pool decides the node types, so the cluster's own are dropped.
+    """
+    if "instance_pool_id" in cluster:
+        return
+    cluster.pop("node_type_id", None)
+    cluster.pop("driver_node_type_id", None)
+    cluster["instance_pool_id"] = instance_pool_id
+    if driver_instance_pool_id:
+        cluster["driver_instance_pool_id"] = driver_instance_pool_id
+
+
+def optimise_clusters(settings: Dict[str, Any], options: ClusterOptions) -> Tuple[Dict[str, Any], ClusterSavings]:
+    """Rewrite rendered job settings so a run starts fewer clusters and starts them faster.
+
+    Every task with the same `new_cluster` otherwise starts a cluster of its own. With `share_clusters` they share
+    one job cluster instead, see `share_job_clusters`. With an `instance_pool_id` clusters start from a pool of idle
+    instances, see `attach_instance_pool`. Templates are left as written, only the returned copy is changed.
+
+    The savings are estimates, assuming every cluster start takes CLUSTER_START_SECONDS, or
+    POOLED_CLUSTER_START_SECONDS from a pool, and summed over the run whether or not its tasks run in parallel.
+    """
+    optimised = copy.deepcopy(settings)
+    if options.share_clusters:
+        share_job_clusters(optimised)
+    if options.instance_pool_id:
+        for cluster in cluster_starts(optimised):
+            attach_instance_pool(cluster, options.instance_pool_id, options.driver_instance_pool_id)
+    savings = ClusterSavings(
+        len(cluster_starts(settings)),
+        len(cluster_starts(optimised)),
+        estimated_start_seconds(settings) - estimated_start_seconds(optimised),
+    )
+    return optimised, savings
@@ -1,13 +1,32 @@
 # Standard Library
+import hashlib
 import json
+import os
 import re
-from typing import Any, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
-# Third Party
-import jinja2
+from .cache import cache_dir
 
-# from invoke.vendor import yaml
-from invoke.vendor import yaml3 as yaml
+# jinja2 and the YAML and JSON parsers are imported on first use to keep `invoke --list` fast.
+if TYPE_CHECKING:  # pragma: no cover
+    # Third Party
+    import jinja2
+
+# Parsed configs kept per process, keyed by file type and a hash of the rendered content.
+CONFIG_CACHE_SIZE = 128
+_config_cache: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+_config_cache_lock = threading.Lock()
+
+# Compiled templates kept per template directory. Jinja checks the file's mtime on every lookup so edits are seen.
+TEMPLATE_CACHE_SIZE = 400
+# Set to 1/true/yes to also keep compiled template bytecode on disk between invoke sessions.
+JINJA_BYTECODE_CACHE_ENV = "INVOKE_DATABRICKS_JINJA_BYTECODE_CACHE"
+# Runs of digits that may be integers too big for 64 bits, which orjson silently turns into lossy floats.
+BIG_INTEGER_PATTERN = re.compile(r"\d{19,}")
 
 
 def tidy(text: str) -> str:
@@ -26,26 +45,77 @@ def dict_from_keyvalue_list(args: Optional[List[str]] = None) -> Optional[Dict[s
     return {k: v for k, v in [x.split("=") for x in args]} if args else None
 
 
-def merge_template(template_filename: str, config: Optional[Dict[str, Any]]) -> str:
-    """Load a Jinja2 template from file and merge configuration."""
-    # Step 1: get raw content as a string
-    with open(template_filename) as f:
-        raw_content = f.read()
+@lru_cache(maxsize=None)
+def yaml_loader() -> Any:
+    """Get the fastest available safe YAML loader class.
 
-    # Step 2: Treat raw_content as a Jinja2 template if providing configuration
-    if config:
+    Prefers PyYAML's libyaml backed CSafeLoader when it is installed, it parses large configs an order of
+    magnitude faster than the pure Python loader vendored in invoke.
+    """
+    try:
+        # Third Party
+        import yaml
+    except ImportError:
+        # Third Party
+        from invoke.vendor import yaml3 as yaml
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=None)
+def json_loads() -> Callable[[str], Any]:
+    """Get the fastest available JSON parser, orjson when it is installed."""
+    try:
+        # Third Party
+        import orjson
+    except ImportError:
+        return json.loads
+    return orjson.loads
+
+
+def jinja_bytecode_cache_dir() -> Optional[str]:
+    """Directory for Jinja2's on-disk bytecode cache, or None when it is not enabled."""
+    if os.environ.get(JINJA_BYTECODE_CACHE_ENV, "").lower() not in ["1", "true", "yes"]:
+        return None
+    return str(cache_dir() / "jinja")
+
+
+@lru_cache(maxsize=None)
+def jinja_environment(searchpath: str, bytecode_cache_dir: Optional[str] = None) -> "jinja2.Environment":
+    """Get the shared Jinja2 environment for templates in one directory.
+
+    The environment caches compiled templates, so rendering the same template many times in a session only
+    parses and compiles it once. Templates can also `{% include %}` their neighbours.
+    """
+    # Third Party
+    import jinja2
+
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(bytecode_cache_dir)
+
+    # NOTE: Providing jinja 2.11.x compatable version to better cross operate
+    # with dbt-databricks v1.2.2 and down stream dbt-spark and dbt-core
+    undefined = jinja2.StrictUndefined if int(jinja2.__version__[0]) >= 3 else jinja2.Undefined
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(searchpath),
+        undefined=undefined,
+        cache_size=TEMPLATE_CACHE_SIZE,
+        auto_reload=True,
+        bytecode_cache=bytecode_cache,
+    )
 
-        # NOTE: Providing jinja 2.11.x compatable version to better cross operate
-        # with dbt-databricks v1.2.2 and down stream dbt-spark and dbt-core
-        if int(jinja2.__version__[0]) >= 3:
-            content = jinja2.Template(raw_content, undefined=jinja2.StrictUndefined).render(**config)
-        else:
-            content = jinja2.Template(raw_content).render(**config)
 
-    else:
-        content = raw_content
+def merge_template(template_filename: str, config: Optional[Dict[str, Any]]) -> str:
+    """Load a Jinja2 template from file and merge configuration."""
+    # Without configuration the file is used as is rather than treated as a Jinja2 template
+    if not config:
+        with open(template_filename) as f:
+            return f.read()
 
-    return content
+    path = Path(template_filename).resolve()
+    environment = jinja_environment(str(path.parent), jinja_bytecode_cache_dir())
+    return environment.get_template(path.name).render(**config)
 
 
 def load_config(filename: str, environment_variables: Optional[Dict[str, str]] = None) -> Any:
@@ -58,8 +128,53 @@ def load_config(filename: str, environment_variables: Optional[Dict[str, str]] =
 
     # Step 3: Parse populated string into a data structure.
     if filename.endswith("json"):
-        return json.loads(content)
+        return parse_config("json", content)
     elif any([filename.lower().endswith(ext) for ext in ["yml", "yaml"]]):
-        return yaml.safe_load(content)
+        return parse_config("yaml", content)
 
     raise ValueError(f"File type of {filename} not supported.")  # pragma: no cover
+
+
+def parse_config(kind: str, content: str) -> Any:
+    """Parse JSON or YAML content, reusing the result when the same content was parsed before.
+
+    Callers get their own copy so mutating one parsed config never leaks into another.
+    """
+    key = (kind, hashlib.sha256(content.encode()).hexdigest())
+    with _config_cache_lock:
+        if key in _config_cache:
+            _config_cache.move_to_end(key)
+            return copy_parsed(_config_cache[key])
+
+    if kind == "json":
+        if BIG_INTEGER_PATTERN.search(content):
+            # orjson would parse integers beyond 64 bits to floats, losing precision without complaining
+            parsed = json.loads(content)
+        else:
+            try:
+                parsed = json_loads()(content)
+            except ValueError:
+                # orjson rejects NaN and Infinity, which json accepts
+                parsed = json.loads(content)
+    else:
+        # Equivalent to yaml.load(content, Loader=yaml_loader())
+        loader = yaml_loader()(content)
+        try:
+            parsed = loader.get_single_data()
+        finally:
+            loader.dispose()
+
+    with _config_cache_lock:
+        _config_cache[key] = parsed
+        while len(_config_cache) > CONFIG_CACHE_SIZE:
+            _config_cache.popitem(last=False)
+    return copy_parsed(parsed)
+
+
+def copy_parsed(value: Any) -> Any:
+    """Copy a parsed config, which only nests dicts and lists, much faster than `copy.deepcopy`."""
+    if isinstance(value, dict):
+        return {k: copy_parsed(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [copy_parsed(v) for v in value]
+    return value
@@ -0,0 +1,227 @@
+# Standard Library
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .cache import JobIdCache
+from .databricks import create_or_reset_job, delete_job, find_job_id, get_job, list_jobs
+from .dbfs import retrying
+from .deploy import JobSpec, check_unique_names, render_optimised_job
+from .jobs import ClusterOptions, canonical_job_settings
+from .misc import load_config
+
+PLAN_CONCURRENCY = 8
+APPLY_RETRIES = 3
+PLAN_ACTIONS = ["create", "update", "unchanged", "orphaned"]
+APPLY_ACTIONS = ["created", "updated", "unchanged", "deleted", "orphaned", "failed"]
+PLAN_SYMBOLS = {"create": "+", "update": "~", "unchanged": "=", "orphaned": "-"}
+
+
+class PlannedJob(NamedTuple):
+    """What applying a plan would do to one job."""
+
+    name: str
+    action: str  # One of PLAN_ACTIONS
+    job_id: Optional[int] = None
+    settings: Optional[Dict[str, Any]] = None  # Rendered settings, None for orphaned jobs
+    changes: Tuple[str, ...] = ()  # Top level settings that differ from the deployed job
+
+
+class ApplyResult(NamedTuple):
+    """Outcome of applying one step of a plan."""
+
+    name: str
+    action: str  # One of APPLY_ACTIONS
+    job_id: Optional[int] = None
+    error: Optional[Exception] = None
+
+
+def changed_settings(local: Dict[str, Any], remote: Dict[str, Any]) -> Tuple[str, ...]:
+    """Top level job settings whose canonical values differ, see `canonical_job_settings`."""
+    local, remote = canonical_job_settings(local), canonical_job_settings(remote)
+    return tuple(sorted(k for k in local.keys() | remote.keys() if local.get(k) != remote.get(k)))
+
+
+def plan_jobs(
+    specs: List[JobSpec],
+    environment_variables: Optional[Dict[str, str]] = None,
+    profile: Optional[str] = None,
+    orphan_prefix: Optional[str] = None,
+    max_workers: int = PLAN_CONCURRENCY,
+    cluster_options: Optional[ClusterOptions] = None,
+) -> List[PlannedJob]:
+    """Render a whole job catalogue and diff it against the workspace without changing anything.
+
+    Job names are resolved from one listing of the workspace and the existing jobs' settings are fetched by a pool
+    of at most `max_workers` threads. A config can pin its own `job_id`. Jobs named with `orphan_prefix` that are
+    no longer in the catalogue are planned as orphaned, without a prefix nothing is ever orphaned. Jobs are planned
+    with their clusters optimised when given `cluster_options`, like `deploy_jobs` deploys them.
+
+    Unlike `deploy_jobs`, any config or template that fails to load or render fails the whole plan.
+    """
+    confs = [load_config(spec.config_file, environment_variables) for spec in specs]
+    check_unique_names(confs)
+    names = [conf["name"] for conf in confs]
+
+    listing = list_jobs(profile)
+    for conf in confs:
+        job_id = conf["job_id"] if "job_id" in conf else listing.get(conf["name"])
+        if job_id:
+            conf["job_id"] = int(job_id)
+
+    def plan(spec: JobSpec, conf: Dict[str, Any]) -> PlannedJob:
+        settings, _ = render_optimised_job(spec, conf, cluster_options)
+        job_id = conf.get("job_id")
+        if job_id is None:
+            return PlannedJob(conf["name"], "create", None, settings)
+        changes = changed_settings(settings, get_job(job_id, profile)["settings"])
+        return PlannedJob(conf["name"], "update" if changes else "unchanged", job_id, settings, changes)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        planned = list(executor.map(plan, specs, confs))
+
+    if orphan_prefix:
+        planned += [
+            PlannedJob(name, "orphaned", int(job_id))
+            for name, job_id in sorted(listing.items())
+            if name.startswith(orphan_prefix) and name not in names
+        ]
+    return planned
+
+
+def create_job(
+    settings: Dict[str, Any],
+    profile: Optional[str] = None,
+    retries: int = APPLY_RETRIES,
+    sleep: Callable[[float], Any] = time.sleep,
+) -> int:
+    """Create a job, retrying server errors without risking a duplicate.
+
+    A create whose response was lost may still have happened, so every retry looks the job up by name first and
+    resets it if it exists.
+    """
+    attempts = 0
+
+    def create() -> int:
+        nonlocal attempts
+        job_id = find_job_id(settings["name"], profile) if attempts else None
+        attempts += 1
+        if job_id is None:
+            return int(create_or_reset_job(settings, profile)["job_id"])
+        create_or_reset_job(settings, profile, job_id)
+        return job_id
+
+    return retrying(create, retries, sleep)
+
+
+def apply_job(
+    job: PlannedJob,
+    profile: Optional[str] = None,
+    cache: Optional[JobIdCache] = None,
+    retries: int = APPLY_RETRIES,
+    sleep: Callable[[float], Any] = time.sleep,
+) -> ApplyResult:
+    """Create or update one planned job, capturing any failure in the result."""
+    try:
+        if job.action == "create" and job.settings is not None:
+            job_id = create_job(job.settings, profile, retries, sleep)
+            if cache is not None:
+                cache.set(job.name, job_id)
+            return ApplyResult(job.name, "created", job_id)
+        if job.action == "update" and job.settings is not None:
+            settings = job.settings
+            retrying(lambda: create_or_reset_job(settings, profile, job.job_id), retries, sleep)
+            return ApplyResult(job.name, "updated", job.job_id)
+    except Exception as e:
+        return ApplyResult(job.name, "failed", job.job_id, e)
+    return ApplyResult(job.name, job.action, job.job_id)
+
+
+def delete_orphan(
+    job: PlannedJob,
+    profile: Optional[str] = None,
+    cache: Optional[JobIdCache] = None,
+    retries: int = APPLY_RETRIES,
+    sleep: Callable[[float], Any] = time.sleep,
+) -> ApplyResult:
+    """Delete one orphaned job, capturing any failure in the result."""
+    try:
+        retrying(lambda: delete_job(job.job_id or 0, profile), retries, sleep)
+    except Exception as e:
+        return ApplyResult(job.name, "failed", job.job_id, e)
+    if cache is not None:
+        cache.invalidate(job.name)
+    return ApplyResult(job.name, "deleted", job.job_id)
+
+
+def apply_plan(
+    plan: List[PlannedJob],
+    profile: Optional[str] = None,
+    cache: Optional[JobIdCache] = None,
+    delete_orphans: bool = False,
+    max_workers: int = PLAN_CONCURRENCY,
+    retries: int = APPLY_RETRIES,
+    sleep: Callable[[float], Any] = time.sleep,
+) -> List[ApplyResult]:
+    """Apply a plan with a pool of at most `max_workers` threads.
+
+    Creates and updates go first, each retrying server errors and dropped connections with backoff, see `retrying`.
+    Orphaned jobs are only deleted with `delete_orphans` and only once every create and update has succeeded, so
+    a renamed job is never removed before its replacement exists. Failures are captured per job and results keep
+    the order of `plan`.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda job: apply_job(job, profile, cache, retries, sleep), plan))
+        if delete_orphans and not any(r.action == "failed" for r in results):
+            orphans = [i for i, job in enumerate(plan) if job.action == "orphaned"]
+            deleted = executor.map(lambda i: delete_orphan(plan[i], profile, cache, retries, sleep), orphans)
+            for i, result in zip(orphans, deleted):
+                results[i] = result
+    return results
+
+
+def summarise_plan(plan: List[PlannedJob]) -> Dict[str, int]:
+    """Count planned jobs by action."""
+    return {action: sum(1 for job in plan if job.action == action) for action in PLAN_ACTIONS}
+
+
+def summarise_apply(results: List[ApplyResult]) -> Dict[str, int]:
+    """Count applied jobs by action."""
+    return {action: sum(1 for r in results if r.action == action) for action in APPLY_ACTIONS}
+
+
+def format_plan(plan: List[PlannedJob]) -> str:
+    """Human readable diff of a plan, one line per job followed by a summary."""
+    lines = []
+    for job in plan:
+        job_id = f" ({job.job_id})" if job.job_id is not None else ""
+        changes = f": {', '.join(job.changes)}" if job.changes else ""
+        lines.append(f"{PLAN_SYMBOLS[job.action]} {job.action} '{job.name}'{job_id}{changes}")
+    lines.append(", ".join(f"{action}: {count}" for action, count in summarise_plan(plan).items()))
+    return "\n".join(lines)
+
+
+def plan_to_json(plan: List[PlannedJob]) -> Dict[str, Any]:
+    """Structured plan suitable for saving and applying later, see `plan_from_json`."""
+    return {"summary": summarise_plan(plan), "jobs": [{**job._asdict(), "changes": list(job.changes)} for job in plan]}
+
+
+def plan_from_json(data: Dict[str, Any]) -> List[PlannedJob]:
+    """Load a plan saved by `plan_to_json`."""
+    return [PlannedJob(**{**job, "changes": tuple(job.get("changes", ()))}) for job in data["jobs"]]
+
+
+def apply_report(results: List[ApplyResult]) -> Dict[str, Any]:
+    """Structured summary of an apply suitable for printing as JSON."""
+    return {
+        "summary": summarise_apply(results),
+        "jobs": [
+            {
+                "name": r.name,
+                "job_id": r.job_id,
+                "action": r.action,
+                **({"error": str(r.error)} if r.error is not None else {}),
+            }
+            for r in results
+        ],
+    }
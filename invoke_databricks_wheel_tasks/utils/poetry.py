@@ -1,43 +1,125 @@
 # Standard Library
+import re
+import sys
 from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-# Third Party
-from poetry.core.factory import Factory
-from poetry.core.masonry.builders.wheel import WheelBuilder
-from poetry.core.poetry import Poetry
+if sys.version_info >= (3, 11):
+    # Standard Library
+    import tomllib
+else:
+    # Third Party
+    import tomli as tomllib
+
+if TYPE_CHECKING:  # pragma: no cover
+    # Third Party
+    from poetry.core.masonry.builders.wheel import WheelBuilder
+    from poetry.core.poetry import Poetry
+
+# Versions already in PEP 440 normal form, anything else is left to poetry to normalise.
+# Names every poetry-core release puts in wheel filenames as is, apart from `-` becoming `_`. Older releases keep
+# the case and dots of other names whereas newer ones normalise them, so those are left to poetry too.
+CANONICAL_NAME_PATTERN = re.compile(r"^[a-z0-9]+([-_][a-z0-9]+)*$")
+CANONICAL_VERSION_PATTERN = re.compile(r"^\d+(\.\d+)*((a|b|rc)\d+)?(\.post\d+)?(\.dev\d+)?$")
+# Python constraints whose lower bound is Python 3, so the wheel is tagged py3 rather than py2.py3.
+PY3_ONLY_PATTERN = re.compile(r"^\s*(\^|~|~=|>=|==)?\s*3(\.[\d*]+)*\s*(,\s*<\s*[\d.]+\s*)?$")
 
 
 @lru_cache(maxsize=None)
-def poetry_project() -> Poetry:
+def poetry_project() -> "Poetry":
     """Get an instance of the current Poetry project.
 
     This is cached so that subsequent calls in the same invoke session reduce interactions with disk.
     """
+    # Third Party
+    from poetry.core.factory import Factory
+
     poetry = Factory().create_poetry(Path(".").resolve())
     return poetry
 
 
+def pyproject_path() -> Path:
+    """Path to the current project's pyproject.toml."""
+    return Path("pyproject.toml").resolve()
+
+
 @lru_cache(maxsize=None)
+def _read_pyproject(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse pyproject.toml, cached until the file changes."""
+    with open(path, "rb") as f:
+        return dict(tomllib.load(f))
+
+
+def pyproject() -> Dict[str, Any]:
+    """Get the current project's pyproject.toml as a dictionary without loading the poetry project."""
+    path = pyproject_path()
+    return _read_pyproject(str(path), path.stat().st_mtime_ns)
+
+
+def poetry_config() -> Dict[str, Any]:
+    """Get the `[tool.poetry]` table of the current project."""
+    return dict(pyproject().get("tool", {}).get("poetry", {}))
+
+
 def poetry_project_name() -> str:
     """Get the name of the current Poerty project."""
-    return str(poetry_project().pyproject.poetry_config["name"])
+    return str(poetry_config()["name"])
 
 
-@lru_cache(maxsize=None)
 def poetry_project_version() -> str:
     """Get the version of the current Poerty project."""
-    return str(poetry_project().pyproject.poetry_config["version"])
+    return str(poetry_config()["version"])
 
 
 @lru_cache(maxsize=None)
-def poetry_wheel_builder() -> WheelBuilder:
+def poetry_wheel_builder() -> "WheelBuilder":
     """Get poetry WheelBuilder instance."""
+    # Third Party
+    from poetry.core.masonry.builders.wheel import WheelBuilder
+
     return WheelBuilder(poetry_project())
 
 
+def distribution_name(name: str) -> str:
+    """Normalise a project name the way it appears in wheel filenames, see PEP 503 and PEP 427."""
+    return re.sub(r"[-_.]+", "-", name).lower().replace("-", "_")
+
+
+def pure_python_wheelname(config: Dict[str, Any]) -> Optional[str]:
+    """Compute the wheel filename straight from `[tool.poetry]` for pure Python projects.
+
+    Returns None whenever the answer depends on more than the config, ie a build script that makes the wheel
+    platform specific, a name or version poetry would normalise, or a Python constraint that may include Python 2.
+    """
+    if config.get("build") or not CANONICAL_NAME_PATTERN.match(str(config.get("name", ""))):
+        return None
+    version = str(config.get("version", ""))
+    python = str(config.get("dependencies", {}).get("python", ""))
+    if not CANONICAL_VERSION_PATTERN.match(version) or not PY3_ONLY_PATTERN.match(python):
+        return None
+    return f"{distribution_name(config['name'])}-{version}-py3-none-any.whl"
+
+
 @lru_cache(maxsize=None)
+def _wheelname(path: str, mtime_ns: int) -> str:
+    """Compute the wheelname, cached until pyproject.toml changes."""
+    wheelname = pure_python_wheelname(poetry_config())
+    if wheelname is None:
+        # Third Party
+        from poetry.core.factory import Factory
+        from poetry.core.masonry.builders.wheel import WheelBuilder
+
+        # Built for this pyproject.toml rather than reusing `poetry_wheel_builder`, which is cached for the session
+        wheelname = str(WheelBuilder(Factory().create_poetry(Path(path).parent)).wheel_filename)
+    return wheelname
+
+
 def poetry_wheelname() -> str:
-    """Get poetry properly formatted wheelname from WheelBuilder instance."""
-    builder = poetry_wheel_builder()
-    return str(builder.wheel_filename)
+    """Get poetry properly formatted wheelname.
+
+    Pure Python projects get it straight from pyproject.toml, only projects with a build script or an unusual
+    name, version or Python constraint need poetry's WheelBuilder.
+    """
+    path = pyproject_path()
+    return _wheelname(str(path), path.stat().st_mtime_ns)
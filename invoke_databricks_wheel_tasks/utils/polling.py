@@ -0,0 +1,70 @@
+# Standard Library
+import random
+import time
+from typing import Any, Callable, Optional
+
+POLL_MIN_DELAY = 1.0
+POLL_MAX_DELAY = 60.0
+POLL_BACKOFF_FACTOR = 1.5
+POLL_JITTER = 0.1
+POLL_FAST_PERIOD = 30.0
+
+# States where a run is about to make progress so it is worth checking on it often.
+FAST_POLL_STATES = ["PENDING", "QUEUED", "BLOCKED", "WAITING_FOR_RETRY"]
+
+
+class AdaptivePoll:
+    """Poll delay schedule that adapts to the lifecycle state of a run.
+
+    Polls every `min_delay` seconds while a run is pending and for the first `fast_period` seconds of any new
+    state, then backs off exponentially with jitter up to `max_delay`. Clock and sleep are injectable so tests
+    can run on a fake clock.
+    """
+
+    def __init__(
+        self,
+        min_delay: float = POLL_MIN_DELAY,
+        max_delay: float = POLL_MAX_DELAY,
+        factor: float = POLL_BACKOFF_FACTOR,
+        jitter: float = POLL_JITTER,
+        fast_period: float = POLL_FAST_PERIOD,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """Configure the schedule, see class docstring."""
+        self.min_delay = min_delay
+        self.max_delay = max(min_delay, max_delay)
+        self.factor = factor
+        self.jitter = jitter
+        self.fast_period = fast_period
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self._state: Optional[str] = None
+        self._state_since = 0.0
+        self._attempt = 0
+
+    def delay(self, state: str) -> float:
+        """Compute how long to wait before polling a run currently in `state`."""
+        now = self.clock()
+        if state != self._state:
+            # Any state transition means the run is moving, so go back to fast polling.
+            self._state = state
+            self._state_since = now
+            self._attempt = 0
+
+        if state in FAST_POLL_STATES or now - self._state_since < self.fast_period:
+            base = self.min_delay
+        else:
+            self._attempt += 1
+            base = min(self.max_delay, self.min_delay * self.factor**self._attempt)
+
+        jittered = base * (1 + self.jitter * (2 * self.rng.random() - 1))
+        return min(self.max_delay, max(self.min_delay, jittered))
+
+    def wait(self, state: str) -> float:
+        """Sleep for the next delay and return how long was slept."""
+        delay = self.delay(state)
+        self.sleep(delay)
+        return delay
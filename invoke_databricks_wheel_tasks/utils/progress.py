@@ -0,0 +1,86 @@
+# Standard Library
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+# Third Party
+import invoke
+
+from .databricks import TERMINAL_STATES, get_run_output
+
+OUTPUT_TAIL_LINES = 20
+# Parts of a run's output worth showing, in the order they are shown.
+OUTPUT_SECTIONS = [("error_trace", "error trace"), ("logs", "logs"), ("notebook_output", "notebook output")]
+
+
+def describe_state(state: Dict[str, Any]) -> str:
+    """Render a run or task state, eg `TERMINATED FAILED`."""
+    return " ".join(s for s in [state.get("life_cycle_state"), state.get("result_state")] if s) or "UNKNOWN"
+
+
+def tail(text: str, lines: int) -> List[str]:
+    """Last `lines` lines of text."""
+    return text.rstrip("\n").splitlines()[-lines:] if lines > 0 else []
+
+
+class RunProgress:
+    """Report a run's progress from the statuses seen while polling it.
+
+    Prints a line whenever the run or one of its tasks changes state. Once a task, or a run without tasks, finishes
+    its output is fetched with one `runs get-output` call and the error and tail of its logs are printed. Output of
+    a finished task never changes, so it is never fetched again however many more polls the run takes.
+    """
+
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        tail_lines: int = OUTPUT_TAIL_LINES,
+        echo: Callable[[str], Any] = print,
+        c: Optional[invoke.Context] = None,
+    ) -> None:
+        """Start without having seen any state."""
+        self.profile = profile
+        self.tail_lines = tail_lines
+        self.echo = echo
+        self.c = c
+        self.states: Dict[str, str] = {}
+        self.fetched: Set[Any] = set()
+
+    def units(self, run: Dict[str, Any]) -> Iterator[Tuple[str, Any, Dict[str, Any], bool]]:
+        """Label, run_id, state and whether output can be fetched, for the run and each of its tasks."""
+        tasks = run.get("tasks", [])
+        yield f"run {run.get('run_id')}", run.get("run_id"), run.get("state", {}), not tasks
+        for task in tasks:
+            yield f"task {task.get('task_key')}", task.get("run_id"), task.get("state", {}), True
+
+    def update(self, run: Dict[str, Any]) -> None:
+        """Report anything that changed since the last status seen."""
+        for label, run_id, state, has_output in self.units(run):
+            described = describe_state(state)
+            if self.states.get(label) != described:
+                self.states[label] = described
+                self.echo(f"{label}: {described}")
+            finished = state.get("life_cycle_state") in TERMINAL_STATES
+            if has_output and finished and run_id is not None and run_id not in self.fetched:
+                self.fetched.add(run_id)
+                for line in self.output_lines(run_id):
+                    self.echo(f"{label}: {line}")
+
+    def output_lines(self, run_id: Any) -> List[str]:
+        """The error and the tail of each part of a finished run's output."""
+        try:
+            output = get_run_output(run_id, self.profile, self.c)
+        except Exception as e:
+            # Output is a courtesy, failing to fetch it must not fail the wait
+            return [f"output unavailable: {e}"]
+
+        lines = [f"error: {output['error']}"] if output.get("error") else []
+        for key, name in OUTPUT_SECTIONS:
+            text = output.get(key)
+            if isinstance(text, dict):
+                text = text.get("result")
+            if not text:
+                continue
+            section = tail(str(text), self.tail_lines)
+            truncated = " (truncated by Databricks)" if key == "logs" and output.get("logs_truncated") else ""
+            lines.append(f"{name}, last {len(section)} lines{truncated}:")
+            lines.extend(f"    {line}" for line in section)
+        return lines
@@ -0,0 +1,230 @@
+# Standard Library
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+# Requests per second and burst size each class of endpoint starts at. Rates halve whenever the workspace answers
+# 429 and creep back up with every success, so fan-out settles at whatever the workspace actually allows.
+ENDPOINT_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "jobs-read": (30.0, 30.0),
+    "jobs-write": (10.0, 10.0),
+    "runs-read": (30.0, 30.0),
+    "runs-trigger": (5.0, 10.0),
+    "dbfs": (30.0, 30.0),
+    "default": (10.0, 10.0),
+}
+MIN_RATE = 0.5
+RATE_RECOVERY = 0.5  # Requests per second regained per successful request
+MAX_CONCURRENT_REQUESTS = 16
+REQUEST_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+# Every request earns a fraction of a retry, on top of a reserve, so a struggling workspace isn't hit by retry storms.
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_RESERVE = 20.0
+# Endpoints that start runs, anything else under /jobs/runs is run bookkeeping.
+RUN_TRIGGER_PATHS = ["/jobs/run-now", "/jobs/runs/submit", "/jobs/runs/repair"]
+
+T = TypeVar("T")
+
+
+def endpoint_class(method: str, path: str) -> str:
+    """Group an endpoint with others sharing a rate limit, see ENDPOINT_RATE_LIMITS."""
+    if path.startswith("/dbfs/"):
+        return "dbfs"
+    if path in RUN_TRIGGER_PATHS:
+        return "runs-trigger"
+    if path.startswith("/jobs/runs/"):
+        return "runs-read" if method == "GET" else "jobs-write"
+    if path.startswith("/jobs/"):
+        return "jobs-read" if method == "GET" else "jobs-write"
+    return "default"
+
+
+def parse_retry_after(value: Optional[str], now: Callable[[], float] = time.time) -> Optional[float]:
+    """Seconds to wait according to a Retry-After header, given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread safe token bucket whose rate adapts to throttling.
+
+    `throttle` halves the rate and pauses the bucket, `recover` raises the rate back towards its maximum.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = time.sleep,
+    ) -> None:
+        """Start with a full bucket refilling at rate tokens per second."""
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.resume_at = self.updated
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._refill(now)
+                wait = self.resume_at - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+    def throttle(self, pause: float) -> None:
+        """Slow down after the workspace throttled a request, pausing everyone for at least `pause` seconds."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            self.resume_at = max(self.resume_at, now + pause)
+
+    def recover(self) -> None:
+        """Speed back up after a successful request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + RATE_RECOVERY)
+
+
+class RetryBudget:
+    """Shared allowance of retries that grows with the number of requests made."""
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, reserve: float = RETRY_BUDGET_RESERVE) -> None:
+        """Start with the full reserve."""
+        self.ratio = ratio
+        self.reserve = reserve
+        self.balance = reserve
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Earn part of a retry for a new request."""
+        with self._lock:
+            self.balance = min(self.reserve, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Spend one retry, or return False if the budget is exhausted."""
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+class RequestScheduler:
+    """Paces, caps and retries every request made to one workspace.
+
+    Requests wait on the token bucket of their endpoint class, then on one of `max_concurrency` slots. The
+    workspace throttling a request (429) slows its whole endpoint class down and pauses it for `Retry-After`.
+    Throttled requests are always retried since they were never processed. Server errors and dropped connections
+    are only retried for idempotent requests, GETs by default. Retries back off exponentially with full jitter,
+    are limited to `retries` per request and draw on a shared `RetryBudget`.
+
+    Errors are recognised by their `status_code` and `retry_after` attributes, see `DatabricksApiError`.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        rate_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        retries: int = REQUEST_RETRIES,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = time.sleep,
+        jitter: Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        """Create a scheduler with its own buckets, retry budget and concurrency slots."""
+        self.rate_limits = rate_limits or ENDPOINT_RATE_LIMITS
+        self.retries = retries
+        self.clock = clock
+        self.sleep = sleep
+        self.jitter = jitter
+        self.budget = RetryBudget()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, method: str, path: str) -> TokenBucket:
+        """Get the token bucket shared by an endpoint's class."""
+        name = endpoint_class(method, path)
+        with self._lock:
+            if name not in self._buckets:
+                rate, burst = self.rate_limits.get(name, self.rate_limits["default"])
+                self._buckets[name] = TokenBucket(rate, burst, self.clock, self.sleep)
+            return self._buckets[name]
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered delay before retry number `attempt`."""
+        return self.jitter(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+    def retry_delay(self, error: Exception, attempt: int, idempotent: bool) -> Optional[float]:
+        """Seconds to wait before retrying after error, or None if it shouldn't be retried."""
+        # Third Party
+        import requests
+
+        status = getattr(error, "status_code", None)
+        retry_after = getattr(error, "retry_after", None)
+        if status == 429:
+            return retry_after if retry_after is not None else self.backoff(attempt)
+        if not idempotent:
+            return None
+        if (status is not None and status >= 500) or isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return retry_after if retry_after is not None else self.backoff(attempt)
+        return None
+
+    def run(self, method: str, path: str, send: Callable[[], T], idempotent: Optional[bool] = None) -> T:
+        """Send a request once it is allowed to, retrying it when the error and the budgets allow."""
+        bucket = self.bucket(method, path)
+        idempotent = method == "GET" if idempotent is None else idempotent
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            bucket.acquire()
+            try:
+                with self._slots:
+                    result = send()
+            except Exception as e:
+                delay = self.retry_delay(e, attempt, idempotent)
+                if delay is None or attempt >= self.retries or not self.budget.withdraw():
+                    raise
+                if getattr(e, "status_code", None) == 429:
+                    bucket.throttle(delay)
+                else:
+                    self.sleep(delay)
+                attempt += 1
+                continue
+            bucket.recover()
+            return result
+
+
+@lru_cache(maxsize=None)
+def request_scheduler(workspace: str) -> RequestScheduler:
+    """Get the scheduler shared by every client and CLI call talking to a workspace."""
+    return RequestScheduler()
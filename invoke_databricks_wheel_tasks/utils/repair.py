@@ -0,0 +1,62 @@
+# Standard Library
+from typing import Any, Dict, List, Optional, Tuple
+
+# Third Party
+import invoke
+
+from .databricks import TERMINAL_STATES, get_run, repair_run
+from .polling import AdaptivePoll
+from .supervisor import FAILED_TASK_LIFE_CYCLE_STATES, FAILED_TASK_RESULT_STATES
+
+# Tasks that never ran because of a failure upstream need re-running along with the failed tasks themselves.
+REPAIR_RESULT_STATES = FAILED_TASK_RESULT_STATES + ["UPSTREAM_FAILED", "UPSTREAM_CANCELED"]
+REPAIR_LIFE_CYCLE_STATES = FAILED_TASK_LIFE_CYCLE_STATES + ["SKIPPED"]
+# Seconds a repair may take to show up in the run's history before giving up on it.
+REPAIR_START_TIMEOUT = 120.0
+
+
+def tasks_to_repair(run: Dict[str, Any]) -> List[str]:
+    """task_keys of a run's failed tasks and of the tasks skipped because of them."""
+    return [
+        task["task_key"]
+        for task in run.get("tasks", [])
+        if task.get("state", {}).get("result_state") in REPAIR_RESULT_STATES
+        or task.get("state", {}).get("life_cycle_state") in REPAIR_LIFE_CYCLE_STATES
+    ]
+
+
+def latest_repair_id(run: Dict[str, Any]) -> Optional[int]:
+    """repair_id of a run's latest repair, or None if it has never been repaired."""
+    repairs = [h["id"] for h in run.get("repair_history", []) if h.get("type") == "REPAIR"]
+    return int(repairs[-1]) if repairs else None
+
+
+def start_repair(
+    run_id: Any,
+    profile: Optional[str] = None,
+    c: Optional[invoke.Context] = None,
+    poll: Optional[AdaptivePoll] = None,
+    timeout: float = REPAIR_START_TIMEOUT,
+) -> Tuple[Optional[int], List[str]]:
+    """Re-run only the failed and skipped tasks of a finished run, returning the repair_id and re-run task_keys.
+
+    Returns `(None, [])` without repairing when every task succeeded. Only returns once the repair shows up in the
+    run's history, so waiting on the run afterwards can't mistake its previous end state for the repair's, and
+    raises a TimeoutError if it hasn't within `timeout` seconds.
+    """
+    run = get_run(run_id, profile, c, include_history=True)
+    life_cycle_state = run["state"]["life_cycle_state"]
+    if life_cycle_state not in TERMINAL_STATES:
+        raise ValueError(f"Run {run_id} is {life_cycle_state}, only finished runs can be repaired.")
+    tasks = tasks_to_repair(run)
+    if not tasks:
+        return None, []
+
+    repair_id = repair_run(run_id, tasks, profile, latest_repair_id(run))
+    poll = poll or AdaptivePoll()
+    deadline = poll.clock() + timeout
+    while latest_repair_id(get_run(run_id, profile, c, include_history=True)) != repair_id:
+        if poll.clock() >= deadline:
+            raise TimeoutError(f"Repair {repair_id} of run {run_id} didn't show up in its history within {timeout}s.")
+        poll.wait("PENDING")
+    return repair_id, tasks
@@ -0,0 +1,119 @@
+# Standard Library
+import fnmatch
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from .api import DatabricksApiClient
+from .dbfs import HASH_SUFFIX, dbfs_api_path, dbfs_delete, dbfs_ls
+
+DEFAULT_KEEP_VERSIONS = 5
+PRUNE_CONCURRENCY = 8
+WHEELS_ROOT = "dbfs:/FileStore/wheels/"
+
+# {distribution}-{version}(-{build tag})?-{python tag}-{abi tag}-{platform tag}.whl or {distribution}-{version}.tar.gz
+ARTIFACT_VERSION_PATTERN = r"^{distribution}-(?P<version>[^-]+)(-.+\.whl|\.tar\.gz)$"
+
+
+class PrunePlan(NamedTuple):
+    """Paths a retention policy would delete, split by how they need deleting."""
+
+    files: List[str]
+    directories: List[str]
+
+
+def artifact_version(filename: str, project: str) -> Optional[str]:
+    """Get the version from one of a project's wheel or sdist filenames, or None if it is neither.
+
+    Distribution names are matched the way packaging normalises them, so `My-Project` matches `my_project-1.0.whl`
+    as well as the `My-Project-1.0.tar.gz` sdists older tools build.
+    """
+    distribution = "[-_.]+".join(re.escape(part) for part in re.split(r"[-_.]+", project))
+    match = re.match(ARTIFACT_VERSION_PATTERN.format(distribution=distribution), filename, re.IGNORECASE)
+    return match.group("version") if match else None
+
+
+def old_versions(
+    client: DatabricksApiClient, artifact_path: str, project: str, keep: int = DEFAULT_KEEP_VERSIONS
+) -> List[str]:
+    """Find the `project` artifacts in one artifact directory beyond the `keep` most recently uploaded versions.
+
+    Artifacts are grouped by version so a wheel and sdist of the same release count once. Files that are not
+    the project's wheels or sdists are never selected, and each selected artifact brings its `.sha256` sidecar.
+    """
+    entries = {e["path"]: e for e in dbfs_ls(client, artifact_path, missing_ok=True) if not e["is_dir"]}
+    versions: Dict[str, List[Dict[str, Any]]] = {}
+    for path, entry in entries.items():
+        version = artifact_version(path.rsplit("/", 1)[-1], project)
+        if version is not None:
+            versions.setdefault(version, []).append(entry)
+
+    newest_first = sorted(
+        versions.values(), key=lambda v: max((e.get("modification_time", 0), e["path"]) for e in v), reverse=True
+    )
+    stale = [e["path"] for version in newest_first[keep:] for e in version]
+    return sorted(stale + [p + HASH_SUFFIX for p in stale if p + HASH_SUFFIX in entries])
+
+
+def stale_branch_paths(
+    client: DatabricksApiClient,
+    project: str,
+    branches: Iterable[str],
+    root: str = WHEELS_ROOT,
+    keep_patterns: Iterable[str] = (),
+) -> List[str]:
+    """Find the `<root>/<branch>/<project>` directories whose branch no longer exists.
+
+    Branch names may contain `/`, so the tree is walked one level at a time, listing each level in parallel,
+    and only descending into directories that could still lead to a project directory. Other projects sharing
+    the root are left alone, as are directories whose name matches one of the glob `keep_patterns`, eg uploads
+    made under CI names like `123/merge` rather than a branch.
+    """
+    live = set(branches)
+    keep_patterns = list(keep_patterns)
+    root = dbfs_api_path(root).rstrip("/")
+    stale = []
+    level = [root]
+    with ThreadPoolExecutor(max_workers=PRUNE_CONCURRENCY) as executor:
+        while level:
+            listings = list(executor.map(lambda path: dbfs_ls(client, path, missing_ok=True), level))
+            level = []
+            for listing in listings:
+                for entry in listing:
+                    if not entry["is_dir"]:
+                        continue
+                    path = entry["path"].rstrip("/")
+                    if path.rsplit("/", 1)[-1] == project and path != f"{root}/{project}":
+                        branch = path[len(root) + 1 : -len(project) - 1]
+                        if branch not in live and not any(fnmatch.fnmatch(branch, p) for p in keep_patterns):
+                            stale.append(path)
+                    elif path[len(root) + 1 :] not in live:
+                        level.append(path)
+    return sorted(stale)
+
+
+def prune_plan(
+    client: DatabricksApiClient,
+    artifact_path: str,
+    project: str,
+    keep: int = DEFAULT_KEEP_VERSIONS,
+    branches: Optional[Iterable[str]] = None,
+    root: str = WHEELS_ROOT,
+    keep_patterns: Iterable[str] = (),
+) -> PrunePlan:
+    """Work out what a retention policy would delete.
+
+    Keeps the `keep` most recent versions of `project` in `artifact_path` (0 keeps everything) and, when the live
+    `branches` are given, drops the `project` directory of every other branch under `root` not matching
+    `keep_patterns`, see `stale_branch_paths`. The branches must be complete, see `git_branches`.
+    """
+    files = old_versions(client, artifact_path, project, keep) if keep > 0 else []
+    directories = stale_branch_paths(client, project, branches, root, keep_patterns) if branches is not None else []
+    return PrunePlan(files, directories)
+
+
+def apply_prune(client: DatabricksApiClient, plan: PrunePlan, max_workers: int = PRUNE_CONCURRENCY) -> None:
+    """Delete everything in a prune plan using a pool of at most `max_workers` threads."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(lambda path: dbfs_delete(client, path), plan.files))
+        list(executor.map(lambda path: dbfs_delete(client, path, recursive=True), plan.directories))
@@ -0,0 +1,153 @@
+# Standard Library
+import signal
+import threading
+from contextlib import contextmanager
+from types import FrameType
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Third Party
+import invoke
+
+from .databricks import cancel_run, wait_for_run_status
+from .polling import AdaptivePoll
+
+# Task outcomes that count as the task failing. Tasks skipped because an upstream task failed are consequences of
+# that failure, so they don't count again.
+FAILED_TASK_RESULT_STATES = ["FAILED", "TIMEDOUT", "CANCELED"]
+FAILED_TASK_LIFE_CYCLE_STATES = ["INTERNAL_ERROR"]
+CANCEL_SIGNALS = [signal.SIGINT, signal.SIGTERM]
+
+
+class FailurePolicy(NamedTuple):
+    """When a multi-task run should be cancelled because of its failed tasks."""
+
+    fail_fast: bool = False  # Any failed task
+    max_failed_tasks: Optional[int] = None  # More than this many failed tasks
+    critical_tasks: Tuple[str, ...] = ()  # Any of these tasks failing
+
+    def tripped(self, failed_tasks: List[str]) -> Optional[str]:
+        """Why the policy says to cancel a run with these failed tasks, or None to let it carry on."""
+        if not failed_tasks:
+            return None
+        critical = [t for t in failed_tasks if t in self.critical_tasks]
+        if critical:
+            return f"critical task {', '.join(repr(t) for t in critical)} failed"
+        if self.fail_fast:
+            return f"task {', '.join(repr(t) for t in failed_tasks)} failed"
+        if self.max_failed_tasks is not None and len(failed_tasks) > self.max_failed_tasks:
+            return f"{len(failed_tasks)} tasks failed, more than the {self.max_failed_tasks} allowed"
+        return None
+
+
+def failure_policy(
+    supervise: bool = False,
+    fail_fast: bool = False,
+    max_failed_tasks: Optional[Any] = None,
+    critical_tasks: Optional[List[str]] = None,
+) -> FailurePolicy:
+    """Build a policy from task options, where supervising without saying how means failing fast."""
+    return FailurePolicy(
+        fail_fast=fail_fast or (supervise and max_failed_tasks is None and not critical_tasks),
+        max_failed_tasks=int(max_failed_tasks) if max_failed_tasks is not None else None,
+        critical_tasks=tuple(critical_tasks or []),
+    )
+
+
+def failed_tasks(run: Dict[str, Any]) -> List[str]:
+    """task_keys of a run's failed tasks."""
+    return [
+        task["task_key"]
+        for task in run.get("tasks", [])
+        if task.get("state", {}).get("result_state") in FAILED_TASK_RESULT_STATES
+        or task.get("state", {}).get("life_cycle_state") in FAILED_TASK_LIFE_CYCLE_STATES
+    ]
+
+
+class RunSupervisor:
+    """Watch a multi-task run's tasks and cancel the run as soon as its `FailurePolicy` trips.
+
+    Pass `update` as the `on_update` of `poll_run_status`. Every status is first forwarded to `on_update`, eg to
+    report progress. Once the policy trips the run is cancelled and the wait fails with a ValueError rather than
+    leaving the remaining tasks to burn cluster time.
+    """
+
+    def __init__(
+        self,
+        run_id: Any,
+        policy: FailurePolicy,
+        profile: Optional[str] = None,
+        c: Optional[invoke.Context] = None,
+        on_update: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> None:
+        """Supervise one run."""
+        self.run_id = run_id
+        self.policy = policy
+        self.profile = profile
+        self.c = c
+        self.on_update = on_update
+
+    def update(self, run: Dict[str, Any]) -> None:
+        """Apply the failure policy to the latest status of the run."""
+        if self.on_update is not None:
+            self.on_update(run)
+        reason = self.policy.tripped(failed_tasks(run))
+        if reason is not None:
+            cancel_run(self.run_id, self.profile, self.c)
+            raise ValueError(f"Cancelled run {self.run_id} because {reason}.")
+
+
+@contextmanager
+def cancel_run_on_signals(
+    run_id: Any,
+    profile: Optional[str] = None,
+    c: Optional[invoke.Context] = None,
+    echo: Callable[[str], Any] = print,
+) -> Iterator[None]:
+    """Cancel a run if the process is interrupted by SIGINT or SIGTERM while waiting on it.
+
+    The handlers only raise, like Python's own SIGINT handling, and the run is cancelled while unwinding. Making
+    API calls from inside a handler could deadlock on locks held by the code it interrupted. Handlers can only be
+    installed from the main thread, elsewhere this does nothing. The previous handlers are restored afterwards,
+    or the default ones when the previous handlers weren't installed from Python.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def terminate(signum: int, frame: Optional[FrameType]) -> None:
+        raise SystemExit(128 + signum)
+
+    previous = {s: signal.getsignal(s) for s in CANCEL_SIGNALS}
+    signal.signal(signal.SIGTERM, terminate)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    try:
+        yield
+    except (KeyboardInterrupt, SystemExit):
+        echo(f"Interrupted, cancelling run {run_id}")
+        cancel_run(run_id, profile, c)
+        raise
+    finally:
+        for s, handler in previous.items():
+            signal.signal(s, signal.SIG_DFL if handler is None else handler)
+
+
+def supervised_wait(
+    c: Optional[invoke.Context],
+    profile: Optional[str],
+    run_id: Any,
+    poll: Optional[AdaptivePoll] = None,
+    policy: FailurePolicy = FailurePolicy(),
+    on_update: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    echo: Callable[[str], Any] = print,
+) -> Any:
+    """Wait for a run like `wait_for_run_status`, supervising it when the policy asks for anything.
+
+    A supervised run is cancelled when the policy trips or the process is interrupted, see `RunSupervisor` and
+    `cancel_run_on_signals`, which reports the interruption through `echo`.
+    """
+    if policy == FailurePolicy():
+        return wait_for_run_status(c, profile, run_id, poll=poll, on_update=on_update)
+
+    supervisor = RunSupervisor(run_id, policy, profile, c, on_update)
+    with cancel_run_on_signals(run_id, profile, c, echo):
+        return wait_for_run_status(c, profile, run_id, poll=poll, on_update=supervisor.update)
@@ -6,6 +6,13 @@ from pathlib import Path
 import pytest
 from dotenv import load_dotenv
 
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils import ratelimit
+from invoke_databricks_wheel_tasks.utils.api import api_client
+from invoke_databricks_wheel_tasks.utils.polling import AdaptivePoll
+
+from .fake_databricks import FakeDatabricksWorkspace
+
 load_dotenv("./tests/.env")
 
 
@@ -13,6 +20,22 @@ class FixtureConfigurationError(Exception):
     ...
 
 
+class FakeClock:
+    """Deterministic monotonic clock whose sleep just advances time."""
+
+    def __init__(self):
+        """Start at time zero."""
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
 @pytest.fixture(scope="function")
 def databricks_test_workspace(monkeypatch):
     """Load environment variables for test databricks workspace fixture into monkeypatched environment variables.
@@ -45,3 +68,46 @@ def databricks_test_workspace(monkeypatch):
             These are prefixed with TEST_FIXTURE_ to differentiate them from any other real CLI credentials you might be using.
         """
         raise FixtureConfigurationError(error_message) from k
+
+
+@pytest.fixture(scope="function")
+def fake_databricks(monkeypatch, tmp_path):
+    """Point the API client at an in-memory Databricks workspace served from localhost."""
+    workspace = FakeDatabricksWorkspace().start()
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    monkeypatch.setenv("DATABRICKS_HOST", workspace.url)
+    monkeypatch.setenv("DATABRICKS_TOKEN", "dapi-fake-token")
+    monkeypatch.setenv("DATABRICKS_JOBS_API_VERSION", "2.1")
+    # The fake workspace never throttles, so don't pace requests to it like a real one
+    monkeypatch.setattr(ratelimit, "ENDPOINT_RATE_LIMITS", {"default": (10_000.0, 10_000.0)})
+    api_client.cache_clear()
+    ratelimit.request_scheduler.cache_clear()
+
+    yield workspace
+
+    api_client.cache_clear()
+    ratelimit.request_scheduler.cache_clear()
+    workspace.stop()
+
+
+@pytest.fixture(scope="function")
+def fake_clock():
+    return FakeClock()
+
+
+@pytest.fixture(scope="function")
+def fast_poll():
+    """Build polls that check every 10ms, for runs scripted in the fake workspace."""
+    return lambda: AdaptivePoll(min_delay=0.01, max_delay=0.01, jitter=0)
+
+
+@pytest.fixture(scope="function")
+def task():
+    """Build the state of one task in a multi-task run."""
+
+    def build(task_key, life_cycle_state, result_state=None):
+        state = {"life_cycle_state": life_cycle_state, **({"result_state": result_state} if result_state else {})}
+        return {"task_key": task_key, "run_id": sum(task_key.encode()), "state": state}
+
+    return build
@@ -0,0 +1,373 @@
+"""In-memory stand-in for the subset of the Databricks REST API this package talks to.
+
+It runs a real HTTP server on localhost so the pooled API client is exercised end to end.
+"""
+
+# Standard Library
+import base64
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# Routes return (status, body) or (status, body, headers)
+Response = Tuple[Any, ...]
+
+TERMINAL = ["TERMINATED", "SKIPPED", "INTERNAL_ERROR"]
+
+SUCCESSFUL_RUN = [
+    {"life_cycle_state": "PENDING"},
+    {"life_cycle_state": "RUNNING"},
+    {"life_cycle_state": "TERMINATED", "result_state": "SUCCESS"},
+]
+
+
+class FakeDatabricksWorkspace:
+    def __init__(self) -> None:
+        """Start with an empty workspace; tests seed jobs, runs and files directly."""
+        self.lock = threading.RLock()
+        self.jobs: Dict[int, Dict[str, Any]] = {}
+        self.runs: Dict[int, Dict[str, Any]] = {}
+        self.run_states: Dict[int, List[Dict[str, Any]]] = {}
+        self.dbfs: Dict[str, bytes] = {}
+        self.dbfs_mtimes: Dict[str, int] = {}
+        # Most files a single recursive delete removes before answering PARTIAL_DELETE
+        self.delete_batch_limit = 10_000
+        self.handles: Dict[int, Tuple[str, bytearray]] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self.connections: set = set()
+        self.run_script: List[Dict[str, Any]] = SUCCESSFUL_RUN
+        self.job_run_scripts: Dict[int, List[Dict[str, Any]]] = {}
+        # run_id -> run script a repair of the run follows, defaulting to `run_script`
+        self.repair_scripts: Dict[int, List[Dict[str, Any]]] = {}
+        self.repairs: List[Dict[str, Any]] = []
+        self.submits: List[Dict[str, Any]] = []
+        # False to leave repairs out of runs get, like a workspace that is slow to record them
+        self.show_repairs = True
+        # API version of the request being handled
+        self.api_version = ""
+        # idempotency_token -> run_id of the one-time run it submitted
+        self.submitted: Dict[str, int] = {}
+        # run_id -> what runs get-output answers once the run has finished
+        self.run_outputs: Dict[int, Dict[str, Any]] = {}
+        self.list_page_limit = 25
+        # Endpoint -> number of upcoming calls to fail with a transient 503
+        self.failures: Dict[str, int] = {}
+        # Endpoint -> number of upcoming calls to throttle with a 429 asking to retry after `retry_after` seconds
+        self.throttles: Dict[str, int] = {}
+        self.retry_after = "0"
+        self._next_id = 1
+        self.routes: Dict[Tuple[str, str], Callable[[Dict[str, Any]], Response]] = {
+            ("GET", "/jobs/list"): self.jobs_list,
+            ("GET", "/jobs/get"): self.jobs_get,
+            ("POST", "/jobs/create"): self.jobs_create,
+            ("POST", "/jobs/reset"): self.jobs_reset,
+            ("POST", "/jobs/delete"): self.jobs_delete,
+            ("POST", "/jobs/run-now"): self.jobs_run_now,
+            ("POST", "/jobs/runs/submit"): self.runs_submit,
+            ("GET", "/jobs/runs/get"): self.runs_get,
+            ("GET", "/jobs/runs/list"): self.runs_list,
+            ("GET", "/jobs/runs/get-output"): self.runs_get_output,
+            ("POST", "/jobs/runs/cancel"): self.runs_cancel,
+            ("POST", "/jobs/runs/repair"): self.runs_repair,
+            ("POST", "/dbfs/create"): self.dbfs_create,
+            ("POST", "/dbfs/add-block"): self.dbfs_add_block,
+            ("POST", "/dbfs/close"): self.dbfs_close,
+            ("GET", "/dbfs/list"): self.dbfs_list,
+            ("GET", "/dbfs/read"): self.dbfs_read,
+            ("POST", "/dbfs/delete"): self.dbfs_delete,
+            ("GET", "/dbfs/get-status"): self.dbfs_get_status,
+        }
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    # Server lifecycle
+
+    @property
+    def url(self) -> str:
+        assert self.server is not None
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeDatabricksWorkspace":
+        workspace = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                self._respond(*workspace.dispatch("GET", parsed.path, params, self.client_address))
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                self._respond(*workspace.dispatch("POST", urlparse(self.path).path, body, self.client_address))
+
+            def _respond(self, status: int, body: Dict[str, Any], headers: Dict[str, str]) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, args=(0.01,), daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def dispatch(
+        self, method: str, path: str, data: Dict[str, Any], client_address: Tuple[str, int]
+    ) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        match = re.match(r"^/api/(\d\.\d)(/.*)$", path)
+        if match is None:
+            return 404, {"error_code": "ENDPOINT_NOT_FOUND", "message": path}, {}
+        endpoint = match.group(2)
+        with self.lock:
+            self.requests.append((method, endpoint))
+            self.connections.add(client_address)
+        route = self.routes.get((method, endpoint))
+        if route is None:
+            return 404, {"error_code": "ENDPOINT_NOT_FOUND", "message": endpoint}, {}
+        with self.lock:
+            if self.failures.get(endpoint):
+                self.failures[endpoint] -= 1
+                return 503, {"error_code": "TEMPORARILY_UNAVAILABLE", "message": endpoint}, {}
+            if self.throttles.get(endpoint):
+                self.throttles[endpoint] -= 1
+                return (
+                    429,
+                    {"error_code": "REQUEST_LIMIT_EXCEEDED", "message": endpoint},
+                    {"Retry-After": self.retry_after},
+                )
+        with self.lock:
+            self.api_version = match.group(1)
+            status, body, *extra = route(data)
+        return status, body, extra[0] if extra else {}
+
+    def calls(self, endpoint: str) -> int:
+        return sum(1 for _, e in self.requests if e == endpoint)
+
+    def new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    # Jobs
+
+    def add_job(self, settings: Dict[str, Any]) -> int:
+        job_id = self.new_id()
+        self.jobs[job_id] = {"job_id": job_id, "settings": settings}
+        return job_id
+
+    def jobs_list(self, params: Dict[str, Any]) -> Response:
+        offset = int(params.get("offset", 0))
+        limit = min(int(params.get("limit", self.list_page_limit)), self.list_page_limit)
+        jobs = [self.jobs[k] for k in sorted(self.jobs)]
+        if "name" in params:
+            jobs = [j for j in jobs if j["settings"]["name"] == params["name"]]
+        page = jobs[offset : offset + limit]
+        return 200, {"jobs": page, "has_more": offset + limit < len(jobs)}
+
+    def jobs_get(self, params: Dict[str, Any]) -> Response:
+        job = self.jobs.get(int(params["job_id"]))
+        if job is None:
+            return 400, {"error_code": "INVALID_PARAMETER_VALUE", "message": f"Job {params['job_id']} does not exist."}
+        return 200, job
+
+    def jobs_create(self, body: Dict[str, Any]) -> Response:
+        return 200, {"job_id": self.add_job(body)}
+
+    def jobs_reset(self, body: Dict[str, Any]) -> Response:
+        job_id = int(body["job_id"])
+        if job_id not in self.jobs:
+            return 400, {"error_code": "INVALID_PARAMETER_VALUE", "message": f"Job {job_id} does not exist."}
+        self.jobs[job_id]["settings"] = body["new_settings"]
+        return 200, {}
+
+    def jobs_delete(self, body: Dict[str, Any]) -> Response:
+        if self.jobs.pop(int(body["job_id"]), None) is None:
+            return 404, {"error_code": "RESOURCE_DOES_NOT_EXIST", "message": f"Job {body['job_id']} does not exist."}
+        return 200, {}
+
+    # Runs
+
+    def add_run(self, job_id: Optional[int], states: Optional[List[Dict[str, Any]]] = None) -> int:
+        run_id = self.new_id()
+        self.run_states[run_id] = list(states or self.run_script)
+        self.runs[run_id] = {
+            "run_id": run_id,
+            "job_id": job_id,
+            "run_page_url": f"{self.url}/#job/{job_id}/run/{run_id}",
+        }
+        self.set_run_state(run_id, self.run_states[run_id][0])
+        return run_id
+
+    def set_run_state(self, run_id: int, step: Dict[str, Any]) -> None:
+        # Steps of a run script may carry the run's tasks alongside its state
+        self.runs[run_id]["state"] = {k: v for k, v in step.items() if k != "tasks"}
+        if "tasks" in step:
+            self.runs[run_id]["tasks"] = step["tasks"]
+
+    def jobs_run_now(self, body: Dict[str, Any]) -> Response:
+        job_id = int(body["job_id"])
+        if job_id not in self.jobs:
+            return 400, {"error_code": "INVALID_PARAMETER_VALUE", "message": f"Job {job_id} does not exist."}
+        return 200, {"run_id": self.add_run(job_id, self.job_run_scripts.get(job_id))}
+
+    def runs_submit(self, body: Dict[str, Any]) -> Response:
+        token = body.get("idempotency_token")
+        if token in self.submitted:
+            return 200, {"run_id": self.submitted[token]}
+        run_id = self.add_run(None)
+        self.runs[run_id]["run_name"] = body.get("run_name")
+        self.submits.append(body)
+        if token:
+            self.submitted[token] = run_id
+        return 200, {"run_id": run_id}
+
+    def advance_run(self, run_id: int) -> Dict[str, Any]:
+        states = self.run_states[run_id]
+        self.set_run_state(run_id, states.pop(0) if len(states) > 1 else states[0])
+        return self.runs[run_id]
+
+    def runs_get(self, params: Dict[str, Any]) -> Response:
+        run_id = int(params["run_id"])
+        if run_id not in self.runs:
+            return 400, {"error_code": "INVALID_PARAMETER_VALUE", "message": f"Run {run_id} does not exist."}
+        run = self.advance_run(run_id)
+        if self.api_version != "2.1" or not self.show_repairs:
+            # Repair history is only part of Jobs API 2.1
+            run = {k: v for k, v in run.items() if k != "repair_history"}
+        return 200, run
+
+    def runs_get_output(self, params: Dict[str, Any]) -> Response:
+        run_id = int(params["run_id"])
+        if run_id not in self.run_outputs:
+            return 400, {"error_code": "INVALID_PARAMETER_VALUE", "message": f"Run {run_id} does not exist."}
+        return 200, {"metadata": {"run_id": run_id}, **self.run_outputs[run_id]}
+
+    def runs_cancel(self, body: Dict[str, Any]) -> Response:
+        run_id = int(body["run_id"])
+        if run_id not in self.runs:
+            return 400, {"error_code": "INVALID_PARAMETER_VALUE", "message": f"Run {run_id} does not exist."}
+        self.run_states[run_id] = [
+            {"life_cycle_state": "TERMINATING"},
+            {"life_cycle_state": "TERMINATED", "result_state": "CANCELED"},
+        ]
+        return 200, {}
+
+    def runs_repair(self, body: Dict[str, Any]) -> Response:
+        run_id = int(body["run_id"])
+        if run_id not in self.runs:
+            return 400, {"error_code": "INVALID_PARAMETER_VALUE", "message": f"Run {run_id} does not exist."}
+        history = self.runs[run_id].setdefault("repair_history", [{"type": "ORIGINAL", "id": run_id}])
+        if len(history) > 1 and body.get("latest_repair_id") != history[-1]["id"]:
+            return 400, {"error_code": "INVALID_PARAMETER_VALUE", "message": "latest_repair_id is not the latest"}
+        repair_id = self.new_id()
+        self.repairs.append(body)
+        history.append({"type": "REPAIR", "id": repair_id, "task_run_ids": []})
+        self.run_states[run_id] = list(self.repair_scripts.get(run_id, self.run_script))
+        return 200, {"repair_id": repair_id}
+
+    def runs_list(self, params: Dict[str, Any]) -> Response:
+        job_id = int(params["job_id"]) if "job_id" in params else None
+        # Newest first, like the real listing
+        runs = [
+            self.runs[k] for k in sorted(self.runs, reverse=True) if job_id is None or self.runs[k]["job_id"] == job_id
+        ]
+        offset = int(params.get("offset", 0))
+        if params.get("active_only") == "true":
+            if offset == 0:
+                # The first page of a listing is how time passes for runs that are only ever polled in bulk
+                runs = [
+                    self.advance_run(r["run_id"]) if r["state"]["life_cycle_state"] not in TERMINAL else r for r in runs
+                ]
+            runs = [r for r in runs if r["state"]["life_cycle_state"] not in TERMINAL]
+        limit = min(int(params.get("limit", self.list_page_limit)), self.list_page_limit)
+        return 200, {"runs": runs[offset : offset + limit], "has_more": offset + limit < len(runs)}
+
+    # DBFS
+
+    def dbfs_create(self, body: Dict[str, Any]) -> Response:
+        if body["path"] in self.dbfs and not body.get("overwrite"):
+            return 400, {"error_code": "RESOURCE_ALREADY_EXISTS", "message": body["path"]}
+        handle = self.new_id()
+        self.handles[handle] = (body["path"], bytearray())
+        return 200, {"handle": handle}
+
+    def dbfs_add_block(self, body: Dict[str, Any]) -> Response:
+        self.handles[int(body["handle"])][1].extend(base64.b64decode(body["data"]))
+        return 200, {}
+
+    def dbfs_close(self, body: Dict[str, Any]) -> Response:
+        path, data = self.handles.pop(int(body["handle"]))
+        self.put_file(path, bytes(data))
+        return 200, {}
+
+    def put_file(self, path: str, data: bytes) -> None:
+        self.dbfs[path] = data
+        self.dbfs_mtimes[path] = self.new_id()
+
+    def dbfs_list(self, params: Dict[str, Any]) -> Response:
+        prefix = params["path"].rstrip("/") + "/"
+        children = {p[len(prefix) :].split("/")[0] for p in self.dbfs if p.startswith(prefix)}
+        if not children:
+            return 404, {"error_code": "RESOURCE_DOES_NOT_EXIST", "message": params["path"]}
+        files = []
+        for child in sorted(children):
+            path = prefix + child
+            is_dir = path not in self.dbfs
+            files.append(
+                {
+                    "path": path,
+                    "is_dir": is_dir,
+                    "file_size": 0 if is_dir else len(self.dbfs[path]),
+                    "modification_time": 0 if is_dir else self.dbfs_mtimes.get(path, 0),
+                }
+            )
+        return 200, {"files": files}
+
+    def dbfs_read(self, params: Dict[str, Any]) -> Response:
+        if params["path"] not in self.dbfs:
+            return 404, {"error_code": "RESOURCE_DOES_NOT_EXIST", "message": params["path"]}
+        offset = int(params.get("offset", 0))
+        data = self.dbfs[params["path"]][offset : offset + int(params.get("length", 1024 * 1024))]
+        return 200, {"bytes_read": len(data), "data": base64.b64encode(data).decode()}
+
+    def dbfs_delete(self, body: Dict[str, Any]) -> Response:
+        path = body["path"].rstrip("/")
+        if path in self.dbfs:
+            del self.dbfs[path]
+            return 200, {}
+        children = sorted(p for p in self.dbfs if p.startswith(path + "/"))
+        if not children:
+            return 404, {
+                "error_code": "RESOURCE_DOES_NOT_EXIST",
+                "message": f"No file or directory exists on path {path}.",
+            }
+        if not body.get("recursive"):
+            return 400, {"error_code": "IO_ERROR", "message": f"{path} is a non-empty directory"}
+        for child in children[: self.delete_batch_limit]:
+            del self.dbfs[child]
+        if len(children) > self.delete_batch_limit:
+            return 503, {"error_code": "PARTIAL_DELETE", "message": f"Deleted {self.delete_batch_limit} files"}
+        return 200, {}
+
+    def dbfs_get_status(self, params: Dict[str, Any]) -> Response:
+        if params["path"] not in self.dbfs:
+            return 404, {"error_code": "RESOURCE_DOES_NOT_EXIST", "message": params["path"]}
+        return 200, {"path": params["path"], "is_dir": False, "file_size": len(self.dbfs[params["path"]])}
@@ -0,0 +1,58 @@
+"""Guard the import cost of the package, which every `invoke` invocation pays through a star import in tasks.py."""
+
+# Standard Library
+import subprocess
+import sys
+
+# Third Party
+import pytest
+
+# Heavy dependencies that must only be imported once a task actually needs them.
+LAZY_MODULES = ["requests", "databricks_cli", "jinja2", "yaml", "orjson", "poetry"]
+# Import time budget for this package on top of invoke itself, generous enough for slow CI runners.
+IMPORT_BUDGET_MS = 150
+
+
+def import_times(module):
+    """Cumulative import time in ms per module from `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import invoke; import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:") :].split("|")
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+@pytest.mark.parametrize("module", LAZY_MODULES)
+def test_heavy_dependencies_are_imported_lazily(module):
+    # Given
+    # .. a fresh interpreter, checked after importing invoke alone and again after importing this package, since
+    # some invoke versions import modules like yaml themselves
+    code = (
+        f"import invoke, sys; before = {module!r} in sys.modules; "
+        f"import invoke_databricks_wheel_tasks; print(before, {module!r} in sys.modules)"
+    )
+
+    # When
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    loaded_by_invoke, loaded = result.stdout.split()
+
+    # Then
+    assert loaded == "False" or loaded_by_invoke == "True"
+
+
+def test_import_time_budget():
+    # Given
+    # .. invoke is imported first so it isn't counted against this package
+
+    # When
+    times = import_times("invoke_databricks_wheel_tasks")
+
+    # Then
+    assert times["invoke_databricks_wheel_tasks"] < IMPORT_BUDGET_MS, times
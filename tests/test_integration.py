@@ -124,8 +124,7 @@ def test_create_job(databricks_test_workspace: None, uploaded_wheel_path: Tuple[
 
     # When
     result = create_or_reset_job(job_definition)
-    result_data = json.loads(result)
-    job_id = result_data["job_id"]
+    job_id = result["job_id"]
 
     # Then
     updated_listing = list_jobs()
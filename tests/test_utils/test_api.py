@@ -0,0 +1,60 @@
+# Third Party
+import pytest
+
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils.api import DatabricksApiError, api_client
+
+
+def test_api_client_reuses_pooled_connection(fake_databricks):
+    # Given
+    client = api_client()
+
+    # When
+    for _ in range(10):
+        client.get("/jobs/list")
+
+    # Then
+    assert fake_databricks.calls("/jobs/list") == 10
+    assert len(fake_databricks.connections) == 1
+
+
+def test_api_client_is_shared_per_profile(fake_databricks):
+    # Given
+    # fake_databricks configures credentials through environment variables
+
+    # When
+    first = api_client()
+    second = api_client()
+
+    # Then
+    assert first is second
+    assert first.url("/jobs/list") == f"{fake_databricks.url}/api/2.1/jobs/list"
+    assert first.url("/dbfs/list") == f"{fake_databricks.url}/api/2.0/dbfs/list"
+
+
+def test_api_client_raises_databricks_errors(fake_databricks):
+    # Given
+    client = api_client()
+
+    # When
+    with pytest.raises(DatabricksApiError) as e:
+        client.get("/jobs/get", {"job_id": 404})
+
+    # Then
+    assert e.value.status_code == 400
+    assert e.value.error_code == "INVALID_PARAMETER_VALUE"
+
+
+def test_api_client_without_credentials(monkeypatch, tmp_path):
+    # Given
+    monkeypatch.setenv("HOME", str(tmp_path))
+    for var in ["DATABRICKS_HOST", "DATABRICKS_TOKEN", "DATABRICKS_USERNAME", "DATABRICKS_PASSWORD"]:
+        monkeypatch.delenv(var, raising=False)
+    api_client.cache_clear()
+
+    # When
+    client = api_client("missing-profile")
+
+    # Then
+    assert client is None
+    api_client.cache_clear()
@@ -0,0 +1,46 @@
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils.cache import JobIdCache, cache_dir
+
+
+def test_job_id_cache_persists_between_sessions(monkeypatch, tmp_path):
+    # Given
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    JobIdCache("https://example.cloud.databricks.com").set("my-job", 123)
+
+    # When
+    job_id = JobIdCache("https://example.cloud.databricks.com").get("my-job")
+    other_workspace = JobIdCache("https://other.cloud.databricks.com").get("my-job")
+
+    # Then
+    assert job_id == 123
+    assert other_workspace is None
+    assert cache_dir() == tmp_path / "invoke-databricks-wheel-tasks"
+
+
+def test_job_id_cache_expires_entries(monkeypatch, tmp_path, fake_clock):
+    # Given
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    cache = JobIdCache("workspace", ttl=60, clock=fake_clock)
+    cache.set("my-job", 123)
+
+    # When
+    fake_clock.sleep(60)
+    fresh = cache.get("my-job")
+    fake_clock.sleep(1)
+    stale = cache.get("my-job")
+
+    # Then
+    assert fresh == 123
+    assert stale is None
+
+
+def test_job_id_cache_invalidate(monkeypatch, tmp_path):
+    # Given
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    JobIdCache("workspace").set("my-job", 123)
+
+    # When
+    JobIdCache("workspace").invalidate("my-job")
+
+    # Then
+    assert JobIdCache("workspace").get("my-job") is None
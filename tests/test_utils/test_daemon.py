@@ -0,0 +1,194 @@
+# Standard Library
+import os
+import threading
+import time
+
+# Third Party
+import pytest
+
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils import daemon as daemon_module
+from invoke_databricks_wheel_tasks.utils.api import DatabricksApiError
+from invoke_databricks_wheel_tasks.utils.daemon import (
+    DAEMON_SOCKET_ENV,
+    DaemonError,
+    WarmDaemon,
+    clear_caches,
+    daemon_call,
+    daemon_running,
+    stop_daemon,
+)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A project directory with its own daemon socket, and a recording operation in place of real work."""
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    (project_dir / "pyproject.toml").write_text(
+        '[tool.poetry]\nname = "demo"\nversion = "1.0.0"\n[tool.poetry.dependencies]\npython = "^3.8"\n'
+    )
+    monkeypatch.chdir(project_dir)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv(DAEMON_SOCKET_ENV, str(tmp_path / "daemon.sock"))
+
+    calls = []
+
+    def echo(*args, **kwargs):
+        calls.append((threading.current_thread().name, args, kwargs))
+        if args and args[0] == "fail":
+            raise DatabricksApiError("404 RESOURCE_DOES_NOT_EXIST: gone", 404, "RESOURCE_DOES_NOT_EXIST")
+        return {"args": list(args), "kwargs": kwargs}
+
+    monkeypatch.setitem(daemon_module.DAEMON_OPERATIONS, "echo", echo)
+    clear_caches()
+    yield project_dir, calls
+    clear_caches()
+
+
+@pytest.fixture
+def running_daemon(project, tmp_path):
+    project_dir, _ = project
+    warm = WarmDaemon(tmp_path / "daemon.sock", project_dir)
+    thread = threading.Thread(target=warm.serve, name="daemon", daemon=True)
+    thread.start()
+    while not daemon_running():
+        time.sleep(0.01)
+    yield warm
+    warm.stop()
+    thread.join(5)
+
+
+def test_daemon_call_runs_inline_without_daemon(project):
+    # Given
+    _, calls = project
+
+    # When
+    result = daemon_call("echo", 1, key="value")
+
+    # Then
+    assert result == {"args": [1], "kwargs": {"key": "value"}}
+    assert calls[0][0] == threading.current_thread().name
+
+
+def test_daemon_call_uses_running_daemon(project, running_daemon):
+    # Given
+    _, calls = project
+
+    # When
+    result = daemon_call("echo", 1, key="value")
+
+    # Then
+    assert result == {"args": [1], "kwargs": {"key": "value"}}
+    assert calls[0][0] != threading.current_thread().name
+
+
+def test_daemon_call_reraises_daemon_errors(project, running_daemon):
+    with pytest.raises(DatabricksApiError) as e:
+        daemon_call("echo", "fail")
+    assert e.value.is_not_found
+
+
+def test_daemon_call_runs_inline_when_environment_differs(project, running_daemon, monkeypatch):
+    # Given
+    _, calls = project
+    monkeypatch.setenv("BRANCH_NAME", "another-branch")
+
+    # When
+    daemon_call("echo")
+
+    # Then
+    assert calls[0][0] == threading.current_thread().name
+
+
+def test_daemon_call_runs_inline_with_stale_socket(project, tmp_path):
+    # Given
+    _, calls = project
+    (tmp_path / "daemon.sock").write_text("")
+
+    # When
+    result = daemon_call("echo", 1)
+
+    # Then
+    assert result == {"args": [1], "kwargs": {}}
+    assert len(calls) == 1
+
+
+def test_daemon_call_fails_without_running_inline_when_daemon_hangs(project, tmp_path, monkeypatch):
+    # Given
+    project_dir, calls = project
+    release = threading.Event()
+    warm = WarmDaemon(tmp_path / "daemon.sock", project_dir, operations={"echo": lambda *a, **k: release.wait(5)})
+    thread = threading.Thread(target=warm.serve, daemon=True)
+    thread.start()
+    while not daemon_running():
+        time.sleep(0.01)
+    monkeypatch.setattr(daemon_module, "DAEMON_RESPONSE_TIMEOUT", 0.2)
+
+    # When
+    with pytest.raises(DaemonError, match="didn't respond to echo"):
+        daemon_call("echo", 1)
+
+    # Then
+    assert calls == []
+    release.set()
+    warm.stop()
+    thread.join(5)
+
+
+def test_daemon_clears_caches_when_watched_files_change(project, running_daemon, monkeypatch):
+    # Given
+    project_dir, _ = project
+    cleared = []
+    monkeypatch.setattr(daemon_module, "clear_caches", lambda: cleared.append(True))
+    daemon_call("echo")
+
+    # When
+    pyproject = project_dir / "pyproject.toml"
+    os.utime(pyproject, ns=(pyproject.stat().st_atime_ns, pyproject.stat().st_mtime_ns + 10**9))
+    daemon_call("echo")
+    daemon_call("echo")
+
+    # Then
+    assert cleared == [True]
+
+
+def test_stop_daemon(project, running_daemon, tmp_path):
+    # When
+    stopped = stop_daemon()
+    for _ in range(100):
+        if not (tmp_path / "daemon.sock").exists():
+            break
+        time.sleep(0.01)
+
+    # Then
+    assert stopped
+    assert not daemon_running()
+    assert not stop_daemon()
+
+
+def test_daemon_exits_when_idle(project, tmp_path):
+    # Given
+    project_dir, _ = project
+    warm = WarmDaemon(tmp_path / "daemon.sock", project_dir, idle_timeout=0.05)
+
+    # When
+    thread = threading.Thread(target=warm.serve, daemon=True)
+    thread.start()
+    thread.join(5)
+
+    # Then
+    assert not thread.is_alive()
+    assert not (tmp_path / "daemon.sock").exists()
+
+
+def test_wheel_paths_operation(project):
+    # When
+    paths = daemon_call("wheel_paths", "main")
+
+    # Then
+    assert paths == {
+        "wheel_name": "demo-1.0.0-py3-none-any.whl",
+        "artifact_path": "dbfs:/FileStore/wheels/main/demo/",
+        "wheel_path": "dbfs:/FileStore/wheels/main/demo/demo-1.0.0-py3-none-any.whl",
+    }
@@ -1,11 +1,32 @@
 # Standard Library
+import json
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Third Party
+import pytest
+from invoke import Context, Result
 
 # Our Libraries
+from invoke_databricks_wheel_tasks.utils import databricks
+from invoke_databricks_wheel_tasks.utils.api import api_client
 from invoke_databricks_wheel_tasks.utils.databricks import (
+    RunStatusBatcher,
+    create_or_reset_job,
     default_dbfs_artifact_path,
     default_dbfs_wheel_path,
+    find_job_id,
+    job_id_cache,
+    list_jobs,
+    run_jobs_concurrently,
+    run_now,
+    submit_one_time_run,
+    upsert_job,
+    wait_for_run_status,
 )
+from invoke_databricks_wheel_tasks.utils.polling import AdaptivePoll
 
 
 def test_default_dbfs_artifact_path():
@@ -33,3 +54,427 @@ def test_default_dbfs_wheel_path():
 
     # Then
     assert result_pattern.match(result) is not None, f"Did not match {target_pattern} in {result}"
+
+
+def test_list_jobs_paginates(fake_databricks):
+    # Given
+    for i in range(30):
+        fake_databricks.add_job({"name": f"job-{i}"})
+
+    # When
+    jobs = list_jobs()
+
+    # Then
+    assert len(jobs) == 30
+    assert fake_databricks.calls("/jobs/list") == 2
+
+
+def test_create_or_reset_job(fake_databricks):
+    # Given
+    payload = {"name": "example"}
+
+    # When
+    created = create_or_reset_job(payload)
+    reset = create_or_reset_job({"name": "example", "max_concurrent_runs": 2}, job_id=created["job_id"])
+
+    # Then
+    assert reset == {}
+    assert fake_databricks.jobs[created["job_id"]]["settings"] == {"name": "example", "max_concurrent_runs": 2}
+
+
+def test_run_now_and_wait(fake_databricks, fake_clock):
+    # Given
+    job_id = fake_databricks.add_job({"name": "example"})
+    poll = AdaptivePoll(jitter=0, clock=fake_clock, sleep=fake_clock.sleep)
+
+    # When
+    run_id = run_now(str(job_id))
+    run = wait_for_run_status(Context(), None, run_id, poll=poll)
+
+    # Then
+    assert run["state"]["life_cycle_state"] == "TERMINATED"
+    assert fake_databricks.calls("/jobs/runs/get") == 3
+    # No sleep once the terminal state has been seen
+    assert fake_clock.sleeps == [1.0, 1.0]
+
+
+def test_submit_one_time_run_and_wait_without_creating_a_job(fake_databricks, fake_clock):
+    # Given
+    payload = {"run_name": "adhoc", "tasks": [{"task_key": "a", "existing_cluster_id": "1234"}]}
+    poll = AdaptivePoll(jitter=0, clock=fake_clock, sleep=fake_clock.sleep)
+
+    # When
+    run_id = submit_one_time_run(payload)
+    run = wait_for_run_status(Context(), None, run_id, poll=poll)
+
+    # Then
+    assert run["state"]["result_state"] == "SUCCESS"
+    assert fake_databricks.submits == [payload]
+    assert fake_databricks.jobs == {}
+    assert fake_databricks.calls("/jobs/list") + fake_databricks.calls("/jobs/create") == 0
+
+
+def test_submit_one_time_run_only_retries_with_an_idempotency_token(fake_databricks):
+    # Given
+    fake_databricks.failures["/jobs/runs/submit"] = 1
+
+    # When
+    with pytest.raises(Exception, match="TEMPORARILY_UNAVAILABLE"):
+        submit_one_time_run({"run_name": "adhoc"})
+    fake_databricks.failures["/jobs/runs/submit"] = 1
+    run_id = submit_one_time_run({"run_name": "adhoc", "idempotency_token": "ci-42"})
+
+    # Then
+    assert submit_one_time_run({"run_name": "adhoc", "idempotency_token": "ci-42"}) == run_id
+    assert len(fake_databricks.submits) == 1
+
+
+def test_wait_for_run_status_failure_state(fake_databricks, fake_clock):
+    # Given
+    run_id = fake_databricks.add_run(None, [{"life_cycle_state": "PENDING"}, {"life_cycle_state": "INTERNAL_ERROR"}])
+    poll = AdaptivePoll(jitter=0, clock=fake_clock, sleep=fake_clock.sleep)
+
+    # When
+    with pytest.raises(ValueError):
+        wait_for_run_status(Context(), None, run_id, poll=poll)
+
+    # Then
+    assert fake_clock.sleeps == [1.0]
+
+
+def test_list_jobs_falls_back_to_cli(monkeypatch, tmp_path):
+    # Given
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("DATABRICKS_HOST", raising=False)
+    monkeypatch.delenv("DATABRICKS_TOKEN", raising=False)
+    api_client.cache_clear()
+    commands = []
+
+    def fake_run(command, **kwargs):
+        commands.append(command)
+        return Result(stdout=json.dumps({"jobs": [{"job_id": 1, "settings": {"name": "example"}}]}))
+
+    monkeypatch.setattr(databricks.invoke, "run", fake_run)
+
+    # When
+    jobs = list_jobs("myprofile")
+
+    # Then
+    assert jobs == {"example": 1}
+    assert commands == ["databricks --profile myprofile jobs list --output JSON"]
+    api_client.cache_clear()
+
+
+def test_cli_fallback_retries_throttled_commands(monkeypatch, tmp_path):
+    # Given
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("DATABRICKS_HOST", raising=False)
+    monkeypatch.delenv("DATABRICKS_TOKEN", raising=False)
+    api_client.cache_clear()
+    databricks.request_scheduler.cache_clear()
+    scheduler = databricks.request_scheduler("cli:DEFAULT")
+    scheduler.sleep, scheduler.jitter = (lambda _: None), (lambda low, high: low)
+    outputs = [
+        Result(stderr="Error: HTTPError: 429 Client Error: Too Many Requests for url", exited=1),
+        Result(stdout="Error: 503 Server Error: Service Unavailable for url"),
+        Result(stdout=json.dumps({"jobs": [{"job_id": 1, "settings": {"name": "example"}}]})),
+    ]
+    monkeypatch.setattr(databricks.invoke, "run", lambda command, **kwargs: outputs.pop(0))
+
+    # When
+    jobs = list_jobs()
+
+    # Then
+    assert jobs == {"example": 1}
+    assert databricks.cli_endpoint("runs get --run-id 1") == ("GET", "/jobs/runs/get")
+    assert databricks.cli_endpoint("jobs reset --job-id 1") == ("POST", "/jobs/reset")
+    api_client.cache_clear()
+    databricks.request_scheduler.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "output,status",
+    [
+        ("Error: HTTPError: 429 Client Error: Too Many Requests for url: https://x/api/2.0/jobs/list", 429),
+        ('{"error_code": "REQUEST_LIMIT_EXCEEDED", "message": "Too Many Requests"}', 429),
+        ("HTTPError: 503 Server Error: Service Unavailable for url: https://x/api/2.0/jobs/get", 503),
+        ("Error: Run 4291 does not exist.", None),
+        ("Error: File size 1429 exceeds the limit", None),
+        ("Error: Job 5023 Server is not here", None),
+    ],
+)
+def test_cli_error_status(output, status):
+    assert databricks.cli_error_status(output) == status
+
+
+def test_run_jobs_concurrently_waits_for_all(fake_databricks, fast_poll):
+    # Given
+    job_ids = [str(fake_databricks.add_job({"name": f"job-{i}"})) for i in range(5)]
+    failing = int(job_ids[0])
+    fake_databricks.job_run_scripts[failing] = [{"life_cycle_state": "TERMINATED", "result_state": "FAILED"}]
+    reported = []
+
+    # When
+    results = run_jobs_concurrently(job_ids, max_workers=3, poll_factory=fast_poll, on_result=reported.append)
+
+    # Then
+    assert results == reported
+    assert sorted(r.job_id for r in results) == sorted(job_ids)
+    assert [r.job_id for r in results if not r.succeeded] == [str(failing)]
+    assert fake_databricks.calls("/jobs/run-now") == 5
+
+
+def test_run_jobs_concurrently_respects_concurrency_limit(fake_databricks, fast_poll):
+    # Given
+    job_ids = [str(fake_databricks.add_job({"name": f"job-{i}"})) for i in range(3)]
+
+    # When
+    results = run_jobs_concurrently(job_ids, max_workers=1, poll_factory=fast_poll)
+
+    # Then
+    assert all(r.succeeded for r in results)
+    endpoints = [e for _, e in fake_databricks.requests]
+    # Each run is triggered only after the previous one has been seen to terminate.
+    assert endpoints == ["/jobs/run-now", "/jobs/runs/get", "/jobs/runs/get", "/jobs/runs/get"] * 3
+
+
+def test_run_jobs_concurrently_fail_fast(fake_databricks, fast_poll):
+    # Given
+    failing = fake_databricks.add_job({"name": "fails"})
+    endless = fake_databricks.add_job({"name": "endless"})
+    never_triggered = fake_databricks.add_job({"name": "queued"})
+    fake_databricks.job_run_scripts[failing] = [{"life_cycle_state": "INTERNAL_ERROR"}]
+    fake_databricks.job_run_scripts[endless] = [{"life_cycle_state": "RUNNING"}]
+
+    # When
+    results = run_jobs_concurrently(
+        [str(failing), str(endless), str(never_triggered)], max_workers=2, fail_fast=True, poll_factory=fast_poll
+    )
+
+    # Then
+    by_job = {r.job_id: r for r in results}
+    assert not any(r.succeeded for r in results)
+    assert "INTERNAL_ERROR" in by_job[str(failing)].error
+    assert by_job[str(endless)].state["life_cycle_state"] == "RUNNING"
+    assert fake_databricks.calls("/jobs/run-now") <= 2
+
+
+def test_run_status_batcher_polls_many_runs_with_few_requests(fake_databricks):
+    # Given
+    job_ids = [fake_databricks.add_job({"name": f"job-{i}"}) for i in range(10)]
+    batcher = RunStatusBatcher()
+    for i in range(100):
+        batcher.track(fake_databricks.add_run(job_ids[i % 10]), str(job_ids[i % 10]))
+
+    # When
+    finished = []
+    polls = 0
+    while batcher.tracked:
+        finished.extend(batcher.poll())
+        polls += 1
+
+    # Then
+    assert len(finished) == 100
+    assert all(r["state"]["result_state"] == "SUCCESS" for r in finished)
+    # Only runs that dropped out of the active listing are fetched individually
+    assert fake_databricks.calls("/jobs/runs/get") == 100
+    # 100 active runs fit in 4 pages of a workspace wide listing
+    assert fake_databricks.calls("/jobs/runs/list") <= polls * 4
+
+
+def test_run_status_batcher_scopes_listing_to_few_jobs(fake_databricks):
+    # Given
+    job_id = fake_databricks.add_job({"name": "example"})
+    other_job_id = fake_databricks.add_job({"name": "other"})
+    other_run_id = fake_databricks.add_run(other_job_id)
+    batcher = RunStatusBatcher()
+    run_id = fake_databricks.add_run(job_id)
+    batcher.track(run_id, str(job_id))
+
+    # When
+    polls = [batcher.poll() for _ in range(3)]
+
+    # Then
+    assert [[r["run_id"] for r in finished] for finished in polls] == [[], [], [run_id]]
+    assert batcher.tracked == {}
+    assert fake_databricks.calls("/jobs/runs/list") == 3
+    assert fake_databricks.calls("/jobs/runs/get") == 1
+    # Listing was scoped to the tracked job so the other job's run was never visited
+    assert len(fake_databricks.run_states[other_run_id]) == 3
+
+
+def test_run_jobs_batch_poll(fake_databricks, fast_poll):
+    # Given
+    job_ids = [str(fake_databricks.add_job({"name": f"job-{i}"})) for i in range(6)]
+    fake_databricks.job_run_scripts[int(job_ids[0])] = [{"life_cycle_state": "INTERNAL_ERROR"}]
+
+    # When
+    results = run_jobs_concurrently(job_ids, max_workers=4, poll_factory=fast_poll, batch_poll=True)
+
+    # Then
+    assert sorted(r.job_id for r in results) == sorted(job_ids)
+    assert [r.job_id for r in results if not r.succeeded] == [job_ids[0]]
+    assert fake_databricks.calls("/jobs/runs/get") == 6
+
+
+def test_run_jobs_batch_poll_fail_fast(fake_databricks, fast_poll):
+    # Given
+    failing = fake_databricks.add_job({"name": "fails"})
+    endless = fake_databricks.add_job({"name": "endless"})
+    queued = fake_databricks.add_job({"name": "queued"})
+    fake_databricks.job_run_scripts[failing] = [{"life_cycle_state": "INTERNAL_ERROR"}]
+    fake_databricks.job_run_scripts[endless] = [{"life_cycle_state": "RUNNING"}]
+
+    # When
+    results = run_jobs_concurrently(
+        [str(failing), str(endless), str(queued)],
+        max_workers=2,
+        fail_fast=True,
+        poll_factory=fast_poll,
+        batch_poll=True,
+    )
+
+    # Then
+    by_job = {r.job_id: r for r in results}
+    assert "INTERNAL_ERROR" in by_job[str(failing)].error
+    assert by_job[str(endless)].state["life_cycle_state"] == "RUNNING"
+    assert by_job[str(queued)].run_id is None
+    assert fake_databricks.calls("/jobs/run-now") == 2
+
+
+def test_find_job_id_filters_by_name(fake_databricks):
+    # Given
+    for i in range(60):
+        fake_databricks.add_job({"name": f"job-{i}"})
+
+    # When
+    job_id = find_job_id("job-42")
+    missing = find_job_id("missing")
+
+    # Then
+    assert fake_databricks.jobs[job_id]["settings"]["name"] == "job-42"
+    assert missing is None
+    assert fake_databricks.calls("/jobs/list") == 2
+
+
+def test_find_job_id_stops_paging_once_found(fake_databricks, monkeypatch):
+    # Given
+    monkeypatch.setenv("DATABRICKS_JOBS_API_VERSION", "2.0")
+    api_client.cache_clear()
+    for i in range(60):
+        fake_databricks.add_job({"name": f"job-{i}"})
+
+    # When
+    job_id = find_job_id("job-3")
+
+    # Then
+    assert fake_databricks.jobs[job_id]["settings"]["name"] == "job-3"
+    assert fake_databricks.calls("/jobs/list") == 1
+
+
+def test_find_job_id_uses_cache(fake_databricks):
+    # Given
+    job_id = fake_databricks.add_job({"name": "example"})
+    find_job_id("example", cache=job_id_cache())
+
+    # When
+    cached_job_id = find_job_id("example", cache=job_id_cache())
+
+    # Then
+    assert cached_job_id == job_id
+    assert fake_databricks.calls("/jobs/list") == 1
+
+
+def test_upsert_job_recovers_from_stale_cache(fake_databricks):
+    # Given
+    cache = job_id_cache()
+    cache.set("example", 999)
+    job_id = fake_databricks.add_job({"name": "example"})
+
+    # When
+    result = upsert_job(
+        {"name": "example", "max_concurrent_runs": 2}, job_id=find_job_id("example", cache=cache), cache=cache
+    )
+
+    # Then
+    assert result.action == "updated"
+    assert result.job_id == job_id
+    assert fake_databricks.jobs[job_id]["settings"]["max_concurrent_runs"] == 2
+    assert cache.get("example") == job_id
+
+
+def test_upsert_job_creates_deleted_job(fake_databricks):
+    # Given
+    cache = job_id_cache()
+    cache.set("example", 999)
+
+    # When
+    result = upsert_job({"name": "example"}, job_id=find_job_id("example", cache=cache), cache=cache)
+
+    # Then
+    assert result.action == "created"
+    assert cache.get("example") == result.job_id
+    assert fake_databricks.jobs[result.job_id]["settings"] == {"name": "example"}
+
+
+def test_upsert_job_skips_unchanged_settings(fake_databricks):
+    # Given
+    deployed = {"name": "example", "format": "MULTI_TASK", "timeout_seconds": 0, "tasks": [{"task_key": "a"}]}
+    job_id = fake_databricks.add_job(deployed)
+
+    # When
+    unchanged = upsert_job({"tasks": [{"task_key": "a", "timeout_seconds": 0}], "name": "example"}, job_id=job_id)
+    forced = upsert_job({"name": "example", "tasks": [{"task_key": "a"}]}, job_id=job_id, force=True)
+    updated = upsert_job({"name": "example", "tasks": [{"task_key": "b"}]}, job_id=job_id)
+
+    # Then
+    assert [unchanged.action, forced.action, updated.action] == ["unchanged", "updated", "updated"]
+    assert fake_databricks.calls("/jobs/reset") == 2
+
+
+def test_create_or_reset_job_concurrently(fake_databricks):
+    # Given
+    job_ids = [fake_databricks.add_job({"name": f"job-{i}"}) for i in range(25)]
+    payloads = [({"name": f"job-{i}", "max_concurrent_runs": i}, job_ids[i] if i < 25 else None) for i in range(50)]
+
+    # When
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda p: create_or_reset_job(p[0], job_id=p[1]), payloads))
+
+    # Then
+    deployed = {j["settings"]["name"]: j["settings"] for j in fake_databricks.jobs.values()}
+    assert deployed == {p["name"]: p for p, _ in payloads}
+
+
+def test_create_or_reset_job_cli_fallback_concurrently(monkeypatch, tmp_path):
+    # Given
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("DATABRICKS_HOST", raising=False)
+    monkeypatch.delenv("DATABRICKS_TOKEN", raising=False)
+    monkeypatch.chdir(tmp_path)
+    api_client.cache_clear()
+    seen = {}
+    json_files = []
+
+    def fake_run(command, **kwargs):
+        json_file = command.split("--json-file ")[1]
+        json_files.append(json_file)
+        time.sleep(0.01)  # Give other threads a chance to clobber the payload
+        payload = json.loads(Path(json_file).read_text())
+        seen[payload["name"]] = payload
+        return Result(stdout=json.dumps({"job_id": payload["max_concurrent_runs"]}))
+
+    monkeypatch.setattr(databricks.invoke, "run", fake_run)
+    payloads = [{"name": f"job-{i}", "max_concurrent_runs": i} for i in range(20)]
+
+    # When
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        results = list(executor.map(create_or_reset_job, payloads))
+
+    # Then
+    assert [r["job_id"] for r in results] == list(range(20))
+    assert seen == {p["name"]: p for p in payloads}
+    assert len(set(json_files)) == 20
+    assert not any(Path(f).exists() for f in json_files)
+    assert list(tmp_path.iterdir()) == []
+    api_client.cache_clear()
@@ -0,0 +1,148 @@
+# Standard Library
+import hashlib
+
+# Third Party
+import pytest
+
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils.api import DatabricksApiError, api_client
+from invoke_databricks_wheel_tasks.utils.dbfs import (
+    BLOCK_SIZE,
+    dbfs_delete,
+    dbfs_ls,
+    dbfs_upload,
+)
+from invoke_databricks_wheel_tasks.utils.ratelimit import REQUEST_RETRIES
+
+TARGET = "dbfs:/FileStore/wheels/main/project/"
+
+
+def test_dbfs_upload_directory(fake_databricks, tmp_path):
+    # Given
+    (tmp_path / "small.whl").write_bytes(b"wheel")
+    (tmp_path / "large.whl").write_bytes(b"x" * (BLOCK_SIZE * 2 + 1))
+    client = api_client()
+
+    # When
+    uploaded = dbfs_upload(client, str(tmp_path), TARGET)
+
+    # Then
+    assert [(f.target, f.skipped) for f in uploaded] == [
+        ("dbfs:/FileStore/wheels/main/project/large.whl", False),
+        ("dbfs:/FileStore/wheels/main/project/small.whl", False),
+    ]
+    assert fake_databricks.dbfs["/FileStore/wheels/main/project/small.whl"] == b"wheel"
+    assert len(fake_databricks.dbfs["/FileStore/wheels/main/project/large.whl"]) == BLOCK_SIZE * 2 + 1
+    assert fake_databricks.dbfs["/FileStore/wheels/main/project/small.whl.sha256"] == (
+        f"{hashlib.sha256(b'wheel').hexdigest()}  small.whl\n".encode()
+    )
+    assert [f["path"] for f in dbfs_ls(client, TARGET)] == [
+        "/FileStore/wheels/main/project/large.whl",
+        "/FileStore/wheels/main/project/large.whl.sha256",
+        "/FileStore/wheels/main/project/small.whl",
+        "/FileStore/wheels/main/project/small.whl.sha256",
+    ]
+
+
+def test_dbfs_upload_first_upload_deletes_missing_sidecar(fake_databricks, tmp_path):
+    # Given
+    (tmp_path / "new.whl").write_bytes(b"wheel")
+    client = api_client()
+
+    # When
+    uploaded = dbfs_upload(client, str(tmp_path), TARGET)
+
+    # Then
+    assert [f.skipped for f in uploaded] == [False]
+    assert fake_databricks.calls("/dbfs/delete") == 1
+    with pytest.raises(DatabricksApiError, match="RESOURCE_DOES_NOT_EXIST"):
+        dbfs_delete(client, TARGET + "missing.whl", missing_ok=False)
+
+
+def test_dbfs_upload_skips_unchanged_files(fake_databricks, tmp_path):
+    # Given
+    (tmp_path / "small.whl").write_bytes(b"wheel")
+    (tmp_path / "large.whl").write_bytes(b"x" * (BLOCK_SIZE * 2 + 1))
+    client = api_client()
+    dbfs_upload(client, str(tmp_path), TARGET)
+    blocks, listings = fake_databricks.calls("/dbfs/add-block"), fake_databricks.calls("/dbfs/list")
+
+    # When
+    (tmp_path / "small.whl").write_bytes(b"wheal")
+    uploaded = dbfs_upload(client, str(tmp_path), TARGET)
+
+    # Then
+    assert [(f.source.name, f.skipped) for f in uploaded] == [("large.whl", True), ("small.whl", False)]
+    assert fake_databricks.dbfs["/FileStore/wheels/main/project/small.whl"] == b"wheal"
+    assert fake_databricks.calls("/dbfs/add-block") == blocks + 2  # small.whl and its new hash
+    assert fake_databricks.calls("/dbfs/list") == listings + 1
+
+
+def test_dbfs_upload_without_skip_unchanged_always_uploads(fake_databricks, tmp_path):
+    # Given
+    (tmp_path / "small.whl").write_bytes(b"wheel")
+    client = api_client()
+    dbfs_upload(client, str(tmp_path), TARGET)
+
+    # When
+    uploaded = dbfs_upload(client, str(tmp_path), TARGET, skip_unchanged=False)
+
+    # Then
+    assert [f.skipped for f in uploaded] == [False]
+    assert fake_databricks.calls("/dbfs/add-block") == 4
+
+
+def test_dbfs_upload_retries_transient_block_failures(fake_databricks, tmp_path):
+    # Given
+    (tmp_path / "large.whl").write_bytes(b"x" * (BLOCK_SIZE * 3))
+    fake_databricks.failures["/dbfs/add-block"] = 2
+    sleeps = []
+
+    # When
+    uploaded = dbfs_upload(api_client(), str(tmp_path), TARGET, sleep=sleeps.append)
+
+    # Then
+    assert len(fake_databricks.dbfs["/FileStore/wheels/main/project/large.whl"]) == BLOCK_SIZE * 3
+    assert fake_databricks.calls("/dbfs/create") == 2  # no restart, just the artifact and its hash
+    assert sleeps == [1.0, 2.0]
+    assert uploaded[0].seconds > 0 and uploaded[0].throughput > 0
+
+
+def test_dbfs_upload_gives_up_after_retries(fake_databricks, tmp_path):
+    # Given
+    (tmp_path / "small.whl").write_bytes(b"wheel")
+    fake_databricks.failures["/dbfs/add-block"] = 10
+
+    # When
+    with pytest.raises(DatabricksApiError, match="TEMPORARILY_UNAVAILABLE"):
+        dbfs_upload(api_client(), str(tmp_path), TARGET, retries=2, sleep=lambda _: None)
+
+    # Then
+    assert fake_databricks.calls("/dbfs/add-block") == 3
+
+
+def test_dbfs_upload_leaves_throttling_to_the_scheduler(fake_databricks, tmp_path):
+    # Given
+    (tmp_path / "small.whl").write_bytes(b"wheel")
+    fake_databricks.throttles["/dbfs/add-block"] = 100
+
+    # When
+    with pytest.raises(DatabricksApiError, match="REQUEST_LIMIT_EXCEEDED"):
+        dbfs_upload(api_client(), str(tmp_path), TARGET, sleep=lambda _: None)
+
+    # Then
+    assert fake_databricks.calls("/dbfs/add-block") == 1 + REQUEST_RETRIES
+
+
+def test_dbfs_upload_many_files_concurrently(fake_databricks, tmp_path):
+    # Given
+    for i in range(10):
+        (tmp_path / f"dep{i}.whl").write_bytes(bytes([i]) * (i + 1))
+
+    # When
+    uploaded = dbfs_upload(api_client(), str(tmp_path), TARGET, max_workers=4)
+
+    # Then
+    assert [f.source.name for f in uploaded] == [f"dep{i}.whl" for i in range(10)]
+    for i in range(10):
+        assert fake_databricks.dbfs[f"/FileStore/wheels/main/project/dep{i}.whl"] == bytes([i]) * (i + 1)
@@ -0,0 +1,175 @@
+# Standard Library
+import json
+import shutil
+from pathlib import Path
+
+# Third Party
+import pytest
+
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils.databricks import job_id_cache
+from invoke_databricks_wheel_tasks.utils.deploy import (
+    DeployManifest,
+    JobSpec,
+    deploy_jobs,
+    deploy_report,
+    job_specs_from_glob,
+    job_specs_from_manifest,
+    summarise_deploys,
+)
+from invoke_databricks_wheel_tasks.utils.jobs import (
+    CLUSTER_START_SECONDS,
+    ClusterOptions,
+)
+
+FIXTURES = Path("./tests/test_utils/fixtures/deploy")
+ENV = {"wheel": "dbfs:/FileStore/wheels/main/project/project-0.1.0-py3-none-any.whl"}
+
+
+def test_job_specs_from_manifest_and_glob_agree():
+    # Given
+    manifest = str(FIXTURES / "manifest.yml")
+
+    # When
+    from_manifest = job_specs_from_manifest(manifest)
+    from_glob = job_specs_from_glob(str(FIXTURES / "template.json.j2"), str(FIXTURES / "jobs" / "*.yml"))
+
+    # Then
+    assert sorted(from_manifest) == sorted(from_glob)
+    assert len(from_glob) == 3
+
+
+def test_deploy_jobs_resolves_job_ids_with_one_listing(fake_databricks):
+    # Given
+    existing = fake_databricks.add_job({"name": "deploy-silver"})
+    for i in range(30):
+        fake_databricks.add_job({"name": f"unrelated-{i}"})
+    specs = job_specs_from_manifest(str(FIXTURES / "manifest.yml"))
+
+    # When
+    results = deploy_jobs(specs, ENV, cache=job_id_cache(), max_workers=3)
+
+    # Then
+    assert [r.name for r in results] == ["deploy-bronze", "deploy-silver", "deploy-gold"]
+    assert [r.action for r in results] == ["created", "updated", "created"]
+    assert results[1].job_id == existing
+    assert summarise_deploys(results) == {"created": 2, "updated": 1, "unchanged": 0, "skipped": 0, "failed": 0}
+    # One paginated listing of the 31 existing jobs
+    assert fake_databricks.calls("/jobs/list") == 2
+
+
+def test_deploy_jobs_again_uses_cache_and_skips_unchanged(fake_databricks):
+    # Given
+    specs = job_specs_from_manifest(str(FIXTURES / "manifest.yml"))
+    deploy_jobs(specs, ENV, cache=job_id_cache())
+    listings = fake_databricks.calls("/jobs/list")
+
+    # When
+    results = deploy_jobs(specs, ENV, cache=job_id_cache())
+
+    # Then
+    assert [r.action for r in results] == ["unchanged"] * 3
+    assert fake_databricks.calls("/jobs/list") == listings
+    assert fake_databricks.calls("/jobs/reset") == 0
+
+
+def test_deploy_jobs_captures_failures(fake_databricks, tmp_path):
+    # Given
+    broken_template = tmp_path / "broken.json.j2"
+    broken_template.write_text('{"name": "{{ name }}", ')
+    specs = [
+        JobSpec(str(broken_template), str(FIXTURES / "jobs" / "bronze.yml")),
+        JobSpec(str(FIXTURES / "template.json.j2"), str(FIXTURES / "jobs" / "gold.yml")),
+    ]
+
+    # When
+    results = deploy_jobs(specs, ENV)
+    report = deploy_report(results)
+
+    # Then
+    assert [r.action for r in results] == ["failed", "created"]
+    assert report["summary"]["failed"] == 1
+    assert "error" in report["jobs"][0]
+    assert "error" not in report["jobs"][1]
+
+
+def test_deploy_jobs_rejects_duplicate_names_before_deploying(fake_databricks, tmp_path):
+    # Given
+    for name in ["first", "second"]:
+        (tmp_path / f"{name}.yml").write_text("name: same\n")
+    specs = [JobSpec(str(FIXTURES / "template.json.j2"), str(tmp_path / f"{n}.yml")) for n in ["first", "second"]]
+
+    # When / Then
+    with pytest.raises(ValueError, match="same"):
+        deploy_jobs(specs, ENV)
+    assert fake_databricks.calls("/jobs/create") == 0
+
+
+def test_deploy_jobs_with_manifest_skips_jobs_with_unchanged_inputs(fake_databricks, tmp_path):
+    # Given
+    shutil.copytree(FIXTURES, tmp_path / "deploy")
+    specs = job_specs_from_manifest(str(tmp_path / "deploy" / "manifest.yml"))
+    manifest_path = str(tmp_path / "manifest.json")
+    deploy_jobs(specs, ENV, manifest=DeployManifest(manifest_path), wheel_sha256="abc")
+    requests = len(fake_databricks.requests)
+
+    # When
+    skipped = deploy_jobs(specs, ENV, manifest=DeployManifest(manifest_path), wheel_sha256="abc")
+    after_skip = len(fake_databricks.requests)
+    (tmp_path / "deploy" / "jobs" / "gold.yml").write_text(
+        "name: deploy-gold\nwheel: {{ wheel }}\npackage_name: gold\nmax_concurrent_runs: 2\n"
+    )
+    changed = deploy_jobs(specs, ENV, manifest=DeployManifest(manifest_path), wheel_sha256="abc")
+    new_wheel = deploy_jobs(specs, ENV, manifest=DeployManifest(manifest_path), wheel_sha256="def")
+
+    # Then
+    assert [r.action for r in skipped] == ["skipped"] * 3
+    assert [r.job_id for r in skipped] == [r.job_id for r in changed]
+    assert after_skip == requests
+    assert [r.action for r in changed] == ["skipped", "skipped", "updated"]
+    assert [r.action for r in new_wheel] == ["unchanged"] * 3
+
+
+def test_deploy_manifest_round_trips_through_dbfs(fake_databricks):
+    # Given
+    manifest = DeployManifest("dbfs:/deploy/manifest.json")
+    manifest.record("deploy-gold", "abc", 42)
+
+    # When
+    manifest.save()
+    reloaded = DeployManifest("dbfs:/deploy/manifest.json")
+
+    # Then
+    assert reloaded.fingerprint("deploy-gold") == "abc"
+    assert reloaded.job_id("deploy-gold") == 42
+    assert DeployManifest("dbfs:/deploy/missing.json").fingerprint("deploy-gold") is None
+
+
+def test_deploy_jobs_optimises_clusters_and_reports_savings(fake_databricks, tmp_path):
+    # Given
+    template = tmp_path / "clusters.json.j2"
+    template.write_text(
+        json.dumps(
+            {
+                "name": "{{ name }}",
+                "tasks": [
+                    {"task_key": key, "new_cluster": {"spark_version": "13.3.x-scala2.12", "num_workers": 2}}
+                    for key in ["a", "b", "c"]
+                ],
+            }
+        )
+    )
+    spec = JobSpec(str(template), str(FIXTURES / "jobs" / "gold.yml"))
+    manifest_path = str(tmp_path / "manifest.json")
+    deploy_jobs([spec], ENV, manifest=DeployManifest(manifest_path))
+
+    # When
+    results = deploy_jobs([spec], ENV, manifest=DeployManifest(manifest_path), cluster_options=ClusterOptions(True))
+    report = deploy_report(results)
+
+    # Then
+    [settings] = [job["settings"] for job in fake_databricks.jobs.values()]
+    assert [t["job_cluster_key"] for t in settings["tasks"]] == ["shared_cluster_1"] * 3
+    assert [r.action for r in results] == ["updated"]
+    assert report["estimated_cluster_start_seconds_saved"] == 2 * CLUSTER_START_SECONDS
+    assert report["jobs"][0]["cluster_savings"]["cluster_starts_after"] == 1
@@ -1,5 +1,18 @@
+# Standard Library
+import subprocess
+
+# Third Party
+import pytest
+
 # Our Libraries
-from invoke_databricks_wheel_tasks.utils.git import git_current_branch
+from invoke_databricks_wheel_tasks.utils.git import (
+    CI_BRANCH_VARIABLES,
+    git_branches,
+    git_current_branch,
+    git_head_name,
+)
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
 
 
 def test_git_current_branch():
@@ -13,3 +26,123 @@ def test_git_current_branch():
     assert branch_name != ""
     assert branch_name != "HEAD"
     assert len(branch_name) > 0
+
+
+def git(cwd, *args):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args], cwd=cwd, check=True)
+
+
+def test_git_branches_lists_every_remote_branch_from_a_shallow_clone(tmp_path, monkeypatch):
+    # Given
+    origin = tmp_path / "origin"
+    origin.mkdir()
+    git(origin, "init", "-q", "-b", "main")
+    git(origin, "commit", "-q", "--allow-empty", "-m", "initial")
+    for branch in ["feature/a", "release/1.0"]:
+        git(origin, "branch", branch)
+    git(tmp_path, "clone", "-q", "--depth", "1", "--single-branch", f"file://{origin}", "clone")
+    git(tmp_path / "clone", "checkout", "-q", "-b", "local-only")
+    monkeypatch.chdir(tmp_path / "clone")
+
+    # When
+    branches = git_branches()
+
+    # Then
+    assert branches == ["feature/a", "local-only", "main", "release/1.0"]
+
+
+def test_git_branches_refuses_an_unlistable_remote(tmp_path, monkeypatch):
+    # Given
+    git(tmp_path, "init", "-q")
+    monkeypatch.chdir(tmp_path)
+
+    # When / Then
+    with pytest.raises(ValueError, match="origin"):
+        git_branches()
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    for variable in CI_BRANCH_VARIABLES + ["GIT_DIR"]:
+        monkeypatch.delenv(variable, raising=False)
+    (tmp_path / ".git").mkdir()
+    return tmp_path
+
+
+def test_git_head_name_branch(repo):
+    # Given
+    (repo / ".git" / "HEAD").write_text("ref: refs/heads/feature/fast-git\n")
+    (repo / "src").mkdir()
+
+    # When
+    branch_name = git_head_name(repo / "src")
+
+    # Then
+    assert branch_name == "feature/fast-git"
+
+
+def test_git_head_name_detached(repo):
+    # Given
+    (repo / ".git" / "HEAD").write_text(f"{SHA}\n")
+
+    # When
+    branch_name = git_head_name(repo)
+
+    # Then
+    assert branch_name is None
+
+
+def test_git_head_name_worktree(repo, tmp_path):
+    # Given
+    gitdir = repo / ".git" / "worktrees" / "wt"
+    gitdir.mkdir(parents=True)
+    (gitdir / "HEAD").write_text("ref: refs/heads/feature/worktree\n")
+    worktree = tmp_path / "worktree"
+    worktree.mkdir()
+    (worktree / ".git").write_text(f"gitdir: {gitdir}\n")
+
+    # When
+    branch_name = git_head_name(worktree)
+
+    # Then
+    assert branch_name == "feature/worktree"
+
+
+def test_git_current_branch_detached_matches_git_with_global_abbrev(tmp_path, monkeypatch):
+    # Given
+    for variable in CI_BRANCH_VARIABLES + ["GIT_DIR", "XDG_CONFIG_HOME"]:
+        monkeypatch.delenv(variable, raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    (tmp_path / ".gitconfig").write_text("[core]\n\tabbrev = 12\n")
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q")
+    git(repo, "commit", "-q", "--allow-empty", "-m", "initial")
+    git(repo, "checkout", "-q", "--detach")
+    monkeypatch.chdir(repo)
+    expected = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    git_current_branch.cache_clear()
+
+    # When
+    branch_name = git_current_branch()
+
+    # Then
+    git_current_branch.cache_clear()
+    assert len(branch_name) == 12
+    assert branch_name == expected
+
+
+@pytest.mark.parametrize("variable", CI_BRANCH_VARIABLES)
+def test_git_current_branch_from_ci_environment(monkeypatch, variable):
+    # Given
+    for v in CI_BRANCH_VARIABLES:
+        monkeypatch.delenv(v, raising=False)
+    monkeypatch.setenv(variable, "ci-branch")
+    git_current_branch.cache_clear()
+
+    # When
+    branch_name = git_current_branch()
+
+    # Then
+    assert branch_name == "ci-branch"
+    git_current_branch.cache_clear()
@@ -0,0 +1,174 @@
+# Third Party
+import pytest
+
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils.jobs import (
+    CLUSTER_START_SECONDS,
+    POOLED_CLUSTER_START_SECONDS,
+    ClusterOptions,
+    ClusterSavings,
+    canonical_job_settings,
+    cluster_options,
+    job_settings_changed,
+    optimise_clusters,
+    run_submit_payload,
+)
+
+
+class TestJobSettingsChanged:
+
+    # Parametrized Testing Scenarios
+    job_settings_changed_test_cases = {
+        "identical": ({"name": "a"}, {"name": "a"}, False),
+        "key-order": ({"name": "a", "max_concurrent_runs": 2}, {"max_concurrent_runs": 2, "name": "a"}, False),
+        "defaulted-fields": (
+            {"name": "a"},
+            {"name": "a", "timeout_seconds": 0, "email_notifications": {}, "format": "MULTI_TASK"},
+            False,
+        ),
+        "task-order": (
+            {"name": "a", "tasks": [{"task_key": "x"}, {"task_key": "y"}]},
+            {"name": "a", "tasks": [{"task_key": "y"}, {"task_key": "x", "run_if": "ALL_SUCCESS"}]},
+            False,
+        ),
+        "changed-value": ({"name": "a", "max_concurrent_runs": 2}, {"name": "a"}, True),
+        "removed-field": ({"name": "a"}, {"name": "a", "schedule": {"quartz_cron_expression": "0 0 * * * ?"}}, True),
+        "library-order": (
+            {"name": "a", "libraries": [{"whl": "x"}, {"whl": "y"}]},
+            {"name": "a", "libraries": [{"whl": "y"}, {"whl": "x"}]},
+            True,
+        ),
+    }
+
+    @pytest.mark.parametrize(
+        "local,remote,expectation",
+        job_settings_changed_test_cases.values(),
+        ids=job_settings_changed_test_cases.keys(),
+    )
+    def test_job_settings_changed(self, local, remote, expectation):
+        # Given
+        # local, remote
+
+        # When
+        result = job_settings_changed(local, remote)
+
+        # Then
+        assert result == expectation
+
+
+def test_canonical_job_settings_drops_empty_and_default_values():
+    # Given
+    settings = {"name": "a", "email_notifications": {"no_alert_for_skipped_runs": False}, "tags": {}, "x": None}
+
+    # When
+    canonical = canonical_job_settings(settings)
+
+    # Then
+    assert canonical == {"name": "a"}
+
+
+def test_run_submit_payload_drops_job_settings_and_inlines_job_clusters():
+    # Given
+    cluster = {"spark_version": "13.3.x-scala2.12", "num_workers": 2}
+    settings = {
+        "name": "nightly",
+        "schedule": {"quartz_cron_expression": "0 0 * * * ?"},
+        "max_concurrent_runs": 1,
+        "job_clusters": [{"job_cluster_key": "shared", "new_cluster": cluster}],
+        "tasks": [
+            {"task_key": "a", "job_cluster_key": "shared"},
+            {"task_key": "b", "existing_cluster_id": "1234"},
+        ],
+    }
+
+    # When
+    payload = run_submit_payload(settings, idempotency_token="ci-42")
+
+    # Then
+    assert payload == {
+        "run_name": "nightly",
+        "idempotency_token": "ci-42",
+        "tasks": [
+            {"task_key": "a", "new_cluster": cluster},
+            {"task_key": "b", "existing_cluster_id": "1234"},
+        ],
+    }
+    assert settings["tasks"][0] == {"task_key": "a", "job_cluster_key": "shared"}
+
+
+def test_run_submit_payload_rejects_undefined_job_cluster():
+    # Given
+    settings = {"name": "nightly", "tasks": [{"task_key": "a", "job_cluster_key": "missing"}]}
+
+    # When / Then
+    with pytest.raises(ValueError, match="missing"):
+        run_submit_payload(settings, run_name="adhoc")
+
+
+def cluster(node_type_id="i3.xlarge", **fields):
+    return {"spark_version": "13.3.x-scala2.12", "node_type_id": node_type_id, "num_workers": 2, **fields}
+
+
+def test_optimise_clusters_shares_identical_task_clusters():
+    # Given
+    settings = {
+        "name": "etl",
+        "job_clusters": [{"job_cluster_key": "big", "new_cluster": cluster("i3.4xlarge")}],
+        "tasks": [
+            {"task_key": "a", "new_cluster": cluster()},
+            {"task_key": "b", "new_cluster": cluster(spark_conf={})},
+            {"task_key": "c", "new_cluster": cluster("i3.4xlarge")},
+            {"task_key": "d", "new_cluster": cluster("m5.large")},
+            {"task_key": "e", "existing_cluster_id": "1234"},
+        ],
+    }
+
+    # When
+    optimised, savings = optimise_clusters(settings, ClusterOptions(share_clusters=True))
+
+    # Then
+    assert [t.get("job_cluster_key") for t in optimised["tasks"]] == [
+        "shared_cluster_1",
+        "shared_cluster_1",
+        "big",
+        None,
+        None,
+    ]
+    assert optimised["tasks"][3] == {"task_key": "d", "new_cluster": cluster("m5.large")}
+    assert optimised["job_clusters"][1] == {"job_cluster_key": "shared_cluster_1", "new_cluster": cluster()}
+    assert savings == ClusterSavings(4, 3, CLUSTER_START_SECONDS)
+    assert "job_clusters" in settings and "new_cluster" in settings["tasks"][0]
+
+
+def test_optimise_clusters_attaches_instance_pools_to_unpooled_clusters():
+    # Given
+    settings = {
+        "name": "etl",
+        "tasks": [
+            {"task_key": "a", "new_cluster": cluster(driver_node_type_id="i3.2xlarge")},
+            {"task_key": "b", "new_cluster": cluster(instance_pool_id="existing")},
+        ],
+    }
+
+    # When
+    optimised, savings = optimise_clusters(
+        settings, ClusterOptions(instance_pool_id="pool", driver_instance_pool_id="drivers")
+    )
+
+    # Then
+    assert optimised["tasks"][0]["new_cluster"] == {
+        "spark_version": "13.3.x-scala2.12",
+        "num_workers": 2,
+        "instance_pool_id": "pool",
+        "driver_instance_pool_id": "drivers",
+    }
+    assert optimised["tasks"][1]["new_cluster"]["instance_pool_id"] == "existing"
+    assert savings == ClusterSavings(2, 2, CLUSTER_START_SECONDS - POOLED_CLUSTER_START_SECONDS)
+
+
+def test_cluster_options_only_when_asked_for():
+    # Given / When / Then
+    assert cluster_options() is None
+    assert cluster_options(share_clusters=True) == ClusterOptions(share_clusters=True)
+    with pytest.raises(ValueError, match="driver instance pool"):
+        cluster_options(driver_instance_pool_id="drivers")
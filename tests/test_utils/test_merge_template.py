@@ -12,11 +12,15 @@ import os
 from pathlib import Path
 
 # Third Party
+import jinja2
 import pytest
 
 # Our Libraries
 from invoke_databricks_wheel_tasks.utils.misc import (
+    JINJA_BYTECODE_CACHE_ENV,
     dict_from_keyvalue_list,
+    jinja_bytecode_cache_dir,
+    jinja_environment,
     load_config,
     merge_template,
 )
@@ -68,3 +72,65 @@ def test_scenarios(fixture_path, env_args, config_path, template_path, expected_
     expected_output_json = json.loads(expected_output)
 
     assert output_json == expected_output_json
+
+
+def test_merge_template_compiles_once(tmp_path, monkeypatch):
+    # Given
+    template = tmp_path / "job.json.j2"
+    template.write_text('{"name": "{{ name }}"}')
+    environment = jinja_environment(str(tmp_path), jinja_bytecode_cache_dir())
+    compiled = []
+
+    def compile(*args, **kwargs):
+        compiled.append(args)
+        return jinja2.Environment.compile(environment, *args, **kwargs)
+
+    monkeypatch.setattr(environment, "compile", compile)
+
+    # When
+    outputs = [merge_template(str(template), {"name": f"job-{i}"}) for i in range(3)]
+
+    # Then
+    assert outputs == ['{"name": "job-0"}', '{"name": "job-1"}', '{"name": "job-2"}']
+    assert len(compiled) == 1
+
+
+def test_merge_template_reloads_edited_template(tmp_path):
+    # Given
+    template = tmp_path / "job.json.j2"
+    template.write_text('{"name": "{{ name }}"}')
+    merge_template(str(template), {"name": "job"})
+
+    # When
+    template.write_text('{"job": "{{ name }}"}')
+    os.utime(template, (template.stat().st_atime, template.stat().st_mtime + 10))
+    output = merge_template(str(template), {"name": "job"})
+
+    # Then
+    assert output == '{"job": "job"}'
+
+
+def test_merge_template_is_strict_about_undefined_values(tmp_path):
+    # Given
+    template = tmp_path / "job.json.j2"
+    template.write_text('{"name": "{{ missing }}"}')
+
+    # When / Then
+    with pytest.raises(jinja2.UndefinedError):
+        merge_template(str(template), {"name": "job"})
+
+
+def test_merge_template_bytecode_cache(tmp_path, monkeypatch):
+    # Given
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv(JINJA_BYTECODE_CACHE_ENV, "true")
+    template = tmp_path / "job.json.j2"
+    template.write_text('{"name": "{{ name }}"}')
+
+    # When
+    output = merge_template(str(template), {"name": "job"})
+
+    # Then
+    assert output == '{"name": "job"}'
+    assert jinja_bytecode_cache_dir() == str(tmp_path / "cache" / "invoke-databricks-wheel-tasks" / "jinja")
+    assert len(list((tmp_path / "cache" / "invoke-databricks-wheel-tasks" / "jinja").iterdir())) == 1
@@ -2,7 +2,12 @@
 import pytest
 
 # Our Libraries
-from invoke_databricks_wheel_tasks.utils.misc import dict_from_keyvalue_list, tidy
+from invoke_databricks_wheel_tasks.utils.misc import (
+    copy_parsed,
+    dict_from_keyvalue_list,
+    parse_config,
+    tidy,
+)
 
 
 def test_tidy():
@@ -43,3 +48,54 @@ class TestDictFromKeyValueList:
 
         # Then
         assert result == expectation
+
+
+class TestParseConfig:
+    def test_yaml_and_json_agree(self):
+        # Given
+        yaml_content = "name: job\ntasks:\n  - task_key: a\n    retries: 2\n"
+        json_content = '{"name": "job", "tasks": [{"task_key": "a", "retries": 2}]}'
+
+        # When
+        from_yaml = parse_config("yaml", yaml_content)
+        from_json = parse_config("json", json_content)
+
+        # Then
+        assert from_yaml == from_json == {"name": "job", "tasks": [{"task_key": "a", "retries": 2}]}
+
+    def test_cached_configs_are_independent_copies(self):
+        # Given
+        content = "name: cached-job\ntags:\n  team: data\n"
+        first = parse_config("yaml", content)
+
+        # When
+        first["tags"]["team"] = "changed"
+        second = parse_config("yaml", content)
+
+        # Then
+        assert second == {"name": "cached-job", "tags": {"team": "data"}}
+
+    def test_json_beyond_orjson_limits(self):
+        # Given
+        content = '{"big": 123456789012345678901234567890, "max": 18446744073709551615, "nan": NaN}'
+
+        # When
+        parsed = parse_config("json", content)
+
+        # Then
+        assert parsed["big"] == 123456789012345678901234567890 and isinstance(parsed["big"], int)
+        assert parsed["max"] == 18446744073709551615
+        assert parsed["nan"] != parsed["nan"]
+
+
+def test_copy_parsed():
+    # Given
+    value = {"a": [1, {"b": "c"}], "d": None}
+
+    # When
+    copied = copy_parsed(value)
+
+    # Then
+    assert copied == value
+    assert copied["a"] is not value["a"]
+    assert copied["a"][1] is not value["a"][1]
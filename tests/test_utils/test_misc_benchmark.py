@@ -0,0 +1,56 @@
+"""Timing comparison for load_config, run with `pytest -m benchmark tests/test_utils/test_misc_benchmark.py`.
+
+Prints the parse time for a large YAML config with and without the parsed-config cache, and with the vendored
+pure Python loader for reference.
+"""
+
+# Standard Library
+import timeit
+
+# Third Party
+import pytest
+
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils import misc
+from invoke_databricks_wheel_tasks.utils.misc import load_config
+
+
+@pytest.fixture
+def large_config(tmp_path):
+    tables = "".join(
+        f"""
+  - name: table_{i}
+    database: "{{{{ BRANCH }}}}_db"
+    partition_by: [year, month]
+    columns:
+      - {{name: id, type: bigint}}
+      - {{name: payload, type: string}}
+    options: {{retries: 2, timeout_seconds: 3600}}"""
+        for i in range(500)
+    )
+    path = tmp_path / "config.yml"
+    path.write_text(f"name: benchmark-job\ntables:{tables}\n")
+    return str(path)
+
+
+@pytest.mark.benchmark
+def test_load_config_benchmark(large_config):
+    # Imported here so collecting the test session never loads a YAML parser, and skipped on invoke 2.x
+    yaml3 = pytest.importorskip("invoke.vendor.yaml3")
+    env = {"BRANCH": "main"}
+    runs = 5
+
+    vendored = timeit.timeit(lambda: yaml3.safe_load(misc.merge_template(large_config, env)), number=runs) / runs
+
+    def cold():
+        misc._config_cache.clear()
+        load_config(large_config, env)
+
+    uncached = timeit.timeit(cold, number=runs) / runs
+    load_config(large_config, env)
+    cached = timeit.timeit(lambda: load_config(large_config, env), number=runs) / runs
+
+    print(f"\nvendored yaml3.safe_load: {vendored * 1000:.1f}ms")
+    print(f"load_config ({misc.yaml_loader().__name__}), uncached: {uncached * 1000:.1f}ms")
+    print(f"load_config ({misc.yaml_loader().__name__}), cached: {cached * 1000:.1f}ms")
+    assert cached < uncached
@@ -0,0 +1,144 @@
+# Standard Library
+import json
+from pathlib import Path
+
+# Third Party
+import pytest
+
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils import plan as plan_module
+from invoke_databricks_wheel_tasks.utils.api import DatabricksApiError
+from invoke_databricks_wheel_tasks.utils.deploy import JobSpec, job_specs_from_manifest
+from invoke_databricks_wheel_tasks.utils.plan import (
+    apply_plan,
+    changed_settings,
+    format_plan,
+    plan_from_json,
+    plan_jobs,
+    plan_to_json,
+    summarise_apply,
+    summarise_plan,
+)
+
+FIXTURES = Path("./tests/test_utils/fixtures/deploy")
+ENV = {"wheel": "dbfs:/FileStore/wheels/main/project/project-0.1.0-py3-none-any.whl"}
+
+
+def deployed(fake_databricks, spec_index):
+    """Deploy one fixture job exactly as the catalogue would render it."""
+    specs = job_specs_from_manifest(str(FIXTURES / "manifest.yml"))
+    [job] = plan_jobs(specs[spec_index : spec_index + 1], ENV)
+    return fake_databricks.add_job(job.settings)
+
+
+def test_changed_settings_ignores_defaults_and_lists_top_level_fields():
+    # Given
+    local = {"name": "a", "max_concurrent_runs": 1, "tasks": [{"task_key": "x"}], "timeout_seconds": 60}
+    remote = {"name": "a", "tasks": [{"task_key": "y"}]}
+
+    # When
+    changes = changed_settings(local, remote)
+
+    # Then
+    assert changes == ("tasks", "timeout_seconds")
+
+
+def test_plan_jobs_diffs_catalogue_against_workspace(fake_databricks):
+    # Given
+    unchanged = deployed(fake_databricks, 1)
+    stale = fake_databricks.add_job({"name": "deploy-gold", "max_concurrent_runs": 3})
+    orphan = fake_databricks.add_job({"name": "deploy-retired"})
+    fake_databricks.add_job({"name": "unrelated"})
+    specs = job_specs_from_manifest(str(FIXTURES / "manifest.yml"))
+    listings = fake_databricks.calls("/jobs/list")
+
+    # When
+    planned = plan_jobs(specs, ENV, orphan_prefix="deploy-")
+
+    # Then
+    assert [(j.name, j.action, j.job_id) for j in planned] == [
+        ("deploy-bronze", "create", None),
+        ("deploy-silver", "unchanged", unchanged),
+        ("deploy-gold", "update", stale),
+        ("deploy-retired", "orphaned", orphan),
+    ]
+    assert planned[2].changes == ("max_concurrent_runs", "tasks")
+    assert summarise_plan(planned) == {"create": 1, "update": 1, "unchanged": 1, "orphaned": 1}
+    assert "~ update 'deploy-gold'" in format_plan(planned)
+    assert fake_databricks.calls("/jobs/list") == listings + 1
+    assert fake_databricks.calls("/jobs/get") == 2
+    assert fake_databricks.calls("/jobs/create") + fake_databricks.calls("/jobs/reset") == 0
+
+
+def test_plan_jobs_rejects_duplicate_names(fake_databricks):
+    # Given
+    spec = JobSpec(str(FIXTURES / "template.json.j2"), str(FIXTURES / "jobs" / "gold.yml"))
+
+    # When / Then
+    with pytest.raises(ValueError, match="deploy-gold"):
+        plan_jobs([spec, spec], ENV)
+
+
+def test_apply_plan_converges_and_deletes_orphans_last(fake_databricks):
+    # Given
+    deployed(fake_databricks, 1)
+    fake_databricks.add_job({"name": "deploy-gold", "max_concurrent_runs": 3})
+    orphan = fake_databricks.add_job({"name": "deploy-retired"})
+    specs = job_specs_from_manifest(str(FIXTURES / "manifest.yml"))
+    planned = plan_from_json(json.loads(json.dumps(plan_to_json(plan_jobs(specs, ENV, orphan_prefix="deploy-")))))
+    fake_databricks.failures["/jobs/reset"] = 1
+
+    # When
+    results = apply_plan(planned, delete_orphans=True, sleep=lambda _: None)
+
+    # Then
+    assert summarise_apply(results) == {
+        "created": 1,
+        "updated": 1,
+        "unchanged": 1,
+        "deleted": 1,
+        "orphaned": 0,
+        "failed": 0,
+    }
+    assert orphan not in fake_databricks.jobs
+    assert [j.action for j in plan_jobs(specs, ENV, orphan_prefix="deploy-")] == ["unchanged"] * 3
+
+
+def test_apply_plan_keeps_orphans_when_a_deploy_fails(fake_databricks):
+    # Given
+    orphan = fake_databricks.add_job({"name": "deploy-retired"})
+    specs = job_specs_from_manifest(str(FIXTURES / "manifest.yml"))
+    planned = plan_jobs(specs, ENV, orphan_prefix="deploy-")
+    fake_databricks.failures["/jobs/create"] = 100
+
+    # When
+    results = apply_plan(planned, delete_orphans=True, retries=1, sleep=lambda _: None)
+
+    # Then
+    assert [r.action for r in results] == ["failed"] * 3 + ["orphaned"]
+    assert orphan in fake_databricks.jobs
+
+
+def test_apply_plan_does_not_duplicate_a_create_whose_response_was_lost(fake_databricks, monkeypatch):
+    # Given
+    spec = JobSpec(str(FIXTURES / "template.json.j2"), str(FIXTURES / "jobs" / "gold.yml"))
+    planned = plan_jobs([spec], ENV)
+    create_or_reset_job = plan_module.create_or_reset_job
+    lost = []
+
+    def lose_first_response(settings, profile=None, job_id=None):
+        response = create_or_reset_job(settings, profile, job_id)
+        if not lost:
+            lost.append(response)
+            raise DatabricksApiError("gateway timeout", 504, None)
+        return response
+
+    monkeypatch.setattr(plan_module, "create_or_reset_job", lose_first_response)
+
+    # When
+    results = apply_plan(planned, sleep=lambda _: None)
+
+    # Then
+    assert [r.action for r in results] == ["created"]
+    assert [j["settings"]["name"] for j in fake_databricks.jobs.values()] == ["deploy-gold"]
+    assert results[0].job_id == lost[0]["job_id"]
@@ -1,11 +1,17 @@
 # Standard Library
+import os
 import re
 
+# Third Party
+import pytest
+
 # Our Libraries
 from invoke_databricks_wheel_tasks.utils.poetry import (
     poetry_project_name,
     poetry_project_version,
+    poetry_wheel_builder,
     poetry_wheelname,
+    pure_python_wheelname,
 )
 
 
@@ -46,3 +52,76 @@ def test_poetry_wheelname():
     assert (
         result_pattern.match(wheelname) is not None
     ), f"Did not match pattern: {target_pattern} in string: {wheelname}"
+
+
+def test_poetry_wheelname_matches_wheel_builder():
+    # Given
+    # .. the fast path must agree with poetry for this pure Python project
+
+    # When
+    wheelname = poetry_wheelname()
+
+    # Then
+    assert wheelname == str(poetry_wheel_builder().wheel_filename)
+
+
+@pytest.mark.parametrize(
+    "config,expected",
+    [
+        (
+            {"name": "my-project", "version": "1.2.3", "dependencies": {"python": "^3.8"}},
+            "my_project-1.2.3-py3-none-any.whl",
+        ),
+        ({"name": "My.Project", "version": "1.2.3", "dependencies": {"python": "^3.8"}}, None),
+        (
+            {"name": "proj", "version": "0.1.0rc1", "dependencies": {"python": ">=3.8,<4.0"}},
+            "proj-0.1.0rc1-py3-none-any.whl",
+        ),
+        ({"name": "proj", "version": "1.0.0-alpha", "dependencies": {"python": "^3.8"}}, None),
+        ({"name": "proj", "version": "1.0.0", "dependencies": {"python": ">=2.7"}}, None),
+        ({"name": "proj", "version": "1.0.0", "dependencies": {}}, None),
+        ({"name": "proj", "version": "1.0.0", "dependencies": {"python": "^3.8"}, "build": "build.py"}, None),
+    ],
+)
+def test_pure_python_wheelname(config, expected):
+    assert pure_python_wheelname(config) == expected
+
+
+def test_poetry_wheelname_follows_pyproject_changes(tmp_path, monkeypatch):
+    # Given
+    monkeypatch.chdir(tmp_path)
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        '[tool.poetry]\nname = "demo"\nversion = "1.0.0"\n[tool.poetry.dependencies]\npython = "^3.8"\n'
+    )
+    assert poetry_wheelname() == "demo-1.0.0-py3-none-any.whl"
+
+    # When
+    pyproject.write_text(
+        '[tool.poetry]\nname = "demo"\nversion = "1.1.0"\n[tool.poetry.dependencies]\npython = "^3.8"\n'
+    )
+    os.utime(pyproject, ns=(pyproject.stat().st_atime_ns, pyproject.stat().st_mtime_ns + 10**9))
+
+    # Then
+    assert poetry_wheelname() == "demo-1.1.0-py3-none-any.whl"
+    assert poetry_project_version() == "1.1.0"
+
+
+@pytest.mark.parametrize("name", ["Mixed-Case.Project", "lower-case"])
+def test_poetry_wheelname_matches_wheel_builder_for_any_name(tmp_path, monkeypatch, name):
+    # Given
+    # Third Party
+    from poetry.core.factory import Factory
+    from poetry.core.masonry.builders.wheel import WheelBuilder
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyproject.toml").write_text(
+        f'[tool.poetry]\nname = "{name}"\nversion = "1.0.0"\ndescription = ""\nauthors = []\n'
+        '[tool.poetry.dependencies]\npython = "^3.8"\n'
+    )
+
+    # When
+    wheelname = poetry_wheelname()
+
+    # Then
+    assert wheelname == WheelBuilder(Factory().create_poetry(tmp_path)).wheel_filename
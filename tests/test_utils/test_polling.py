@@ -0,0 +1,65 @@
+# Standard Library
+import random
+
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils.polling import AdaptivePoll
+
+
+def test_fast_polling_while_pending(fake_clock):
+    # Given
+    poll = AdaptivePoll(min_delay=1, max_delay=60, jitter=0, fast_period=10, clock=fake_clock, sleep=fake_clock.sleep)
+
+    # When
+    for _ in range(20):
+        poll.wait("PENDING")
+
+    # Then
+    assert fake_clock.sleeps == [1] * 20
+
+
+def test_backoff_after_fast_period_up_to_cap(fake_clock):
+    # Given
+    poll = AdaptivePoll(
+        min_delay=1, max_delay=10, factor=2, jitter=0, fast_period=3, clock=fake_clock, sleep=fake_clock.sleep
+    )
+
+    # When
+    for _ in range(8):
+        poll.wait("RUNNING")
+
+    # Then
+    assert fake_clock.sleeps == [1, 1, 1, 2, 4, 8, 10, 10]
+
+
+def test_state_change_resets_backoff(fake_clock):
+    # Given
+    poll = AdaptivePoll(
+        min_delay=1, max_delay=10, factor=2, jitter=0, fast_period=0, clock=fake_clock, sleep=fake_clock.sleep
+    )
+
+    # When
+    delays = [poll.wait(state) for state in ["RUNNING", "RUNNING", "RUNNING", "TERMINATING", "TERMINATING"]]
+
+    # Then
+    assert delays == [2, 4, 8, 2, 4]
+
+
+def test_jitter_is_bounded(fake_clock):
+    # Given
+    poll = AdaptivePoll(
+        min_delay=1,
+        max_delay=100,
+        factor=2,
+        jitter=0.5,
+        fast_period=0,
+        clock=fake_clock,
+        sleep=fake_clock.sleep,
+        rng=random.Random(42),
+    )
+
+    # When
+    delays = [poll.wait("RUNNING") for _ in range(5)]
+
+    # Then
+    for attempt, delay in enumerate(delays, start=1):
+        assert 0.5 * 2**attempt <= delay <= 1.5 * 2**attempt
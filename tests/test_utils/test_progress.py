@@ -0,0 +1,104 @@
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils.databricks import wait_for_run_status
+from invoke_databricks_wheel_tasks.utils.progress import RunProgress, describe_state
+
+
+def task_run(task_key, run_id, life_cycle_state, result_state=None):
+    state = {"life_cycle_state": life_cycle_state, **({"result_state": result_state} if result_state else {})}
+    return {"task_key": task_key, "run_id": run_id, "state": state}
+
+
+def multi_task_run(*tasks, life_cycle_state="RUNNING", result_state=None):
+    state = {"life_cycle_state": life_cycle_state, **({"result_state": result_state} if result_state else {})}
+    return {"run_id": 1, "state": state, "tasks": list(tasks)}
+
+
+def test_describe_state():
+    # Given / When / Then
+    assert describe_state({"life_cycle_state": "TERMINATED", "result_state": "FAILED"}) == "TERMINATED FAILED"
+    assert describe_state({"life_cycle_state": "PENDING"}) == "PENDING"
+    assert describe_state({}) == "UNKNOWN"
+
+
+def test_run_progress_streams_task_transitions_and_fetches_output_once(fake_databricks):
+    # Given
+    fake_databricks.run_outputs[11] = {"logs": "\n".join(f"line {i}" for i in range(100)), "logs_truncated": True}
+    fake_databricks.run_outputs[12] = {
+        "error": "ZeroDivisionError",
+        "error_trace": "Traceback\n  boom\nZeroDivisionError",
+    }
+    lines = []
+    progress = RunProgress(tail_lines=2, echo=lines.append)
+    polls = [
+        multi_task_run(task_run("ingest", 11, "RUNNING"), task_run("report", 12, "BLOCKED")),
+        multi_task_run(task_run("ingest", 11, "TERMINATED", "SUCCESS"), task_run("report", 12, "RUNNING")),
+        multi_task_run(task_run("ingest", 11, "TERMINATED", "SUCCESS"), task_run("report", 12, "RUNNING")),
+        multi_task_run(
+            task_run("ingest", 11, "TERMINATED", "SUCCESS"),
+            task_run("report", 12, "TERMINATED", "FAILED"),
+            life_cycle_state="TERMINATED",
+            result_state="FAILED",
+        ),
+    ]
+
+    # When
+    for run in polls:
+        progress.update(run)
+
+    # Then
+    assert lines == [
+        "run 1: RUNNING",
+        "task ingest: RUNNING",
+        "task report: BLOCKED",
+        "task ingest: TERMINATED SUCCESS",
+        "task ingest: logs, last 2 lines (truncated by Databricks):",
+        "task ingest:     line 98",
+        "task ingest:     line 99",
+        "task report: RUNNING",
+        "run 1: TERMINATED FAILED",
+        "task report: TERMINATED FAILED",
+        "task report: error: ZeroDivisionError",
+        "task report: error trace, last 2 lines:",
+        "task report:       boom",
+        "task report:     ZeroDivisionError",
+    ]
+    assert fake_databricks.calls("/jobs/runs/get-output") == 2
+
+
+def test_run_progress_reports_unavailable_output_without_failing(fake_databricks):
+    # Given
+    lines = []
+    progress = RunProgress(echo=lines.append)
+
+    # When
+    progress.update({"run_id": 5, "state": {"life_cycle_state": "INTERNAL_ERROR"}})
+
+    # Then
+    assert lines[0] == "run 5: INTERNAL_ERROR"
+    assert lines[1].startswith("run 5: output unavailable:")
+
+
+def test_wait_for_run_status_streams_progress(fake_databricks, fast_poll):
+    # Given
+    job_id = fake_databricks.add_job({"name": "example"})
+    run_id = fake_databricks.add_run(job_id)
+    fake_databricks.run_outputs[run_id] = {"notebook_output": {"result": "done"}}
+    lines = []
+
+    # When
+    wait_for_run_status(
+        None,
+        None,
+        str(run_id),
+        poll=fast_poll(),
+        on_update=RunProgress(echo=lines.append).update,
+    )
+
+    # Then
+    assert lines == [
+        f"run {run_id}: PENDING",
+        f"run {run_id}: RUNNING",
+        f"run {run_id}: TERMINATED SUCCESS",
+        f"run {run_id}: notebook output, last 1 lines:",
+        f"run {run_id}:     done",
+    ]
@@ -0,0 +1,194 @@
+# Standard Library
+import threading
+import time
+
+# Third Party
+import pytest
+
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils.api import DatabricksApiError, api_client
+from invoke_databricks_wheel_tasks.utils.databricks import (
+    create_or_reset_job,
+    list_jobs,
+)
+from invoke_databricks_wheel_tasks.utils.ratelimit import (
+    RequestScheduler,
+    RetryBudget,
+    TokenBucket,
+    endpoint_class,
+    parse_retry_after,
+)
+
+
+def no_jitter(low, high):
+    return high
+
+
+def test_endpoint_class_groups_endpoints_sharing_a_limit():
+    # Given / When / Then
+    assert endpoint_class("GET", "/jobs/list") == "jobs-read"
+    assert endpoint_class("POST", "/jobs/reset") == "jobs-write"
+    assert endpoint_class("GET", "/jobs/runs/get") == "runs-read"
+    assert endpoint_class("POST", "/jobs/runs/cancel") == "jobs-write"
+    assert endpoint_class("POST", "/jobs/run-now") == "runs-trigger"
+    assert endpoint_class("POST", "/dbfs/add-block") == "dbfs"
+    assert endpoint_class("GET", "/clusters/list") == "default"
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    # Given
+    now = 1_700_000_000.0
+
+    # When / Then
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Tue, 14 Nov 2023 22:13:30 GMT", now=lambda: now) == 10.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_token_bucket_paces_requests_after_the_burst(fake_clock):
+    # Given
+    bucket = TokenBucket(rate=2.0, burst=3.0, clock=fake_clock, sleep=fake_clock.sleep)
+
+    # When
+    for _ in range(7):
+        bucket.acquire()
+
+    # Then
+    assert fake_clock.now == pytest.approx(2.0)
+
+
+def test_token_bucket_throttle_pauses_and_halves_rate_until_it_recovers(fake_clock):
+    # Given
+    bucket = TokenBucket(rate=4.0, burst=4.0, clock=fake_clock, sleep=fake_clock.sleep)
+
+    # When
+    bucket.throttle(5.0)
+    bucket.acquire()
+    throttled_rate = bucket.rate
+    for _ in range(10):
+        bucket.recover()
+
+    # Then
+    assert fake_clock.now >= 5.0
+    assert throttled_rate == 2.0
+    assert bucket.rate == 4.0
+
+
+def test_retry_budget_is_earned_by_requests():
+    # Given
+    budget = RetryBudget(ratio=0.5, reserve=1.0)
+
+    # When
+    first = budget.withdraw()
+    exhausted = budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+
+    # Then
+    assert (first, exhausted, budget.withdraw()) == (True, False, True)
+
+
+def test_scheduler_retries_throttled_requests_after_retry_after(fake_clock):
+    # Given
+    scheduler = RequestScheduler(clock=fake_clock, sleep=fake_clock.sleep, jitter=no_jitter)
+    responses = [DatabricksApiError("slow down", 429, retry_after=7.0), DatabricksApiError("slow down", 429), "ok"]
+
+    def send():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    # When
+    result = scheduler.run("POST", "/jobs/create", send)
+
+    # Then
+    assert result == "ok"
+    # Retry-After first, then jittered exponential backoff
+    assert fake_clock.now == pytest.approx(7.0 + 1.0, abs=0.5)
+    assert scheduler.bucket("POST", "/jobs/reset").rate < scheduler.bucket("GET", "/jobs/get").rate
+
+
+@pytest.mark.parametrize(
+    "method, error, attempts",
+    [
+        ("GET", DatabricksApiError("unavailable", 503), 3),
+        ("POST", DatabricksApiError("unavailable", 503), 1),
+        ("GET", DatabricksApiError("bad request", 400), 1),
+    ],
+)
+def test_scheduler_only_retries_server_errors_for_idempotent_requests(fake_clock, method, error, attempts):
+    # Given
+    scheduler = RequestScheduler(retries=2, clock=fake_clock, sleep=fake_clock.sleep, jitter=no_jitter)
+    calls = []
+
+    def send():
+        calls.append(1)
+        raise error
+
+    # When
+    with pytest.raises(DatabricksApiError):
+        scheduler.run(method, "/jobs/get", send)
+
+    # Then
+    assert len(calls) == attempts
+
+
+def test_scheduler_gives_up_when_the_retry_budget_runs_out(fake_clock):
+    # Given
+    scheduler = RequestScheduler(clock=fake_clock, sleep=fake_clock.sleep, jitter=no_jitter)
+    scheduler.budget = RetryBudget(ratio=0.0, reserve=2.0)
+    calls = []
+
+    def send():
+        calls.append(1)
+        raise DatabricksApiError("slow down", 429)
+
+    # When
+    with pytest.raises(DatabricksApiError):
+        scheduler.run("GET", "/jobs/list", send)
+
+    # Then
+    assert len(calls) == 3
+
+
+def test_scheduler_caps_concurrent_requests():
+    # Given
+    scheduler = RequestScheduler(max_concurrency=2)
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def send():
+        with lock:
+            in_flight.append(1)
+            peak.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.pop()
+
+    # When
+    threads = [threading.Thread(target=scheduler.run, args=("GET", "/jobs/get", send)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Then
+    assert max(peak) == 2
+
+
+def test_api_client_survives_throttling(fake_databricks):
+    # Given
+    fake_databricks.throttles["/jobs/create"] = 2
+    fake_databricks.throttles["/jobs/list"] = 2
+    api_client().scheduler.jitter = no_jitter
+
+    # When
+    response = create_or_reset_job({"name": "throttled"})
+    listing = list_jobs()
+
+    # Then
+    assert listing == {"throttled": response["job_id"]}
+    assert fake_databricks.calls("/jobs/create") == 3
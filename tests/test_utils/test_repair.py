@@ -0,0 +1,86 @@
+# Third Party
+import pytest
+
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils.databricks import (
+    latest_run_id,
+    wait_for_run_status,
+)
+from invoke_databricks_wheel_tasks.utils.polling import AdaptivePoll
+from invoke_databricks_wheel_tasks.utils.repair import (
+    latest_repair_id,
+    start_repair,
+    tasks_to_repair,
+)
+
+
+@pytest.fixture
+def partial_failure(task):
+    return {
+        "life_cycle_state": "TERMINATED",
+        "result_state": "FAILED",
+        "tasks": [
+            task("ingest", "TERMINATED", "SUCCESS"),
+            task("train", "TERMINATED", "FAILED"),
+            task("report", "SKIPPED", "UPSTREAM_FAILED"),
+        ],
+    }
+
+
+def test_tasks_to_repair_picks_failed_and_skipped_tasks(partial_failure):
+    # Given / When / Then
+    assert tasks_to_repair(partial_failure) == ["train", "report"]
+    assert latest_repair_id({"repair_history": [{"type": "ORIGINAL", "id": 1}, {"type": "REPAIR", "id": 7}]}) == 7
+    assert latest_repair_id({}) is None
+
+
+def test_start_repair_reruns_only_failed_tasks_and_chains_repairs(fake_databricks, fast_poll, partial_failure):
+    # Given
+    job_id = fake_databricks.add_job({"name": "dag"})
+    fake_databricks.add_run(job_id, [partial_failure])
+    run_id = latest_run_id(job_id)
+    fake_databricks.repair_scripts[run_id] = [{"life_cycle_state": "RUNNING"}, partial_failure]
+
+    # When
+    first, tasks = start_repair(run_id, poll=fast_poll())
+    wait_for_run_status(None, None, str(run_id), poll=fast_poll())
+    second, _ = start_repair(run_id, poll=fast_poll())
+
+    # Then
+    assert tasks == ["train", "report"]
+    assert fake_databricks.repairs == [
+        {"run_id": run_id, "rerun_tasks": ["train", "report"]},
+        {"run_id": run_id, "rerun_tasks": ["train", "report"], "latest_repair_id": first},
+    ]
+    assert second != first
+
+
+def test_start_repair_skips_successful_and_rejects_active_runs(fake_databricks):
+    # Given
+    job_id = fake_databricks.add_job({"name": "dag"})
+    succeeded = fake_databricks.add_run(job_id, [{"life_cycle_state": "TERMINATED", "result_state": "SUCCESS"}])
+    active = fake_databricks.add_run(job_id, [{"life_cycle_state": "RUNNING"}])
+
+    # When
+    repair = start_repair(succeeded)
+
+    # Then
+    assert repair == (None, [])
+    assert latest_run_id(job_id) == active
+    with pytest.raises(ValueError, match="only finished runs"):
+        start_repair(active)
+    assert fake_databricks.repairs == []
+
+
+def test_start_repair_gives_up_when_the_repair_never_shows_up(fake_databricks, fake_clock, partial_failure):
+    # Given
+    job_id = fake_databricks.add_job({"name": "dag"})
+    run_id = fake_databricks.add_run(job_id, [partial_failure])
+    fake_databricks.show_repairs = False
+    poll = AdaptivePoll(min_delay=1, max_delay=1, jitter=0, clock=fake_clock, sleep=fake_clock.sleep)
+
+    # When / Then
+    with pytest.raises(TimeoutError, match="didn't show up"):
+        start_repair(run_id, poll=poll, timeout=10)
+    assert len(fake_databricks.repairs) == 1
+    assert sum(fake_clock.sleeps) == 10
@@ -0,0 +1,112 @@
+# Third Party
+import pytest
+
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils.api import api_client
+from invoke_databricks_wheel_tasks.utils.dbfs import dbfs_delete
+from invoke_databricks_wheel_tasks.utils.retention import (
+    PrunePlan,
+    apply_prune,
+    artifact_version,
+    old_versions,
+    prune_plan,
+    stale_branch_paths,
+)
+
+ARTIFACTS = "/FileStore/wheels/main/project"
+
+
+@pytest.mark.parametrize(
+    "filename,project,version",
+    [
+        ("project-1.2.3-py3-none-any.whl", "project", "1.2.3"),
+        ("my_project-0.1.0a1-1-cp310-cp310-linux_x86_64.whl", "my-project", "0.1.0a1"),
+        ("my_project-0.1.0.tar.gz", "my-project", "0.1.0"),
+        ("My-Project-0.1.0.tar.gz", "my-project", "0.1.0"),
+        ("invoke_databricks_wheel_tasks-0.9.0-py3-none-any.whl", "invoke-databricks-wheel-tasks", "0.9.0"),
+        ("other_project-0.1.0-py3-none-any.whl", "project", None),
+        ("project-1.2.3-py3-none-any.whl.sha256", "project", None),
+        ("requirements.txt", "project", None),
+    ],
+)
+def test_artifact_version(filename, project, version):
+    assert artifact_version(filename, project) == version
+
+
+def test_old_versions_keeps_most_recent(fake_databricks):
+    # Given
+    fake_databricks.put_file(f"{ARTIFACTS}/project-0.1.0.tar.gz", b"sdist")
+    for version in ["0.1.0", "0.3.0", "0.2.0"]:
+        fake_databricks.put_file(f"{ARTIFACTS}/project-{version}-py3-none-any.whl", b"wheel")
+        fake_databricks.put_file(f"{ARTIFACTS}/project-{version}-py3-none-any.whl.sha256", b"hash")
+    fake_databricks.put_file(f"{ARTIFACTS}/requirements.txt", b"deps")
+
+    # When
+    stale = old_versions(api_client(), f"dbfs:{ARTIFACTS}/", "project", keep=2)
+
+    # Then
+    assert stale == [
+        f"{ARTIFACTS}/project-0.1.0-py3-none-any.whl",
+        f"{ARTIFACTS}/project-0.1.0-py3-none-any.whl.sha256",
+        f"{ARTIFACTS}/project-0.1.0.tar.gz",
+    ]
+
+
+def test_stale_branch_paths(fake_databricks):
+    # Given
+    for branch in ["main", "feature/live", "feature/gone", "old"]:
+        fake_databricks.put_file(f"/FileStore/wheels/{branch}/project/project-0.1.0-py3-none-any.whl", b"wheel")
+    fake_databricks.put_file("/FileStore/wheels/old/other/other-0.1.0-py3-none-any.whl", b"wheel")
+
+    # When
+    stale = stale_branch_paths(api_client(), "project", ["main", "feature/live"])
+
+    # Then
+    assert stale == ["/FileStore/wheels/feature/gone/project", "/FileStore/wheels/old/project"]
+
+
+def test_stale_branch_paths_keeps_matching_ci_directories(fake_databricks):
+    # Given
+    for branch in ["main", "123/merge", "gone"]:
+        fake_databricks.put_file(f"/FileStore/wheels/{branch}/project/project-0.1.0-py3-none-any.whl", b"wheel")
+
+    # When
+    stale = stale_branch_paths(api_client(), "project", ["main"], keep_patterns=["*/merge"])
+
+    # Then
+    assert stale == ["/FileStore/wheels/gone/project"]
+
+
+def test_stale_branch_paths_without_any_wheels(fake_databricks):
+    assert stale_branch_paths(api_client(), "project", ["main"]) == []
+
+
+def test_apply_prune(fake_databricks):
+    # Given
+    for version in ["0.1.0", "0.2.0"]:
+        fake_databricks.put_file(f"{ARTIFACTS}/project-{version}-py3-none-any.whl", b"wheel")
+    for i in range(5):
+        fake_databricks.put_file(f"/FileStore/wheels/gone/project/project-0.{i}.0-py3-none-any.whl", b"wheel")
+    client = api_client()
+    plan = prune_plan(client, f"dbfs:{ARTIFACTS}/", "project", keep=1, branches=["main"])
+
+    # When
+    apply_prune(client, plan)
+
+    # Then
+    assert plan == PrunePlan([f"{ARTIFACTS}/project-0.1.0-py3-none-any.whl"], ["/FileStore/wheels/gone/project"])
+    assert sorted(fake_databricks.dbfs) == [f"{ARTIFACTS}/project-0.2.0-py3-none-any.whl"]
+
+
+def test_dbfs_delete_repeats_partial_deletes(fake_databricks):
+    # Given
+    for i in range(5):
+        fake_databricks.put_file(f"/FileStore/wheels/gone/project/{i}.whl", b"wheel")
+    fake_databricks.delete_batch_limit = 2
+
+    # When
+    dbfs_delete(api_client(), "dbfs:/FileStore/wheels/gone/", recursive=True)
+
+    # Then
+    assert fake_databricks.dbfs == {}
+    assert fake_databricks.calls("/dbfs/delete") == 3
@@ -0,0 +1,123 @@
+# Standard Library
+import signal
+
+# Third Party
+import pytest
+
+# Our Libraries
+from invoke_databricks_wheel_tasks.utils.databricks import wait_for_run_status
+from invoke_databricks_wheel_tasks.utils.supervisor import (
+    FailurePolicy,
+    RunSupervisor,
+    cancel_run_on_signals,
+    failed_tasks,
+)
+
+
+def test_failed_tasks_ignores_upstream_failures(task):
+    # Given
+    run = {
+        "tasks": [
+            task("a", "TERMINATED", "FAILED"),
+            task("b", "SKIPPED", "UPSTREAM_FAILED"),
+            task("c", "INTERNAL_ERROR"),
+            task("d", "TERMINATED", "SUCCESS"),
+        ]
+    }
+
+    # When / Then
+    assert failed_tasks(run) == ["a", "c"]
+
+
+@pytest.mark.parametrize(
+    "policy, failed, trips",
+    [
+        (FailurePolicy(), ["a"], False),
+        (FailurePolicy(fail_fast=True), [], False),
+        (FailurePolicy(fail_fast=True), ["a"], True),
+        (FailurePolicy(max_failed_tasks=1), ["a"], False),
+        (FailurePolicy(max_failed_tasks=1), ["a", "b"], True),
+        (FailurePolicy(critical_tasks=("b",)), ["a"], False),
+        (FailurePolicy(critical_tasks=("b",)), ["b"], True),
+    ],
+)
+def test_failure_policy(policy, failed, trips):
+    # Given / When
+    reason = policy.tripped(failed)
+
+    # Then
+    assert (reason is not None) == trips
+
+
+def test_supervisor_cancels_run_when_policy_trips(fake_databricks, fast_poll, task):
+    # Given
+    job_id = fake_databricks.add_job({"name": "multi-task"})
+    running = {"life_cycle_state": "RUNNING"}
+    run_id = fake_databricks.add_run(
+        job_id,
+        [
+            {**running, "tasks": [task("ingest", "RUNNING"), task("train", "PENDING")]},
+            {**running, "tasks": [task("ingest", "TERMINATED", "FAILED"), task("train", "RUNNING")]},
+            {**running, "tasks": [task("ingest", "TERMINATED", "FAILED"), task("train", "RUNNING")]},
+        ],
+    )
+    seen = []
+    supervisor = RunSupervisor(run_id, FailurePolicy(critical_tasks=("ingest",)), on_update=seen.append)
+
+    # When
+    with pytest.raises(ValueError, match="critical task 'ingest' failed"):
+        wait_for_run_status(None, None, str(run_id), poll=fast_poll(), on_update=supervisor.update)
+
+    # Then
+    assert fake_databricks.calls("/jobs/runs/cancel") == 1
+    assert len(seen) == 2
+    assert fake_databricks.run_states[run_id][-1]["result_state"] == "CANCELED"
+
+
+def test_cancel_run_on_signals_cancels_and_restores_handlers(fake_databricks):
+    # Given
+    job_id = fake_databricks.add_job({"name": "long"})
+    run_id = fake_databricks.add_run(job_id, [{"life_cycle_state": "RUNNING"}])
+    previous = signal.getsignal(signal.SIGTERM)
+
+    echoed = []
+
+    # When
+    with pytest.raises(SystemExit) as exit_info:
+        with cancel_run_on_signals(run_id, echo=echoed.append):
+            signal.raise_signal(signal.SIGTERM)
+
+    # Then
+    assert exit_info.value.code == 128 + signal.SIGTERM
+    assert echoed == [f"Interrupted, cancelling run {run_id}"]
+    assert fake_databricks.calls("/jobs/runs/cancel") == 1
+    assert signal.getsignal(signal.SIGTERM) == previous
+
+
+def test_cancel_run_on_signals_leaves_run_alone_on_errors(fake_databricks):
+    # Given
+    job_id = fake_databricks.add_job({"name": "long"})
+    run_id = fake_databricks.add_run(job_id, [{"life_cycle_state": "RUNNING"}])
+
+    # When
+    with pytest.raises(ValueError):
+        with cancel_run_on_signals(run_id):
+            raise ValueError("boom")
+
+    # Then
+    assert fake_databricks.calls("/jobs/runs/cancel") == 0
+
+
+def test_cancel_run_on_signals_restores_default_for_handlers_installed_outside_python(fake_databricks, monkeypatch):
+    # Given
+    getsignal = signal.getsignal
+    monkeypatch.setattr(signal, "getsignal", lambda s: None if s == signal.SIGTERM else getsignal(s))
+    previous = getsignal(signal.SIGTERM)
+
+    # When
+    with cancel_run_on_signals(1):
+        pass
+
+    # Then
+    assert getsignal(signal.SIGTERM) == signal.SIG_DFL
+    signal.signal(signal.SIGTERM, previous)